@@ -45,6 +45,7 @@ from .file import *
 from .flags import *
 from .guild import *
 from .guild_premium import *
+from .history import *
 from .integrations import *
 from .interactions import *
 from .invite import *
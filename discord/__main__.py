@@ -27,6 +27,8 @@ from __future__ import annotations
 from typing import Optional, Tuple, Dict
 
 import argparse
+import asyncio
+import os
 import sys
 from pathlib import Path
 
@@ -301,6 +303,37 @@ def newcog(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
         print('successfully made cog at', directory)
 
 
+async def _archive(args: argparse.Namespace, token: str) -> Dict[int, int]:
+    archiver = discord.HistoryArchiver(
+        args.output,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        compress=not args.no_compress,
+        threads=not args.no_threads,
+        attachments=args.attachments,
+    )
+    async with discord.Client() as client:
+        await client.login(token)
+        channels = [await client.fetch_channel(channel_id) for channel_id in args.channels]
+        return await archiver.archive(*channels)  # type: ignore # Non-messageable channels fail loudly
+
+
+def archive(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    token = args.token or os.environ.get('DISCORD_TOKEN')
+    if not token:
+        parser.error('a token is required, pass --token or set DISCORD_TOKEN')
+
+    try:
+        results = asyncio.run(_archive(args, token))
+    except discord.HTTPException as exc:
+        parser.error(f'could not archive channels ({exc})')
+    except OSError as exc:
+        parser.error(f'could not write archive ({exc})')
+
+    for channel_id, count in results.items():
+        print(f'archived {count} new messages from {channel_id}')
+
+
 def add_newbot_args(subparser: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
     parser = subparser.add_parser('newbot', help='creates a command bot project quickly')
     parser.set_defaults(func=newbot)
@@ -323,6 +356,20 @@ def add_newcog_args(subparser: argparse._SubParsersAction[argparse.ArgumentParse
     parser.add_argument('--full', help='add all special methods as well', action='store_true')
 
 
+def add_archive_args(subparser: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
+    parser = subparser.add_parser('archive', help='archives channel history to NDJSON files')
+    parser.set_defaults(func=archive)
+
+    parser.add_argument('channels', help='the IDs of the channels to archive', nargs='+', type=int, metavar='channel')
+    parser.add_argument('-o', '--output', help='the directory to write to (default: archive)', default=Path('archive'))
+    parser.add_argument('--token', help='the account token (default: $DISCORD_TOKEN)')
+    parser.add_argument('--concurrency', help='channels to archive at once (default: 4)', type=int, default=4)
+    parser.add_argument('--batch-size', help='messages between checkpoints (default: 1000)', type=int, default=1000)
+    parser.add_argument('--no-compress', help='do not gzip the archives', action='store_true')
+    parser.add_argument('--no-threads', help='do not archive threads', action='store_true')
+    parser.add_argument('--attachments', help='download attachments as well', action='store_true')
+
+
 def parse_args() -> Tuple[argparse.ArgumentParser, argparse.Namespace]:
     parser = argparse.ArgumentParser(prog='discord', description='Tools for helping with discord.py-self')
     parser.add_argument('-v', '--version', action='store_true', help='shows the library version')
@@ -331,6 +378,7 @@ def parse_args() -> Tuple[argparse.ArgumentParser, argparse.Namespace]:
     subparser = parser.add_subparsers(dest='subcommand', title='subcommands')
     add_newbot_args(subparser)
     add_newcog_args(subparser)
+    add_archive_args(subparser)
     return parser, parser.parse_args()
 
 
@@ -30,16 +30,20 @@ from datetime import datetime
 from operator import attrgetter
 from typing import (
     Any,
+    AsyncGenerator,
     AsyncIterator,
+    Awaitable,
     Callable,
     Collection,
     Dict,
+    Iterable,
     List,
     Literal,
     Optional,
     TYPE_CHECKING,
     Protocol,
     Sequence,
+    Set,
     Tuple,
     TypeVar,
     Union,
@@ -50,7 +54,7 @@ from typing import (
 from .object import OLDEST_OBJECT, Object
 from .context_managers import Typing
 from .enums import ApplicationCommandType, ChannelType, InviteTarget, NetworkConnectionType
-from .errors import ClientException
+from .errors import ClientException, NotFound
 from .mentions import AllowedMentions
 from .permissions import PermissionOverwrite, Permissions
 from .role import Role
@@ -62,8 +66,16 @@ from .sticker import GuildSticker, StickerItem
 from .settings import ChannelSettings
 from .commands import ApplicationCommand, BaseCommand, SlashCommand, UserCommand, MessageCommand, _command_factory
 from .flags import InviteFlags
+from .history import HistoryCheckpoint
 from . import utils
 
+try:
+    import numpy  # type: ignore
+except ModuleNotFoundError:
+    HAS_NUMPY = False
+else:
+    HAS_NUMPY = True
+
 __all__ = (
     'Snowflake',
     'User',
@@ -104,7 +116,14 @@ if TYPE_CHECKING:
         OverwriteType,
     )
     from .types.embed import EmbedType
-    from .types.message import MessageSearchAuthorType, MessageSearchHasType, PartialMessage as PartialMessagePayload
+    from .types.message import (
+        CloudAttachment as CloudAttachmentPayload,
+        Message as MessagePayload,
+        MessageSearchAuthorType,
+        MessageSearchResult as MessageSearchResultPayload,
+        MessageSearchHasType,
+        PartialMessage as PartialMessagePayload,
+    )
     from .types.snowflake import (
         SnowflakeList,
     )
@@ -124,6 +143,18 @@ class _Undefined:
 _undefined: Any = _Undefined()
 
 
+# Search "index not ready" responses are waited out by the iterator this many times
+# before letting the HTTP client retry them (and eventually give up)
+_MAX_SEARCH_INDEX_RETRIES = 10
+
+# Bounds the messages scanned ahead of the deletes
+_PURGE_QUEUE_SIZE = 100
+_MAX_CACHED_PERMISSIONS = 100_000
+# Below this many distinct role sets, setting up NumPy costs more than it saves
+_BULK_NUMPY_THRESHOLD = 256
+_MAX_PURGE_WORKERS = 10
+
+
 async def _purge_helper(
     channel: Union[Thread, TextChannel, VocalGuildChannel],
     *,
@@ -134,30 +165,83 @@ async def _purge_helper(
     around: Optional[SnowflakeTime] = None,
     oldest_first: Optional[bool] = None,
     reason: Optional[str] = None,
+    return_messages: bool = True,
+    progress: Optional[Callable[[Message], Any]] = None,
 ) -> List[Message]:
     if check is MISSING:
         check = lambda m: True
 
     state = channel._state
+    http = state.http
     channel_id = channel.id
-    iterator = channel.history(limit=limit, before=before, after=after, oldest_first=oldest_first, around=around)
+
+    # History is scanned into a bounded queue while deletes drain it,
+    # with as many deletes in flight as the delete bucket allows
+    queue: asyncio.Queue[Message] = asyncio.Queue(maxsize=_PURGE_QUEUE_SIZE)
+    failed: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+    workers: Set[asyncio.Task[None]] = set()
     ret: List[Message] = []
-    count = 0
-
-    async for message in iterator:
-        if count == 50:
-            to_delete = ret[-50:]
-            await state._delete_messages(channel_id, to_delete, reason=reason)
-            count = 0
-        if not check(message):
-            continue
 
-        count += 1
-        ret.append(message)
+    def spawn() -> None:
+        task = asyncio.create_task(delete())
+        workers.add(task)
+        task.add_done_callback(workers.discard)
+
+    async def delete() -> None:
+        while True:
+            message = await queue.get()
+            try:
+                await http.delete_message(channel_id, message.id, reason=reason)
+                if progress is not None:
+                    progress(message)
+            except NotFound:
+                pass
+            except Exception as exc:
+                if not failed.done():
+                    failed.set_exception(exc)
+                return
+            finally:
+                queue.task_done()
+
+            # Message age decides the bucket, so widen to the one just used
+            ratelimit = http._buckets.get(http._bucket_key(http._delete_message_route(channel_id, message.id)))
+            allowed = min(ratelimit.limit if ratelimit else 1, _MAX_PURGE_WORKERS)
+            while len(workers) < allowed:
+                spawn()
+
+    async def wait(coro: Awaitable[Any]) -> None:
+        task = asyncio.ensure_future(coro)
+        await asyncio.wait((task, failed), return_when=asyncio.FIRST_COMPLETED)
+        if failed.done():
+            task.cancel()
+            failed.result()
+
+    spawn()
+    try:
+        async for message in channel.history(
+            limit=limit, before=before, after=after, oldest_first=oldest_first, around=around, prefetch=2
+        ):
+            if not check(message):
+                continue
+
+            if failed.done():
+                failed.result()
+            if return_messages:
+                ret.append(message)
+            if queue.full():
+                await wait(queue.put(message))
+            else:
+                queue.put_nowait(message)
+
+        await wait(queue.join())
+    finally:
+        for task in list(workers):
+            task.cancel()
+        if failed.done():
+            failed.exception()  # Retrieved so that it isn't logged if something else failed first
+        else:
+            failed.cancel()
 
-    # Some messages remaining to poll
-    to_delete = ret[-count:]
-    await state._delete_messages(channel_id, to_delete, reason=reason)
     return ret
 
 
@@ -280,7 +364,9 @@ async def _handle_message_search(
     application_commands: Collection[Snowflake] = MISSING,
     oldest_first: bool = False,
     most_relevant: bool = False,
-) -> AsyncIterator[Message]:
+    prefetch: int = 1,
+    raw: bool = False,
+) -> AsyncIterator[Union[Message, MessagePayload]]:
     from .channel import PartialMessageable  # circular import
 
     if limit is not None and limit < 0:
@@ -367,44 +453,73 @@ async def _handle_message_search(
     if most_relevant:
         payload['sort_by'] = 'relevance'
 
-    while True:
-        retrieve = min(25 if limit is None else limit, 25)
-        if retrieve < 1:
-            return
-        if retrieve != 25:
-            payload['limit'] = retrieve
-        if offset:
-            payload['offset'] = offset
-
-        data = await endpoint(entity_id, payload)
-        threads = {int(thread['id']): thread for thread in data.get('threads', [])}
-        for member in data.get('members', []):
-            thread_id = int(member['id'])
-            thread = threads.get(thread_id)
-            if thread:
-                thread['member'] = member
-
-        length = len(data['messages'])
-        offset += length
-        if limit is not None:
-            limit -= length
-
-        # Terminate loop on next iteration; there's no data left after this
-        if len(data['messages']) < 25:
-            limit = 0
-
-        for raw_messages in data['messages']:
-            if not raw_messages:
+    async def _pages(limit: Optional[int], offset: int) -> AsyncGenerator[MessageSearchResultPayload, None]:
+        attempts = 0
+        while True:
+            retrieve = min(25 if limit is None else limit, 25)
+            if retrieve < 1:
+                return
+            if retrieve != 25:
+                payload['limit'] = retrieve
+            if offset:
+                payload['offset'] = offset
+
+            data = await endpoint(entity_id, payload, retry_indexing=attempts >= _MAX_SEARCH_INDEX_RETRIES)
+            if data.get('code') == 110000:
+                # The index isn't ready yet, so wait without holding the rate limit bucket
+                attempts += 1
+                payload['attempts'] = attempts
+                await asyncio.sleep(data.get('retry_after') or 5)  # type: ignore # This is a 202 payload
                 continue
 
-            # Context is no longer sent, so this is probably fine
-            raw_message = raw_messages[0]
-            channel_id = int(raw_message['channel_id'])
-            if channel_id in threads:
-                raw_message['thread'] = threads[channel_id]
+            # Indexing retries only apply to the page that was waiting on them
+            attempts = 0
+            payload.pop('attempts', None)
+            yield data
+
+            length = len(data['messages'])
+            offset += length
+            if limit is not None:
+                limit -= length
 
-            channel = _resolve_channel(raw_message)
-            yield _state.create_message(channel=channel, data=raw_message, search_result=data)  # type: ignore
+            if length < 25:
+                # There's no data left after this
+                return
+
+    # Results shift between pages as new messages are indexed
+    seen: Set[int] = set()
+    pages = utils._prefetch(_pages(limit, offset), prefetch)
+    try:
+        async for data in pages:
+            threads = {int(thread['id']): thread for thread in data.get('threads', [])}
+            for member in data.get('members', []):
+                thread_id = int(member['id'])
+                thread = threads.get(thread_id)
+                if thread:
+                    thread['member'] = member
+
+            for raw_messages in data['messages']:
+                if not raw_messages:
+                    continue
+
+                # Skip any context around the actual hit
+                raw_message = next((m for m in raw_messages if m.get('hit')), raw_messages[0])
+                message_id = int(raw_message['id'])
+                if message_id in seen:
+                    continue
+                seen.add(message_id)
+
+                channel_id = int(raw_message['channel_id'])
+                if channel_id in threads:
+                    raw_message['thread'] = threads[channel_id]
+                if raw:
+                    yield raw_message
+                    continue
+
+                channel = _resolve_channel(raw_message)
+                yield _state.create_message(channel=channel, data=raw_message, search_result=data)  # type: ignore
+    finally:
+        await pages.aclose()
 
 
 @runtime_checkable
@@ -575,6 +690,53 @@ class _Overwrites:
         return self.type == 1
 
 
+class _OverwriteIndex:
+    # A channel's overwrites by (type, ID), with the (allow, deny) masks that permission
+    # resolution needs pulled out ahead of time. Channels are shallow copied before they
+    # are updated, so an index is never changed once built, only replaced
+    __slots__ = ('entries', 'everyone', 'roles', 'members')
+
+    def __init__(self) -> None:
+        self.entries: Dict[Tuple[int, int], _Overwrites] = {}
+        self.everyone: Tuple[int, int] = (0, 0)
+        self.roles: Dict[int, Tuple[int, int]] = {}
+        self.members: Dict[int, Tuple[int, int]] = {}
+
+    def _updated(self, overwrites: List[_Overwrites], everyone_id: int) -> _OverwriteIndex:
+        # Builds the index for a new set of overwrites from this one, only touching the entries that changed
+        entries = self.entries
+        ret = _OverwriteIndex()
+        ret.roles = roles = self.roles.copy()
+        ret.members = members = self.members.copy()
+        ret.entries = current = {(overwrite.type, overwrite.id): overwrite for overwrite in overwrites}
+
+        for key in entries.keys() - current.keys():
+            type, id = key
+            if type == _Overwrites.MEMBER:
+                del members[id]
+            elif id != everyone_id:
+                del roles[id]
+
+        for key, overwrite in current.items():
+            if entries.get(key) is overwrite:
+                continue
+
+            type, id = key
+            pair = (overwrite.allow, overwrite.deny)
+            if type == _Overwrites.MEMBER:
+                members[id] = pair
+            elif id != everyone_id:
+                roles[id] = pair
+
+        everyone = current.get((_Overwrites.ROLE, everyone_id))
+        if everyone is not None:
+            ret.everyone = (everyone.allow, everyone.deny)
+        return ret
+
+
+_EMPTY_OVERWRITE_INDEX = _OverwriteIndex()
+
+
 class GuildChannel:
     """An ABC that details the common operations on a Discord guild channel.
 
@@ -609,6 +771,7 @@ class GuildChannel:
     category_id: Optional[int]
     _state: ConnectionState
     _overwrites: List[_Overwrites]
+    _overwrite_index: _OverwriteIndex
 
     if TYPE_CHECKING:
 
@@ -766,29 +929,55 @@ class GuildChannel:
             return await self._state.http.edit_channel(self.id, reason=reason, **options)
 
     def _fill_overwrites(self, data: GuildChannelPayload) -> None:
-        self._overwrites = []
+        try:
+            previous = self._overwrites
+            index = self._overwrite_index
+        except AttributeError:
+            previous = []
+            index = _EMPTY_OVERWRITE_INDEX
+
+        # Overwrites that didn't change are carried over as they are, so that an update
+        # that leaves them alone keeps the same list and index (and the permissions cached for them)
+        entries = index.entries
+        overwrites = []
+        seen = set()
         everyone_index = 0
         everyone_id = self.guild.id
 
-        for index, overridden in enumerate(data.get('permission_overwrites', [])):
-            overwrite = _Overwrites(overridden)
-            self._overwrites.append(overwrite)
-
-            if overwrite.type == _Overwrites.MEMBER:
+        for overridden in data.get('permission_overwrites', []):
+            key = (overridden['type'], int(overridden['id']))
+            if key in seen:
                 continue
+            seen.add(key)
 
-            if overwrite.id == everyone_id:
+            overwrite = entries.get(key)
+            if (
+                overwrite is None
+                or overwrite.allow != int(overridden.get('allow', 0))
+                or overwrite.deny != int(overridden.get('deny', 0))
+            ):
+                overwrite = _Overwrites(overridden)
+
+            if overwrite.type == _Overwrites.ROLE and overwrite.id == everyone_id:
                 # the @everyone role is not guaranteed to be the first one
                 # in the list of permission overwrites, however the permission
                 # resolution code kind of requires that it is the first one in
                 # the list since it is special. So we need the index so we can
                 # swap it to be the first one.
-                everyone_index = index
+                everyone_index = len(overwrites)
+
+            overwrites.append(overwrite)
 
         # do the swap
-        tmp = self._overwrites
-        if tmp:
-            tmp[everyone_index], tmp[0] = tmp[0], tmp[everyone_index]
+        if overwrites:
+            overwrites[everyone_index], overwrites[0] = overwrites[0], overwrites[everyone_index]
+
+        if len(overwrites) == len(previous) and all(new is old for new, old in zip(overwrites, previous)):
+            self._overwrites = previous
+            self._overwrite_index = index
+        else:
+            self._overwrites = overwrites
+            self._overwrite_index = index._updated(overwrites, everyone_id)
 
     @property
     def notification_settings(self) -> ChannelSettings:
@@ -851,20 +1040,20 @@ class GuildChannel:
             The permission overwrites for this object.
         """
 
+        entries = self._overwrite_index.entries
         if isinstance(obj, User):
-            predicate = lambda p: p.is_member()
+            overwrite = entries.get((_Overwrites.MEMBER, obj.id))
         elif isinstance(obj, Role):
-            predicate = lambda p: p.is_role()
+            overwrite = entries.get((_Overwrites.ROLE, obj.id))
         else:
-            predicate = lambda p: True
+            overwrite = entries.get((_Overwrites.ROLE, obj.id)) or entries.get((_Overwrites.MEMBER, obj.id))
 
-        for overwrite in filter(predicate, self._overwrites):
-            if overwrite.id == obj.id:
-                allow = Permissions(overwrite.allow)
-                deny = Permissions(overwrite.deny)
-                return PermissionOverwrite.from_pair(allow, deny)
+        if overwrite is None:
+            return PermissionOverwrite()
 
-        return PermissionOverwrite()
+        allow = Permissions(overwrite.allow)
+        deny = Permissions(overwrite.deny)
+        return PermissionOverwrite.from_pair(allow, deny)
 
     @property
     def overwrites(self) -> Dict[Union[Role, Member, Object], PermissionOverwrite]:
@@ -938,6 +1127,160 @@ class GuildChannel:
             denied = Permissions.all_channel()
             base.value &= ~denied.value
 
+    def _apply_channel_permissions(self, base: Permissions) -> None:
+        # Channel types that imply or deny permissions of their own override this
+        pass
+
+    def _resolve_role_sets(
+        self,
+        role_sets: List[utils.SnowflakeList],
+        everyone: Tuple[int, int],
+        role_overwrites: Dict[int, Tuple[int, int]],
+    ) -> List[Optional[int]]:
+        # Resolves the permissions of a member with each set of roles, up to the member overwrites.
+        # Administrators bypass everything after their roles, so they resolve to None
+        guild = self.guild
+        role_permissions = guild._role_permissions()
+        default = role_permissions.get(guild.id, 0)
+        administrator = Permissions.administrator.flag
+        everyone_allow, everyone_deny = everyone
+
+        if HAS_NUMPY and len(role_sets) >= _BULK_NUMPY_THRESHOLD:
+            ids = sorted({role_id for roles in role_sets for role_id in roles})
+            index = {role_id: column for column, role_id in enumerate(ids)}
+            rows = [row for row, roles in enumerate(role_sets) for _ in roles]
+            columns = [index[role_id] for roles in role_sets for role_id in roles]
+            matrix = numpy.zeros((len(role_sets), len(ids)), dtype=bool)
+            matrix[rows, columns] = True
+            zero = numpy.uint64(0)
+
+            def combine(values: List[int]) -> Any:
+                # ORs together the values of each row's roles
+                return numpy.bitwise_or.reduce(numpy.where(matrix, numpy.array(values, dtype=numpy.uint64), zero), axis=1)
+
+            value = combine([role_permissions.get(role_id, 0) for role_id in ids]) | numpy.uint64(default)
+            admin = (value & numpy.uint64(administrator)) != zero
+            value = (value & ~numpy.uint64(everyone_deny)) | numpy.uint64(everyone_allow)
+            allow = combine([role_overwrites.get(role_id, (0, 0))[0] for role_id in ids])
+            deny = combine([role_overwrites.get(role_id, (0, 0))[1] for role_id in ids])
+            value = (value & ~deny) | allow
+            return [None if is_admin else result for result, is_admin in zip(value.tolist(), admin.tolist())]
+
+        results: List[Optional[int]] = []
+        for roles in role_sets:
+            value = default
+            for role_id in roles:
+                value |= role_permissions.get(role_id, 0)
+
+            if value & administrator:
+                results.append(None)
+                continue
+
+            value = (value & ~everyone_deny) | everyone_allow
+            allow = deny = 0
+            for role_id in roles:
+                try:
+                    role_allow, role_deny = role_overwrites[role_id]
+                except KeyError:
+                    continue
+                allow |= role_allow
+                deny |= role_deny
+
+            results.append((value & ~deny) | allow)
+        return results
+
+    def _bulk_permissions(self, members: Sequence[Member]) -> List[int]:
+        # Members with the same roles share everything but their own overwrites,
+        # so each distinct set of roles is only resolved once
+        role_sets: Dict[bytes, utils.SnowflakeList] = {}
+        keys = []
+        for member in members:
+            key = member._roles.tobytes()
+            role_sets.setdefault(key, member._roles)
+            keys.append(key)
+
+        index = self._overwrite_index
+        member_overwrites = index.members
+        resolved = dict(zip(role_sets, self._resolve_role_sets(list(role_sets.values()), index.everyone, index.roles)))
+
+        everything = Permissions.all().value
+        timeout_mask = Permissions._timeout_mask()
+        owner_id = self.guild.owner_id
+        finals: Dict[int, int] = {}
+        results = []
+        for member, key in zip(members, keys):
+            value = resolved[key]
+            if member.id == owner_id or value is None:
+                value = everything
+            else:
+                try:
+                    allow, deny = member_overwrites[member.id]
+                except KeyError:
+                    pass
+                else:
+                    value = (value & ~deny) | allow
+
+                if member.timed_out_until is not None and member.is_timed_out():
+                    value &= timeout_mask
+
+            try:
+                final = finals[value]
+            except KeyError:
+                base = Permissions(value)
+                self._apply_channel_permissions(base)
+                final = finals[value] = base.value
+            results.append(final)
+        return results
+
+    def permissions_for_many(self, members: Iterable[Member], /) -> List[Permissions]:
+        r"""Handles permission resolution for many :class:`~discord.Member`\s at once.
+
+        This gives the same results as calling :meth:`permissions_for` for each member,
+        but only resolves the roles of members with the same roles once, using NumPy
+        if it is installed, which makes resolving the permissions of a whole guild fast.
+
+        .. versionadded:: 2.1
+
+        Parameters
+        ----------
+        members: Iterable[:class:`~discord.Member`]
+            The members to resolve permissions for.
+
+        Returns
+        -------
+        List[:class:`~discord.Permissions`]
+            The resolved permissions for each member, in the same order.
+        """
+        return [Permissions(value) for value in self._bulk_permissions(list(members))]
+
+    def members_with(self, **permissions: bool) -> List[Member]:
+        r"""Returns the cached members of the guild whose permissions in this channel
+        match the given ones, e.g. ``channel.members_with(read_messages=True, send_messages=False)``.
+
+        This resolves permissions in bulk, like :meth:`permissions_for_many`.
+
+        .. versionadded:: 2.1
+
+        Parameters
+        ----------
+        \*\*permissions: :class:`bool`
+            The permissions to check, and whether members should have them.
+
+        Raises
+        -------
+        TypeError
+            An invalid permission name was given.
+
+        Returns
+        -------
+        List[:class:`~discord.Member`]
+            The members that match.
+        """
+        expected = Permissions(**permissions).value
+        mask = Permissions(**{name: True for name in permissions}).value
+        members = list(self.guild._members.values())
+        return [member for member, value in zip(members, self._bulk_permissions(members)) if value & mask == expected]
+
     def permissions_for(self, obj: Union[Member, Role], /) -> Permissions:
         """Handles permission resolution for the :class:`~discord.Member`
         or :class:`~discord.Role`.
@@ -978,6 +1321,39 @@ class GuildChannel:
             The resolved permissions for the member or role.
         """
 
+        guild = self.guild
+        if guild.owner_id == obj.id:
+            return Permissions.all()
+
+        is_role = isinstance(obj, Role)
+        if not is_role and obj.is_timed_out():  # type: ignore # Member is the only other option
+            # Timeouts run out on their own, so these aren't cached
+            return self._resolve_permissions(obj)
+
+        # Resolved permissions are cached per guild, which clears the cache when roles change.
+        # Overwrites and member roles are replaced rather than mutated when they change,
+        # so checking that the cached entry saw the same ones catches those changes
+        cache = guild._permissions_cache
+        key = (self.id, obj.id)
+        check = obj._permissions if is_role else obj._roles  # type: ignore # Member is the only other option
+        try:
+            overwrites, checked, value = cache[key]
+        except KeyError:
+            value = None
+        else:
+            if overwrites is not self._overwrites or (checked != check if is_role else checked is not check):
+                value = None
+
+        if value is None:
+            value = self._resolve_permissions(obj).value
+            if len(cache) >= _MAX_CACHED_PERMISSIONS:
+                # Evict the oldest entry
+                del cache[next(iter(cache))]
+            cache[key] = (self._overwrites, check, value)
+
+        return Permissions(value)
+
+    def _resolve_permissions(self, obj: Union[Member, Role], /) -> Permissions:
         # The current cases can be explained as:
         # Guild owner get all permissions -- no questions asked
         # The @everyone role gets the first application
@@ -992,11 +1368,9 @@ class GuildChannel:
         # The operation first takes into consideration the denied
         # and then the allowed
 
-        if self.guild.owner_id == obj.id:
-            return Permissions.all()
-
         default = self.guild.default_role
         base = Permissions(default.permissions.value)
+        index = self._overwrite_index
 
         # Handle the role case first
         if isinstance(obj, Role):
@@ -1006,19 +1380,18 @@ class GuildChannel:
                 return Permissions.all()
 
             # Apply @everyone allow/deny first since it's special
-            try:
-                maybe_everyone = self._overwrites[0]
-                if maybe_everyone.id == self.guild.id:
-                    base.handle_overwrite(allow=maybe_everyone.allow, deny=maybe_everyone.deny)
-            except IndexError:
-                pass
+            allow, deny = index.everyone
+            base.handle_overwrite(allow=allow, deny=deny)
 
             if obj.is_default():
                 return base
 
-            overwrite = utils.get(self._overwrites, type=_Overwrites.ROLE, id=obj.id)
-            if overwrite is not None:
-                base.handle_overwrite(overwrite.allow, overwrite.deny)
+            try:
+                allow, deny = index.roles[obj.id]
+            except KeyError:
+                pass
+            else:
+                base.handle_overwrite(allow=allow, deny=deny)
 
             return base
 
@@ -1037,32 +1410,38 @@ class GuildChannel:
             return Permissions.all()
 
         # Apply @everyone allow/deny first since it's special
-        try:
-            maybe_everyone = self._overwrites[0]
-            if maybe_everyone.id == self.guild.id:
-                base.handle_overwrite(allow=maybe_everyone.allow, deny=maybe_everyone.deny)
-                remaining_overwrites = self._overwrites[1:]
-            else:
-                remaining_overwrites = self._overwrites
-        except IndexError:
-            remaining_overwrites = self._overwrites
+        allow, deny = index.everyone
+        base.handle_overwrite(allow=allow, deny=deny)
 
         denies = 0
         allows = 0
 
-        # Apply channel specific role permission overwrites
-        for overwrite in remaining_overwrites:
-            if overwrite.is_role() and roles.has(overwrite.id):
-                denies |= overwrite.deny
-                allows |= overwrite.allow
+        # Apply channel specific role permission overwrites,
+        # walking whichever of the member's roles and the overwrites is shorter
+        role_overwrites = index.roles
+        if len(roles) <= len(role_overwrites):
+            for role_id in roles:
+                try:
+                    allow, deny = role_overwrites[role_id]
+                except KeyError:
+                    continue
+                denies |= deny
+                allows |= allow
+        else:
+            for role_id, (allow, deny) in role_overwrites.items():
+                if roles.has(role_id):
+                    denies |= deny
+                    allows |= allow
 
         base.handle_overwrite(allow=allows, deny=denies)
 
         # Apply member specific permission overwrites
-        for overwrite in remaining_overwrites:
-            if overwrite.is_member() and overwrite.id == obj.id:
-                base.handle_overwrite(allow=overwrite.allow, deny=overwrite.deny)
-                break
+        try:
+            allow, deny = index.members[obj.id]
+        except KeyError:
+            pass
+        else:
+            base.handle_overwrite(allow=allow, deny=deny)
 
         if obj.is_timed_out():
             # Timeout leads to every permission except VIEW_CHANNEL and READ_MESSAGE_HISTORY
@@ -1602,7 +1981,12 @@ class Messageable:
     async def _get_channel(self) -> MessageableChannel:
         raise NotImplementedError
 
-    async def upload_files(self, *files: File) -> List[CloudFile]:
+    async def upload_files(
+        self,
+        *files: File,
+        concurrency: int = 5,
+        progress: Optional[Callable[[File, int, int], Any]] = None,
+    ) -> List[CloudFile]:
         r"""|coro|
 
         Pre-uploads files to Discord's GCP bucket for use with :meth:`send`.
@@ -1610,15 +1994,25 @@ class Messageable:
         This method is useful if you have local files that you want to upload and
         reuse multiple times.
 
+        Upload URLs for all files are requested at once, and the files are then
+        uploaded concurrently.
+
         .. versionadded:: 2.1
 
         Parameters
         ------------
         \*files: :class:`~discord.File`
             A list of files to upload. Must be a maximum of 10.
+        concurrency: :class:`int`
+            The maximum number of files to upload at once. Defaults to ``5``.
+        progress: Optional[Callable[[:class:`~discord.File`, :class:`int`, :class:`int`], Any]]
+            A function called as each file is uploaded with the file,
+            the number of bytes sent so far, and the file's total size in bytes.
 
         Raises
         -------
+        ValueError
+            ``concurrency`` is less than 1.
         ~discord.HTTPException
             Uploading the files failed.
         ~discord.Forbidden
@@ -1630,6 +2024,8 @@ class Messageable:
             The files that were uploaded. These can be used in lieu
             of normal :class:`~discord.File`\s in :meth:`send`.
         """
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
         if not files:
             return []
 
@@ -1638,10 +2034,27 @@ class Messageable:
 
         mapped_files = {i: f for i, f in enumerate(files)}
         data = await self._state.http.get_attachment_urls(channel.id, [f.to_upload_dict(i) for i, f in mapped_files.items()])
-        return [
-            await CloudFile.from_file(state=state, data=uploaded, file=mapped_files[int(uploaded.get('id', 11))])
-            for uploaded in data['attachments']
-        ]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def upload(uploaded: CloudAttachmentPayload) -> CloudFile:
+            file = mapped_files[int(uploaded.get('id', 11))]
+            callback = None
+            if progress is not None:
+                report = progress
+                total = file.size - file._original_pos
+                callback = lambda sent: report(file, sent, total)
+
+            async with semaphore:
+                return await CloudFile.from_file(state=state, data=uploaded, file=file, progress=callback)
+
+        tasks = [asyncio.create_task(upload(uploaded)) for uploaded in data['attachments']]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            # Don't leave the other uploads running if one of them failed
+            for task in tasks:
+                task.cancel()
+            raise
 
     @overload
     async def send(
@@ -2056,7 +2469,15 @@ class Messageable:
         channel = await self._get_channel()
         await self._state.http.ack_pins(channel.id)
 
-    async def pins(self) -> List[Message]:
+    @overload
+    async def pins(self, *, raw: Literal[False] = ...) -> List[Message]:
+        ...
+
+    @overload
+    async def pins(self, *, raw: Literal[True]) -> List[MessagePayload]:
+        ...
+
+    async def pins(self, *, raw: bool = False) -> Union[List[Message], List[MessagePayload]]:
         """|coro|
 
         Retrieves all messages that are currently pinned in the channel.
@@ -2067,6 +2488,14 @@ class Messageable:
             objects returned by this method do not contain complete
             :attr:`.Message.reactions` data.
 
+        Parameters
+        -----------
+        raw: :class:`bool`
+            Whether to return the raw message payloads instead of :class:`~discord.Message` objects.
+            This skips model construction, which is considerably faster when only the data is needed.
+
+            .. versionadded:: 2.1
+
         Raises
         -------
         ~discord.Forbidden
@@ -2076,14 +2505,44 @@ class Messageable:
 
         Returns
         --------
-        List[:class:`~discord.Message`]
+        Union[List[:class:`~discord.Message`], List[:class:`dict`]]
             The messages that are currently pinned.
         """
         channel = await self._get_channel()
         state = self._state
         data = await state.http.pins_from(channel.id)
+        if raw:
+            return data
         return [state.create_message(channel=channel, data=m) for m in data]
 
+    @overload
+    def history(
+        self,
+        *,
+        limit: Optional[int] = ...,
+        before: Optional[SnowflakeTime] = ...,
+        after: Optional[SnowflakeTime] = ...,
+        around: Optional[SnowflakeTime] = ...,
+        oldest_first: Optional[bool] = ...,
+        prefetch: int = ...,
+        raw: Literal[False] = ...,
+    ) -> AsyncIterator[Message]:
+        ...
+
+    @overload
+    def history(
+        self,
+        *,
+        limit: Optional[int] = ...,
+        before: Optional[SnowflakeTime] = ...,
+        after: Optional[SnowflakeTime] = ...,
+        around: Optional[SnowflakeTime] = ...,
+        oldest_first: Optional[bool] = ...,
+        prefetch: int = ...,
+        raw: Literal[True],
+    ) -> AsyncIterator[MessagePayload]:
+        ...
+
     async def history(
         self,
         *,
@@ -2092,7 +2551,9 @@ class Messageable:
         after: Optional[SnowflakeTime] = None,
         around: Optional[SnowflakeTime] = None,
         oldest_first: Optional[bool] = None,
-    ) -> AsyncIterator[Message]:
+        prefetch: int = 0,
+        raw: bool = False,
+    ) -> AsyncIterator[Union[Message, MessagePayload]]:
         """Returns an :term:`asynchronous iterator` that enables receiving the destination's message history.
 
         You must have :attr:`~discord.Permissions.read_message_history` to do this.
@@ -2137,6 +2598,19 @@ class Messageable:
         oldest_first: Optional[:class:`bool`]
             If set to ``True``, return messages in oldest->newest order. Defaults to ``True`` if
             ``after`` is specified, otherwise ``False``.
+        prefetch: :class:`int`
+            The number of pages of up to 100 messages to fetch ahead of the consumer,
+            so that requests overlap with the processing of the messages already received.
+            At most 10 pages are buffered. Defaults to ``0``, which only fetches a page once
+            the previous one has been consumed.
+
+            .. versionadded:: 2.1
+
+        raw: :class:`bool`
+            Whether to yield the raw message payloads instead of :class:`~discord.Message` objects.
+            This skips model construction, which is considerably faster when only the data is needed.
+
+            .. versionadded:: 2.1
 
         Raises
         ------
@@ -2147,8 +2621,8 @@ class Messageable:
 
         Yields
         -------
-        :class:`~discord.Message`
-            The message with the message data parsed.
+        Union[:class:`~discord.Message`, :class:`dict`]
+            The message with the message data parsed, or the raw message payload.
         """
 
         async def _around_strategy(retrieve: int, around: Optional[Snowflake], limit: Optional[int]):
@@ -2227,26 +2701,263 @@ class Messageable:
 
         channel = await self._get_channel()
 
-        while True:
-            retrieve = 100 if limit is None else min(limit, 100)
-            if retrieve < 1:
-                return
+        async def _pages(state: Any, limit: Optional[int]) -> AsyncGenerator[List[MessagePayload], None]:
+            while True:
+                retrieve = 100 if limit is None else min(limit, 100)
+                if retrieve < 1:
+                    return
 
-            data, state, limit = await strategy(retrieve, state, limit)
+                data, state, limit = await strategy(retrieve, state, limit)
 
-            if reverse:
-                data = reversed(data)
-            if predicate:
-                data = filter(predicate, data)
+                if reverse:
+                    data = reversed(data)
+                if predicate:
+                    data = filter(predicate, data)
 
-            count = 0
+                page = list(data)
+                yield page
 
-            for count, raw_message in enumerate(data, 1):
-                yield self._state.create_message(channel=channel, data=raw_message)
+                if len(page) < 100:
+                    # There's no data left after this
+                    return
 
-            if count < 100:
-                # There's no data left after this
-                break
+        pages = utils._prefetch(_pages(state, limit), prefetch)
+        try:
+            async for page in pages:
+                if raw:
+                    for raw_message in page:
+                        yield raw_message
+                    continue
+
+                for raw_message in page:
+                    yield self._state.create_message(channel=channel, data=raw_message)
+        finally:
+            await pages.aclose()
+
+    @overload
+    def history_partitioned(
+        self,
+        *,
+        before: Optional[SnowflakeTime] = ...,
+        after: Optional[SnowflakeTime] = ...,
+        partitions: int = ...,
+        ordered: bool = ...,
+        checkpoint: Optional[HistoryCheckpoint] = ...,
+        buffer: int = ...,
+        raw: Literal[False] = ...,
+    ) -> AsyncIterator[Message]:
+        ...
+
+    @overload
+    def history_partitioned(
+        self,
+        *,
+        before: Optional[SnowflakeTime] = ...,
+        after: Optional[SnowflakeTime] = ...,
+        partitions: int = ...,
+        ordered: bool = ...,
+        checkpoint: Optional[HistoryCheckpoint] = ...,
+        buffer: int = ...,
+        raw: Literal[True],
+    ) -> AsyncIterator[MessagePayload]:
+        ...
+
+    async def history_partitioned(
+        self,
+        *,
+        before: Optional[SnowflakeTime] = None,
+        after: Optional[SnowflakeTime] = None,
+        partitions: int = 4,
+        ordered: bool = True,
+        checkpoint: Optional[HistoryCheckpoint] = None,
+        buffer: int = 2,
+        raw: bool = False,
+    ) -> AsyncIterator[Union[Message, MessagePayload]]:
+        """Returns an :term:`asynchronous iterator` that scans the destination's message history
+        by splitting it into time ranges and fetching them concurrently.
+
+        This is much faster than :meth:`history` for exporting large channels, as the
+        partitions are fetched in parallel within the channel's rate limits.
+
+        You must have :attr:`~discord.Permissions.read_message_history` to do this.
+
+        .. versionadded:: 2.1
+
+        Examples
+        ---------
+
+        Resumable export: ::
+
+            checkpoint = discord.HistoryCheckpoint.from_dict(saved) if saved else discord.HistoryCheckpoint()
+            async for message in channel.history_partitioned(partitions=8, checkpoint=checkpoint):
+                export(message)
+                saved = checkpoint.to_dict()
+
+        Parameters
+        -----------
+        before: Optional[Union[:class:`~discord.abc.Snowflake`, :class:`datetime.datetime`]]
+            Scan messages before this date or message. Defaults to now.
+            If a datetime is provided, it is recommended to use a UTC aware datetime.
+            If the datetime is naive, it is assumed to be local time.
+        after: Optional[Union[:class:`~discord.abc.Snowflake`, :class:`datetime.datetime`]]
+            Scan messages after this date or message. Defaults to the creation of the channel.
+            If a datetime is provided, it is recommended to use a UTC aware datetime.
+            If the datetime is naive, it is assumed to be local time.
+        partitions: :class:`int`
+            The number of time ranges to split the history into and scan concurrently.
+        ordered: :class:`bool`
+            Whether to return messages in oldest->newest order. If ``False``, messages
+            are returned as soon as they are received, ordered only within each partition.
+        checkpoint: Optional[:class:`~discord.HistoryCheckpoint`]
+            The checkpoint to record progress in. If it has already been filled in by
+            a previous scan, the scan is resumed and ``before``, ``after`` and ``partitions``
+            are ignored.
+        buffer: :class:`int`
+            The number of pages of up to 100 messages to buffer ahead of the consumer per partition.
+        raw: :class:`bool`
+            Whether to yield the raw message payloads instead of :class:`~discord.Message` objects.
+
+        Raises
+        ------
+        ValueError
+            ``partitions`` or ``buffer`` was less than 1.
+        ~discord.Forbidden
+            You do not have permissions to get channel message history.
+        ~discord.HTTPException
+            The request to get message history failed.
+
+        Yields
+        -------
+        Union[:class:`~discord.Message`, :class:`dict`]
+            The message with the message data parsed, or the raw message payload.
+        """
+        if partitions < 1:
+            raise ValueError('partitions must be at least 1')
+        if buffer < 1:
+            raise ValueError('buffer must be at least 1')
+
+        channel = await self._get_channel()
+        state = self._state
+
+        if checkpoint is None:
+            checkpoint = HistoryCheckpoint()
+        if not checkpoint:
+            if isinstance(before, datetime):
+                before_id = utils.time_snowflake(before, high=False)
+            elif before is not None:
+                before_id = before.id
+            else:
+                before_id = utils.time_snowflake(utils.utcnow(), high=True) + 1
+            if isinstance(after, datetime):
+                after_id = utils.time_snowflake(after, high=True)
+            elif after is not None:
+                after_id = after.id
+            else:
+                # No message can predate its channel
+                after_id = channel.id - 1
+
+            checkpoint.segments = HistoryCheckpoint._split(after_id, before_id, partitions).segments
+
+        segments = checkpoint.segments
+        if ordered:
+            queues = [asyncio.Queue(maxsize=buffer) for _ in segments]
+        else:
+            shared = asyncio.Queue(maxsize=buffer * len(segments))
+            queues = [shared] * len(segments)
+
+        async def produce(index: int, cursor: int, end: int) -> None:
+            queue = queues[index]
+            try:
+                while cursor < end - 1:
+                    data = await state.http.logs_from(channel.id, 100, after=cursor)
+                    page = [raw for raw in reversed(data) if int(raw['id']) < end]
+                    if page:
+                        await queue.put((index, page))
+                        cursor = int(page[-1]['id'])
+                    if len(page) < 100:
+                        # Either out of messages or into the next partition
+                        break
+            except Exception as exc:
+                await queue.put((index, exc))
+            else:
+                await queue.put((index, None))
+
+        pending = [index for index, (cursor, end) in enumerate(segments) if cursor < end - 1]
+        tasks = [asyncio.create_task(produce(index, *segments[index])) for index in pending]
+        try:
+            while pending:
+                index, item = await queues[pending[0]].get()
+                if item is None:
+                    segment = segments[index]
+                    segment[0] = segment[1] - 1
+                    pending.remove(index)
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+
+                segment = segments[index]
+                for raw_message in item:
+                    yield raw_message if raw else state.create_message(channel=channel, data=raw_message)
+                    segment[0] = int(raw_message['id'])
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @overload
+    def search(
+        self,
+        content: str = ...,
+        *,
+        limit: Optional[int] = ...,
+        offset: int = ...,
+        before: SnowflakeTime = ...,
+        after: SnowflakeTime = ...,
+        authors: Collection[Snowflake] = ...,
+        author_types: Collection[MessageSearchAuthorType] = ...,
+        mentions: Collection[Snowflake] = ...,
+        mention_everyone: bool = ...,
+        pinned: bool = ...,
+        has: Collection[MessageSearchHasType] = ...,
+        embed_types: Collection[EmbedType] = ...,
+        embed_providers: Collection[str] = ...,
+        link_hostnames: Collection[str] = ...,
+        attachment_filenames: Collection[str] = ...,
+        attachment_extensions: Collection[str] = ...,
+        application_commands: Collection[Snowflake] = ...,
+        oldest_first: bool = ...,
+        most_relevant: bool = ...,
+        prefetch: int = ...,
+        raw: Literal[False] = ...,
+    ) -> AsyncIterator[Message]:
+        ...
+
+    @overload
+    def search(
+        self,
+        content: str = ...,
+        *,
+        limit: Optional[int] = ...,
+        offset: int = ...,
+        before: SnowflakeTime = ...,
+        after: SnowflakeTime = ...,
+        authors: Collection[Snowflake] = ...,
+        author_types: Collection[MessageSearchAuthorType] = ...,
+        mentions: Collection[Snowflake] = ...,
+        mention_everyone: bool = ...,
+        pinned: bool = ...,
+        has: Collection[MessageSearchHasType] = ...,
+        embed_types: Collection[EmbedType] = ...,
+        embed_providers: Collection[str] = ...,
+        link_hostnames: Collection[str] = ...,
+        attachment_filenames: Collection[str] = ...,
+        attachment_extensions: Collection[str] = ...,
+        application_commands: Collection[Snowflake] = ...,
+        oldest_first: bool = ...,
+        most_relevant: bool = ...,
+        prefetch: int = ...,
+        raw: Literal[True],
+    ) -> AsyncIterator[MessagePayload]:
+        ...
 
     def search(
         self,
@@ -2270,7 +2981,9 @@ class Messageable:
         application_commands: Collection[Snowflake] = MISSING,
         oldest_first: bool = False,
         most_relevant: bool = False,
-    ) -> AsyncIterator[Message]:
+        prefetch: int = 1,
+        raw: bool = False,
+    ) -> AsyncIterator[Union[Message, MessagePayload]]:
         """Returns an :term:`asynchronous iterator` that enables searching the channel's messages.
 
         You must have :attr:`~discord.Permissions.read_message_history` to do this.
@@ -2352,6 +3065,12 @@ class Messageable:
         most_relevant: :class:`bool`
             Whether to sort the results by relevance. Using this with ``oldest_first``
             will return the least relevant results first.
+        prefetch: :class:`int`
+            The number of pages of up to 25 results to fetch ahead of the consumer.
+            Results repeated across pages are skipped. Defaults to ``1``.
+        raw: :class:`bool`
+            Whether to yield the raw message payloads instead of :class:`~discord.Message` objects.
+            This skips model construction, which is considerably faster when only the data is needed.
 
         Raises
         ------
@@ -2364,8 +3083,8 @@ class Messageable:
 
         Yields
         -------
-        :class:`~discord.Message`
-            The message with the message data parsed.
+        Union[:class:`~discord.Message`, :class:`dict`]
+            The message with the message data parsed, or the raw message payload.
         """
         return _handle_message_search(
             self,
@@ -2388,6 +3107,8 @@ class Messageable:
             application_commands=application_commands,
             oldest_first=oldest_first,
             most_relevant=most_relevant,
+            prefetch=prefetch,
+            raw=raw,
         )
 
     async def application_commands(self) -> List[Union[SlashCommand, UserCommand, MessageCommand]]:
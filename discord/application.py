@@ -24,6 +24,7 @@ DEALINGS IN THE SOFTWARE.
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, AsyncIterator, Collection, List, Mapping, Optional, Sequence, Tuple, Union, overload
 from urllib.parse import quote
@@ -1366,7 +1367,7 @@ class ApplicationBuild(Hashable):
         await self._state.http.edit_build(self.application_id, self.id, str(status))
         self.status = try_enum(ApplicationBuildStatus, str(status))
 
-    async def upload_files(self, *files: File, hash: bool = True) -> None:
+    async def upload_files(self, *files: File, hash: bool = True, concurrency: int = 5) -> None:
         r"""|coro|
 
         Uploads files to the build.
@@ -1385,23 +1386,45 @@ class ApplicationBuild(Hashable):
             The files to upload.
         hash: :class:`bool`
             Whether to calculate the MD5 hash of the files before upload.
+        concurrency: :class:`int`
+            The maximum number of files to upload at once. Defaults to ``5``.
+
+            .. versionadded:: 2.1
 
         Raises
         -------
+        ValueError
+            ``concurrency`` is less than 1.
         Forbidden
             You are not allowed to manage this application.
         HTTPException
             Uploading the files failed.
         """
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
         if not files:
             return
 
+        if hash:
+            # Hash off the event loop up front so the request below only reads the cached digests
+            await asyncio.gather(*(f._async_b64_md5() for f in files))
+
         urls = await self._state.http.get_build_upload_urls(self.application_id, self.id, files, hash)
         id_files = {f.filename: f for f in files}
-        for url in urls:
-            file = id_files.get(url['id'])
-            if file:
-                await self._state.http.upload_to_cloud(url['url'], file, file.b64_md5 if hash else None)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def upload(url: str, file: File) -> None:
+            async with semaphore:
+                await self._state.http.upload_to_cloud(url, file, file.b64_md5 if hash else None)
+
+        tasks = [asyncio.create_task(upload(url['url'], id_files[url['id']])) for url in urls if url['id'] in id_files]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Don't leave the other uploads running if one of them failed
+            for task in tasks:
+                task.cancel()
+            raise
 
     async def publish(self) -> None:
         """|coro|
@@ -24,9 +24,13 @@ DEALINGS IN THE SOFTWARE.
 
 from __future__ import annotations
 
+import asyncio
+from collections import OrderedDict
+from hashlib import sha256
 import io
 import os
-from typing import Any, Literal, Optional, TYPE_CHECKING, Tuple, Union
+import secrets
+from typing import IO, Any, AsyncIterable, AsyncIterator, Literal, Optional, TYPE_CHECKING, Tuple, Union
 from .errors import DiscordException
 from . import utils
 from .file import File
@@ -36,6 +40,7 @@ import yarl
 # fmt: off
 __all__ = (
     'Asset',
+    'AssetCache',
 )
 # fmt: on
 
@@ -57,6 +62,233 @@ VALID_ASSET_FORMATS = VALID_STATIC_FORMATS | {"gif"}
 MISSING = utils.MISSING
 
 
+class AssetCache:
+    """Represents a disk-backed, size-bounded cache of downloaded CDN assets.
+
+    Asset URLs embed the asset's hash, so their content never changes and a cached
+    copy never goes stale. Entries are stored as one file each in :attr:`path`
+    and evicted in least-recently-used order once :attr:`max_size` is exceeded.
+
+    This can be passed to :class:`Client` to make :meth:`Asset.read` and
+    :meth:`Asset.save` (and the same methods on emojis and stickers) read
+    from disk instead of downloading the asset again.
+
+    .. versionadded:: 2.1
+
+    .. container:: operations
+
+        .. describe:: len(x)
+
+            Returns the number of cached assets.
+
+        .. describe:: x in y
+
+            Checks if an asset URL is cached.
+
+    Parameters
+    -----------
+    path: Union[:class:`str`, :class:`os.PathLike`]
+        The directory to store cached assets in. It is created if it does not exist.
+        Existing entries are picked up, so the cache survives restarts.
+    max_size: :class:`int`
+        The maximum total size of the cache in bytes. Defaults to 256 MiB.
+
+    Attributes
+    -----------
+    path: :class:`str`
+        The directory cached assets are stored in.
+    max_size: :class:`int`
+        The maximum total size of the cache in bytes.
+    """
+
+    __slots__ = ('path', 'max_size', '_entries', '_size')
+
+    def __init__(self, path: Union[str, os.PathLike[Any]], *, max_size: int = 256 * 1024 * 1024) -> None:
+        self.path: str = os.fspath(path)
+        self.max_size: int = max_size
+        # Entry filename -> size, in least to most recently used order
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size: int = 0
+
+        os.makedirs(self.path, exist_ok=True)
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+
+        for _, name, size in sorted(entries):
+            self._entries[name] = size
+            self._size += size
+
+    def __repr__(self) -> str:
+        return f'<AssetCache path={self.path!r} entries={len(self._entries)} size={self._size} max_size={self.max_size}>'
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, url: object) -> bool:
+        return isinstance(url, str) and self._name(url) in self._entries
+
+    @property
+    def size(self) -> int:
+        """:class:`int`: The total size of the cached assets in bytes."""
+        return self._size
+
+    @staticmethod
+    def _name(url: str) -> str:
+        return sha256(url.encode('utf-8')).hexdigest()
+
+    def _tmp_path(self, name: str) -> str:
+        # Unique per writer, so concurrent downloads of the same asset don't clobber each other
+        return os.path.join(self.path, f'{name}.{secrets.token_hex(4)}.tmp')
+
+    def _touch(self, name: str) -> None:
+        self._entries.move_to_end(name)
+
+    def _add(self, name: str, size: int) -> None:
+        self._size += size - self._entries.pop(name, 0)
+        self._entries[name] = size
+        while self._size > self.max_size and self._entries:
+            evicted, evicted_size = self._entries.popitem(last=False)
+            self._size -= evicted_size
+            try:
+                os.remove(os.path.join(self.path, evicted))
+            except OSError:
+                pass
+
+    def _forget(self, name: str) -> None:
+        self._size -= self._entries.pop(name, 0)
+
+    def _open(self, name: str) -> Optional[IO[bytes]]:
+        path = os.path.join(self.path, name)
+        try:
+            fp = open(path, 'rb')
+        except OSError:
+            return None
+
+        # Keep the on-disk order in sync, so the LRU order survives restarts
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return fp
+
+    async def open(self, url: str) -> Optional[IO[bytes]]:
+        """|coro|
+
+        Opens the cached copy of an asset for reading.
+
+        Parameters
+        -----------
+        url: :class:`str`
+            The URL of the asset.
+
+        Returns
+        --------
+        Optional[:term:`py:file object`]
+            The cached asset opened in binary mode, or ``None`` if it is not cached.
+            The caller is responsible for closing it.
+        """
+        name = self._name(url)
+        if name not in self._entries:
+            return None
+
+        self._touch(name)
+        fp = await asyncio.get_running_loop().run_in_executor(None, self._open, name)
+        if fp is None:
+            # Removed from disk by something else
+            self._forget(name)
+        return fp
+
+    async def get(self, url: str) -> Optional[bytes]:
+        """|coro|
+
+        Retrieves the cached content of an asset.
+
+        Parameters
+        -----------
+        url: :class:`str`
+            The URL of the asset.
+
+        Returns
+        --------
+        Optional[:class:`bytes`]
+            The content of the asset, or ``None`` if it is not cached.
+        """
+        fp = await self.open(url)
+        if fp is None:
+            return None
+
+        with fp:
+            return await asyncio.get_running_loop().run_in_executor(None, fp.read)
+
+    def _write(self, name: str, data: bytes) -> None:
+        tmp = self._tmp_path(name)
+        with open(tmp, 'wb') as fp:
+            fp.write(data)
+        os.replace(tmp, os.path.join(self.path, name))
+
+    async def put(self, url: str, data: bytes) -> None:
+        """|coro|
+
+        Stores the content of an asset, evicting the least recently used assets if necessary.
+
+        Assets larger than :attr:`max_size` are not cached.
+
+        Parameters
+        -----------
+        url: :class:`str`
+            The URL of the asset.
+        data: :class:`bytes`
+            The content of the asset.
+        """
+        if len(data) > self.max_size:
+            return
+
+        name = self._name(url)
+        await asyncio.get_running_loop().run_in_executor(None, self._write, name, data)
+        self._add(name, len(data))
+
+    async def _tee(self, url: str, chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        # Passes chunks through while writing them to a temporary file,
+        # which only becomes a cache entry once the stream has been fully consumed
+        loop = asyncio.get_running_loop()
+        name = self._name(url)
+        tmp = self._tmp_path(name)
+        fp = await loop.run_in_executor(None, open, tmp, 'wb')
+        size = 0
+        try:
+            async for chunk in chunks:
+                if size <= self.max_size:
+                    await loop.run_in_executor(None, fp.write, chunk)
+                size += len(chunk)
+                yield chunk
+        except BaseException:
+            fp.close()
+            os.remove(tmp)
+            raise
+
+        fp.close()
+        if size > self.max_size:
+            os.remove(tmp)
+            return
+
+        os.replace(tmp, os.path.join(self.path, name))
+        self._add(name, size)
+
+    def clear(self) -> None:
+        """Removes every cached asset."""
+        for name in self._entries:
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                pass
+
+        self._entries.clear()
+        self._size = 0
+
+
 class AssetMixin:
     __slots__ = ()
     url: str
@@ -81,16 +313,26 @@ class AssetMixin:
         :class:`bytes`
             The content of the asset.
         """
+        self._check_readable()
+        state = self._state
+        assert state is not None
+        return await state.http.get_from_cdn(self.url, cache=True)
+
+    def _check_readable(self) -> None:
         if self._state is None:
             raise DiscordException('Invalid state (no ConnectionState provided)')
 
-        return await self._state.http.get_from_cdn(self.url)
-
     async def save(self, fp: Union[str, bytes, os.PathLike[Any], io.BufferedIOBase], *, seek_begin: bool = True) -> int:
         """|coro|
 
         Saves this asset into a file-like object.
 
+        The asset is written as it is downloaded, so it is never held in memory as a whole.
+
+        .. versionchanged:: 2.1
+
+            The asset is now streamed to ``fp`` instead of being read into memory first.
+
         Parameters
         ----------
         fp: Union[:class:`io.BufferedIOBase`, :class:`os.PathLike`]
@@ -116,15 +358,33 @@ class AssetMixin:
             The number of bytes written.
         """
 
-        data = await self.read()
+        self._check_readable()
+        state = self._state
+        assert state is not None
+        chunks = state.http.stream_from_cdn(self.url, cache=True)
         if isinstance(fp, io.BufferedIOBase):
-            written = fp.write(data)
+            written = 0
+            async for chunk in chunks:
+                written += fp.write(chunk)
             if seek_begin:
                 fp.seek(0)
             return written
         else:
-            with open(fp, 'wb') as f:
-                return f.write(data)
+            # Written to a temporary file that only replaces the target once the download is complete,
+            # so a failed download doesn't leave a truncated file or destroy an existing one
+            path = os.fsdecode(fp)
+            tmp = f'{path}.{secrets.token_hex(4)}.tmp'
+            try:
+                with open(tmp, 'wb') as f:
+                    written = 0
+                    async for chunk in chunks:
+                        written += f.write(chunk)
+                os.replace(tmp, path)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+            return written
 
     async def to_file(
         self,
@@ -26,6 +26,7 @@ from __future__ import annotations
 
 from typing import (
     Any,
+    AsyncGenerator,
     AsyncIterator,
     Callable,
     Dict,
@@ -90,7 +91,7 @@ __all__ = (
 if TYPE_CHECKING:
     from typing_extensions import Self
 
-    from .types.threads import ThreadArchiveDuration
+    from .types.threads import Thread as ThreadPayload, ThreadArchiveDuration
     from .client import Client
     from .role import Role
     from .object import Object
@@ -200,6 +201,7 @@ class TextChannel(discord.abc.Messageable, discord.abc.GuildChannel, Hashable):
         'position',
         'slowmode_delay',
         '_overwrites',
+        '_overwrite_index',
         '_type',
         'last_message_id',
         'last_pin_timestamp',
@@ -260,17 +262,20 @@ class TextChannel(discord.abc.Messageable, discord.abc.GuildChannel, Hashable):
     @utils.copy_doc(discord.abc.GuildChannel.permissions_for)
     def permissions_for(self, obj: Union[Member, Role], /) -> Permissions:
         base = super().permissions_for(obj)
+        self._apply_channel_permissions(base)
+        return base
+
+    def _apply_channel_permissions(self, base: Permissions) -> None:
         self._apply_implicit_permissions(base)
 
         # text channels do not have voice related permissions
         denied = Permissions.voice()
         base.value &= ~denied.value
-        return base
 
     @property
     def members(self) -> List[Member]:
         """List[:class:`Member`]: Returns all members that can see this channel."""
-        return [m for m in self.guild.members if self.permissions_for(m).read_messages]
+        return self.members_with(read_messages=True)
 
     @property
     def threads(self) -> List[Thread]:
@@ -544,6 +549,8 @@ class TextChannel(discord.abc.Messageable, discord.abc.GuildChannel, Hashable):
         around: Optional[SnowflakeTime] = None,
         oldest_first: Optional[bool] = None,
         reason: Optional[str] = None,
+        return_messages: bool = True,
+        progress: Optional[Callable[[Message], Any]] = None,
     ) -> List[Message]:
         """|coro|
 
@@ -587,6 +594,15 @@ class TextChannel(discord.abc.Messageable, discord.abc.GuildChannel, Hashable):
             Same as ``oldest_first`` in :meth:`history`.
         reason: Optional[:class:`str`]
             The reason for purging the messages. Shows up on the audit log.
+        return_messages: :class:`bool`
+            Whether to collect and return the deleted messages. Disable this for large
+            purges to avoid holding every message in memory.
+
+            .. versionadded:: 2.1
+        progress: Optional[Callable[[:class:`Message`], Any]]
+            A function called with each message once it has been deleted.
+
+            .. versionadded:: 2.1
 
         Raises
         -------
@@ -598,7 +614,7 @@ class TextChannel(discord.abc.Messageable, discord.abc.GuildChannel, Hashable):
         Returns
         --------
         List[:class:`.Message`]
-            The list of messages that were deleted.
+            The list of messages that were deleted. Empty if ``return_messages`` is ``False``.
         """
         return await discord.abc._purge_helper(
             self,
@@ -609,6 +625,8 @@ class TextChannel(discord.abc.Messageable, discord.abc.GuildChannel, Hashable):
             around=around,
             oldest_first=oldest_first,
             reason=reason,
+            return_messages=return_messages,
+            progress=progress,
         )
 
     async def webhooks(self) -> List[Webhook]:
@@ -871,6 +889,7 @@ class TextChannel(discord.abc.Messageable, discord.abc.GuildChannel, Hashable):
         joined: bool = False,
         limit: Optional[int] = 100,
         before: Optional[Union[Snowflake, datetime.datetime]] = None,
+        prefetch: int = 0,
     ) -> AsyncIterator[Thread]:
         """Returns an :term:`asynchronous iterator` that iterates over all archived threads in this text channel,
         in order of decreasing ID for joined threads, and decreasing :attr:`Thread.archive_timestamp` otherwise.
@@ -893,6 +912,11 @@ class TextChannel(discord.abc.Messageable, discord.abc.GuildChannel, Hashable):
         joined: :class:`bool`
             Whether to retrieve private archived threads that you've joined.
             You cannot set ``joined`` to ``True`` and ``private`` to ``False``.
+        prefetch: :class:`int`
+            The number of pages of up to 100 threads to fetch ahead of the consumer.
+            At most 10 pages are buffered. Defaults to ``0``.
+
+            .. versionadded:: 2.1
 
         Raises
         ------
@@ -934,29 +958,39 @@ class TextChannel(discord.abc.Messageable, discord.abc.GuildChannel, Hashable):
         elif private:
             endpoint = self.guild._state.http.get_private_archived_threads
 
-        while True:
-            retrieve = 100
-            if limit is not None:
-                if limit <= 0:
-                    return
-                retrieve = max(2, min(retrieve, limit))
-
-            data = await endpoint(self.id, before=before_timestamp, limit=retrieve)
-
-            threads = data.get('threads', [])
-            for raw_thread in threads:
-                yield Thread(guild=self.guild, state=self.guild._state, data=raw_thread)
-                # Currently the API doesn't let you request less than 2 threads.
-                # Bail out early if we had to retrieve more than what the limit was.
+        async def _pages(before_timestamp: Optional[str], limit: Optional[int]) -> AsyncGenerator[List[ThreadPayload], None]:
+            while True:
+                retrieve = 100
                 if limit is not None:
-                    limit -= 1
                     if limit <= 0:
                         return
+                    retrieve = max(2, min(retrieve, limit))
 
-            if not data.get('has_more', False):
-                return
+                data = await endpoint(self.id, before=before_timestamp, limit=retrieve)
 
-            before_timestamp = update_before(threads[-1])
+                threads = data.get('threads', [])
+                yield threads
+
+                if limit is not None:
+                    limit -= len(threads)
+                if not data.get('has_more', False):
+                    return
+
+                before_timestamp = update_before(threads[-1])
+
+        pages = utils._prefetch(_pages(before_timestamp, limit), prefetch)
+        try:
+            async for threads in pages:
+                for raw_thread in threads:
+                    yield Thread(guild=self.guild, state=self.guild._state, data=raw_thread)
+                    # Currently the API doesn't let you request less than 2 threads.
+                    # Bail out early if we had to retrieve more than what the limit was.
+                    if limit is not None:
+                        limit -= 1
+                        if limit <= 0:
+                            return
+        finally:
+            await pages.aclose()
 
 
 class VocalGuildChannel(discord.abc.Messageable, discord.abc.Connectable, discord.abc.GuildChannel, Hashable):
@@ -971,6 +1005,7 @@ class VocalGuildChannel(discord.abc.Messageable, discord.abc.Connectable, discor
         'position',
         'slowmode_delay',
         '_overwrites',
+        '_overwrite_index',
         'category_id',
         'rtc_region',
         'video_quality_mode',
@@ -1064,6 +1099,10 @@ class VocalGuildChannel(discord.abc.Messageable, discord.abc.Connectable, discor
     @utils.copy_doc(discord.abc.GuildChannel.permissions_for)
     def permissions_for(self, obj: Union[Member, Role], /) -> Permissions:
         base = super().permissions_for(obj)
+        self._apply_channel_permissions(base)
+        return base
+
+    def _apply_channel_permissions(self, base: Permissions) -> None:
         self._apply_implicit_permissions(base)
 
         # voice channels cannot be edited by people who can't connect to them
@@ -1072,7 +1111,6 @@ class VocalGuildChannel(discord.abc.Messageable, discord.abc.Connectable, discor
             denied = Permissions.voice()
             denied.update(manage_channels=True, manage_roles=True)
             base.value &= ~denied.value
-        return base
 
     @property
     def read_state(self) -> ReadState:
@@ -1238,6 +1276,8 @@ class VocalGuildChannel(discord.abc.Messageable, discord.abc.Connectable, discor
         around: Optional[SnowflakeTime] = None,
         oldest_first: Optional[bool] = None,
         reason: Optional[str] = None,
+        return_messages: bool = True,
+        progress: Optional[Callable[[Message], Any]] = None,
     ) -> List[Message]:
         """|coro|
 
@@ -1279,6 +1319,15 @@ class VocalGuildChannel(discord.abc.Messageable, discord.abc.Connectable, discor
             Same as ``oldest_first`` in :meth:`history`.
         reason: Optional[:class:`str`]
             The reason for purging the messages. Shows up on the audit log.
+        return_messages: :class:`bool`
+            Whether to collect and return the deleted messages. Disable this for large
+            purges to avoid holding every message in memory.
+
+            .. versionadded:: 2.1
+        progress: Optional[Callable[[:class:`Message`], Any]]
+            A function called with each message once it has been deleted.
+
+            .. versionadded:: 2.1
 
         Raises
         -------
@@ -1290,7 +1339,7 @@ class VocalGuildChannel(discord.abc.Messageable, discord.abc.Connectable, discor
         Returns
         --------
         List[:class:`.Message`]
-            The list of messages that were deleted.
+            The list of messages that were deleted. Empty if ``return_messages`` is ``False``.
         """
         return await discord.abc._purge_helper(
             self,
@@ -1301,6 +1350,8 @@ class VocalGuildChannel(discord.abc.Messageable, discord.abc.Connectable, discor
             around=around,
             oldest_first=oldest_first,
             reason=reason,
+            return_messages=return_messages,
+            progress=progress,
         )
 
     async def webhooks(self) -> List[Webhook]:
@@ -1937,7 +1988,7 @@ class CategoryChannel(discord.abc.GuildChannel, Hashable):
             To check if the channel or the guild of that channel are marked as NSFW, consider :meth:`is_nsfw` instead.
     """
 
-    __slots__ = ('name', 'id', 'guild', 'nsfw', '_state', 'position', '_overwrites', 'category_id')
+    __slots__ = ('name', 'id', 'guild', 'nsfw', '_state', 'position', '_overwrites', '_overwrite_index', 'category_id')
 
     def __init__(self, *, state: ConnectionState, guild: Guild, data: CategoryChannelPayload):
         self._state: ConnectionState = state
@@ -2437,6 +2488,7 @@ class ForumChannel(discord.abc.GuildChannel, Hashable):
         'position',
         'slowmode_delay',
         '_overwrites',
+        '_overwrite_index',
         'last_message_id',
         'default_auto_archive_duration',
         'default_thread_slowmode_delay',
@@ -2510,12 +2562,15 @@ class ForumChannel(discord.abc.GuildChannel, Hashable):
     @utils.copy_doc(discord.abc.GuildChannel.permissions_for)
     def permissions_for(self, obj: Union[Member, Role], /) -> Permissions:
         base = super().permissions_for(obj)
+        self._apply_channel_permissions(base)
+        return base
+
+    def _apply_channel_permissions(self, base: Permissions) -> None:
         self._apply_implicit_permissions(base)
 
         # text channels do not have voice related permissions
         denied = Permissions.voice()
         base.value &= ~denied.value
-        return base
 
     def get_thread(self, thread_id: int, /) -> Optional[Thread]:
         """Returns a thread with the given ID.
@@ -2981,6 +3036,7 @@ class ForumChannel(discord.abc.GuildChannel, Hashable):
         *,
         limit: Optional[int] = 100,
         before: Optional[Union[Snowflake, datetime.datetime]] = None,
+        prefetch: int = 0,
     ) -> AsyncIterator[Thread]:
         """Returns an :term:`asynchronous iterator` that iterates over all archived threads in this forum
         in order of decreasing :attr:`Thread.archive_timestamp`.
@@ -2995,6 +3051,11 @@ class ForumChannel(discord.abc.GuildChannel, Hashable):
             that this would make it a slow operation.
         before: Optional[Union[:class:`abc.Snowflake`, :class:`datetime.datetime`]]
             Retrieve archived channels before the given date or ID.
+        prefetch: :class:`int`
+            The number of pages of up to 100 threads to fetch ahead of the consumer.
+            At most 10 pages are buffered. Defaults to ``0``.
+
+            .. versionadded:: 2.1
 
         Raises
         ------
@@ -3017,29 +3078,41 @@ class ForumChannel(discord.abc.GuildChannel, Hashable):
 
         update_before = lambda data: data['thread_metadata']['archive_timestamp']
 
-        while True:
-            retrieve = 100
-            if limit is not None:
-                if limit <= 0:
-                    return
-                retrieve = max(2, min(retrieve, limit))
-
-            data = await self.guild._state.http.get_public_archived_threads(self.id, before=before_timestamp, limit=retrieve)
-
-            threads = data.get('threads', [])
-            for raw_thread in threads:
-                yield Thread(guild=self.guild, state=self.guild._state, data=raw_thread)
-                # Currently the API doesn't let you request less than 2 threads.
-                # Bail out early if we had to retrieve more than what the limit was.
+        async def _pages(before_timestamp: Optional[str], limit: Optional[int]) -> AsyncGenerator[List[ThreadPayload], None]:
+            while True:
+                retrieve = 100
                 if limit is not None:
-                    limit -= 1
                     if limit <= 0:
                         return
+                    retrieve = max(2, min(retrieve, limit))
 
-            if not data.get('has_more', False):
-                return
+                data = await self.guild._state.http.get_public_archived_threads(
+                    self.id, before=before_timestamp, limit=retrieve
+                )
 
-            before_timestamp = update_before(threads[-1])
+                threads = data.get('threads', [])
+                yield threads
+
+                if limit is not None:
+                    limit -= len(threads)
+                if not data.get('has_more', False):
+                    return
+
+                before_timestamp = update_before(threads[-1])
+
+        pages = utils._prefetch(_pages(before_timestamp, limit), prefetch)
+        try:
+            async for threads in pages:
+                for raw_thread in threads:
+                    yield Thread(guild=self.guild, state=self.guild._state, data=raw_thread)
+                    # Currently the API doesn't let you request less than 2 threads.
+                    # Bail out early if we had to retrieve more than what the limit was.
+                    if limit is not None:
+                        limit -= 1
+                        if limit <= 0:
+                            return
+        finally:
+            await pages.aclose()
 
 
 class DirectoryChannel(discord.abc.GuildChannel, Hashable):
@@ -3096,6 +3169,7 @@ class DirectoryChannel(discord.abc.GuildChannel, Hashable):
         'category_id',
         'position',
         '_overwrites',
+        '_overwrite_index',
         'last_message_id',
     )
 
@@ -3142,17 +3216,20 @@ class DirectoryChannel(discord.abc.GuildChannel, Hashable):
     @utils.copy_doc(discord.abc.GuildChannel.permissions_for)
     def permissions_for(self, obj: Union[Member, Role], /) -> Permissions:
         base = super().permissions_for(obj)
+        self._apply_channel_permissions(base)
+        return base
+
+    def _apply_channel_permissions(self, base: Permissions) -> None:
         self._apply_implicit_permissions(base)
 
         # text channels do not have voice related permissions
         denied = Permissions.voice()
         base.value &= ~denied.value
-        return base
 
     @property
     def members(self) -> List[Member]:
         """List[:class:`Member`]: Returns all members that can see this channel."""
-        return [m for m in self.guild.members if self.permissions_for(m).read_messages]
+        return self.members_with(read_messages=True)
 
     @property
     def read_state(self) -> ReadState:
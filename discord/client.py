@@ -29,6 +29,7 @@ from datetime import datetime
 import logging
 from typing import (
     Any,
+    AsyncGenerator,
     AsyncIterator,
     Awaitable,
     Callable,
@@ -36,6 +37,7 @@ from typing import (
     Coroutine,
     Dict,
     Generator,
+    Iterable,
     List,
     Literal,
     Optional,
@@ -109,8 +111,11 @@ if TYPE_CHECKING:
     from .permissions import Permissions
     from .read_state import ReadState
     from .tutorial import Tutorial
+    from .asset import AssetCache
     from .file import File
+    from .http import Route
     from .guild import Guild
+    from .types.payments import Payment as PaymentPayload
     from .types.snowflake import Snowflake as _Snowflake
 
     PrivateChannel = Union[DMChannel, GroupChannel]
@@ -163,6 +168,21 @@ class Client:
 
         .. versionchanged:: 1.3
             Allow disabling the message cache and change the default size to ``1000``.
+    lazy_messages: :class:`bool`
+        Whether to defer building a message's attachments, embeds, reactions, stickers, mentions,
+        components, reference and the like until they are first accessed. This makes receiving
+        messages that are only inspected for their content, author and channel considerably cheaper,
+        at the cost of keeping each message's payload around. Note that mentioned users are only
+        added to the user cache once :attr:`Message.mentions` is accessed. Defaults to ``False``.
+
+        .. versionadded:: 2.1
+    compact_message_cache: :class:`bool`
+        Whether to store cached messages as compact records, holding their IDs, content and flags
+        alongside their compressed payload. This lets the message cache hold many more messages in
+        the same memory. Messages are rebuilt when looked up, e.g. when they are edited or reacted to,
+        and are kept whole from then on. Implies ``lazy_messages``. Defaults to ``False``.
+
+        .. versionadded:: 2.1
     proxy: Optional[:class:`str`]
         Proxy URL.
     proxy_auth: Optional[:class:`aiohttp.BasicAuth`]
@@ -274,6 +294,42 @@ class Client:
         set to is ``30.0`` seconds.
 
         .. versionadded:: 2.0
+    global_ratelimit: Optional[:class:`int`]
+        The maximum number of API requests to send per second across all routes.
+        Requests over this rate are delayed client-side before being sent, which avoids
+        hitting the global rate limit (and the Cloudflare bans that follow repeated ones).
+        Defaults to ``50``. Passing ``None`` disables the pre-emptive limit.
+
+        .. versionadded:: 2.1
+    asset_cache: Optional[:class:`.AssetCache`]
+        A cache to store downloaded CDN assets in, which :meth:`Asset.read` and :meth:`Asset.save`
+        (and the same methods on emojis and stickers) check before downloading. By default, assets
+        are not cached.
+
+        .. versionadded:: 2.1
+    properties_cache: Optional[:class:`str`]
+        The path of a file to cache the client properties (browser version, user agent and build number)
+        sent to Discord in. When the cache is present, startup uses it instead of waiting on the network,
+        and stale values are refreshed in the background. Defaults to a file in the user's cache directory.
+        Passing ``None`` disables the cache, so the properties are fetched on every startup.
+
+        .. versionadded:: 2.1
+    properties_cache_ttl: :class:`float`
+        The number of seconds cached client properties are considered fresh for. Defaults to one day.
+
+        .. versionadded:: 2.1
+    connections_per_host: :class:`int`
+        The maximum number of simultaneous connections to a single host. Defaults to ``0`` (unlimited).
+        This has no effect if a ``connector`` is passed.
+
+        .. versionadded:: 2.1
+    prewarm_connections: :class:`int`
+        The number of connections to open ahead of time to each of Discord's API, CDN and upload hosts
+        during startup, so the first requests don't pay for DNS, TCP and TLS setup. Defaults to ``1``.
+        Passing ``0`` disables pre-warming. Connection pool utilization can be inspected
+        with ``client.http.pool_stats()``.
+
+        .. versionadded:: 2.1
 
     Attributes
     -----------
@@ -292,6 +348,12 @@ class Client:
         unsync_clock: bool = options.pop('assume_unsync_clock', True)
         http_trace: Optional[aiohttp.TraceConfig] = options.pop('http_trace', None)
         max_ratelimit_timeout: Optional[float] = options.pop('max_ratelimit_timeout', None)
+        global_ratelimit: Optional[int] = options.pop('global_ratelimit', 50)
+        asset_cache: Optional[AssetCache] = options.pop('asset_cache', None)
+        properties_cache: Optional[str] = options.pop('properties_cache', MISSING)
+        properties_cache_ttl: float = options.pop('properties_cache_ttl', 86400.0)
+        connections_per_host: int = options.pop('connections_per_host', 0)
+        prewarm_connections: int = options.pop('prewarm_connections', 1)
         self.captcha_handler: Optional[Callable[[CaptchaRequired, Client], Awaitable[str]]] = options.pop(
             'captcha_handler', None
         )
@@ -304,6 +366,12 @@ class Client:
             http_trace=http_trace,
             captcha=self.handle_captcha,
             max_ratelimit_timeout=max_ratelimit_timeout,
+            global_ratelimit=global_ratelimit,
+            asset_cache=asset_cache,
+            properties_cache=properties_cache,
+            properties_cache_ttl=properties_cache_ttl,
+            connections_per_host=connections_per_host,
+            prewarm_connections=prewarm_connections,
             locale=lambda: self._connection.locale,
         )
 
@@ -433,6 +501,11 @@ class Client:
         """Sequence[:class:`.Message`]: Read-only list of messages the connected client has cached.
 
         .. versionadded:: 1.1
+
+        .. note::
+
+            With ``compact_message_cache`` enabled, this builds copies of the messages
+            that are stored compactly, so changes to them are not reflected in the cache.
         """
         return utils.SequenceProxy(self._connection._messages or [])
 
@@ -2373,6 +2446,64 @@ class Client:
         data = await self.http.get_widget(guild_id)
         return Widget(state=self._connection, data=data)
 
+    async def fan_out(
+        self,
+        requests: Iterable[Union[Route, Tuple[Route, Callable[[], Awaitable[Any]]], Callable[[], Awaitable[Any]]]],
+        *,
+        limit: int = 10,
+        return_exceptions: bool = False,
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """Returns an :term:`asynchronous iterator` that runs many API requests concurrently.
+
+        Requests are grouped by the rate limit bucket they resolve to. Requests in the same
+        bucket are started in order at the rate the bucket allows, while independent buckets
+        are worked through in parallel. This avoids both piling every request onto a single
+        bucket (as a naive :func:`asyncio.gather` would) and leaving buckets idle.
+
+        .. versionadded:: 2.1
+
+        Examples
+        ---------
+
+        Fetching many messages by ID: ::
+
+            from discord.http import Route
+
+            requests = [
+                (Route('GET', '/channels/{channel_id}/messages/{message_id}', channel_id=channel.id, message_id=id),
+                 functools.partial(channel.fetch_message, id))
+                for id in message_ids
+            ]
+            async for index, message in client.fan_out(requests, limit=20):
+                print(message_ids[index], message.content)
+
+        Parameters
+        -----------
+        requests: Iterable[Union[:class:`~discord.http.Route`, Tuple[:class:`~discord.http.Route`, Callable[[], Awaitable[Any]]], Callable[[], Awaitable[Any]]]]
+            The requests to run. Each item is either a route to send without a body,
+            a tuple of the route and a coroutine factory that performs the request,
+            or a bare coroutine factory which is not grouped with any other request.
+        limit: :class:`int`
+            The maximum number of requests in flight at once. Defaults to ``10``.
+        return_exceptions: :class:`bool`
+            Whether to yield exceptions raised by a request instead of raising them.
+            Defaults to ``False``, in which case the remaining requests are cancelled.
+
+        Raises
+        -------
+        ValueError
+            ``limit`` was not positive.
+        HTTPException
+            A request failed and ``return_exceptions`` is ``False``.
+
+        Yields
+        -------
+        Tuple[:class:`int`, Any]
+            The index of the request in ``requests`` and its result, in completion order.
+        """
+        async for item in self.http.fan_out(requests, limit=limit, return_exceptions=return_exceptions):
+            yield item
+
     async def fetch_user(self, user_id: int, /) -> User:
         """|coro|
 
@@ -3972,6 +4103,7 @@ class Client:
         before: Optional[SnowflakeTime] = None,
         after: Optional[SnowflakeTime] = None,
         oldest_first: Optional[bool] = None,
+        prefetch: int = 0,
     ) -> AsyncIterator[Payment]:
         """Returns an :term:`asynchronous iterator` that enables receiving your payments.
 
@@ -4011,6 +4143,11 @@ class Client:
         oldest_first: Optional[:class:`bool`]
             If set to ``True``, return payments in oldest->newest order. Defaults to ``True`` if
             ``after`` is specified, otherwise ``False``.
+        prefetch: :class:`int`
+            The number of pages of up to 100 payments to fetch ahead of the consumer.
+            At most 10 pages are buffered. Defaults to ``0``.
+
+            .. versionadded:: 2.1
 
         Raises
         ------
@@ -4071,24 +4208,32 @@ class Client:
             if after and after != OLDEST_OBJECT:
                 predicate = lambda m: int(m['id']) > after.id
 
-        while True:
-            retrieve = min(100 if limit is None else limit, 100)
-            if retrieve < 1:
-                return
+        async def _pages(state: Any, limit: Optional[int]) -> AsyncGenerator[List[PaymentPayload], None]:
+            while True:
+                retrieve = min(100 if limit is None else limit, 100)
+                if retrieve < 1:
+                    return
 
-            data, state, limit = await strategy(retrieve, state, limit)
+                data, state, limit = await strategy(retrieve, state, limit)
 
-            # Terminate loop on next iteration; there's no data left after this
-            if len(data) < 100:
-                limit = 0
+                # Terminate loop on next iteration; there's no data left after this
+                if len(data) < 100:
+                    limit = 0
+
+                if reverse:
+                    data = reversed(data)
+                if predicate:
+                    data = filter(predicate, data)
 
-            if reverse:
-                data = reversed(data)
-            if predicate:
-                data = filter(predicate, data)
+                yield list(data)
 
-            for payment in data:
-                yield Payment(data=payment, state=_state)
+        pages = utils._prefetch(_pages(state, limit), prefetch)
+        try:
+            async for page in pages:
+                for payment in page:
+                    yield Payment(data=payment, state=_state)
+        finally:
+            await pages.aclose()
 
     async def fetch_payment(self, payment_id: int) -> Payment:
         """|coro|
@@ -219,7 +219,7 @@ class MemberConverter(IDConverter[discord.Member]):
             lookup = argument
             predicate = lambda m: m.name == argument or m.global_name == argument or m.nick == argument
 
-        members = await guild.query_members(lookup, limit=100, cache=cache)
+        members = await guild.query_members(lookup, limit=100, presences=False, cache=cache)
         return discord.utils.find(predicate, members)
 
     async def query_member_by_id(self, bot, guild, user_id):
@@ -238,7 +238,7 @@ class MemberConverter(IDConverter[discord.Member]):
             return member
 
         # If we're not being rate limited then we can use the websocket to actually query
-        members = await guild.query_members(limit=1, user_ids=[user_id], cache=cache)
+        members = await guild.query_members(limit=1, user_ids=[user_id], presences=False, cache=cache)
         if not members:
             return None
         return members[0]
@@ -327,11 +327,22 @@ class UserConverter(IDConverter[discord.User]):
             discriminator, username = username, discriminator
 
         if discriminator == '0' or (len(discriminator) == 4 and discriminator.isdigit()):
+            lookup = username
             predicate = lambda u: u.name == username and u.discriminator == discriminator
         else:
+            lookup = argument
             predicate = lambda u: u.name == argument or u.global_name == argument
 
-        result = discord.utils.find(predicate, state._users.values())
+        # Users that share a guild can be found through its name index,
+        # so the whole user cache is only searched when that fails
+        for guild in state._guilds.values():
+            member = discord.utils.find(predicate, guild._members_named(lookup))
+            if member is not None:
+                result = member._user
+                break
+        else:
+            result = discord.utils.find(predicate, state._users.values())
+
         if result is None:
             raise UserNotFound(argument)
 
@@ -24,11 +24,12 @@ DEALINGS IN THE SOFTWARE.
 
 from __future__ import annotations
 
+import asyncio
 import io
 import os
 from base64 import b64encode
 from hashlib import md5
-from typing import TYPE_CHECKING, Any, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Optional, Tuple, Union
 
 import yarl
 
@@ -49,6 +50,9 @@ __all__ = (
     'CloudFile',
 )
 
+# Files are read and hashed in chunks of this size so large uploads are never held in memory at once
+_CHUNK_SIZE = 2**16
+
 
 def _strip_spoiler(filename: str) -> Tuple[str, bool]:
     stripped = filename
@@ -168,15 +172,43 @@ class File(_FileBase):
 
     @cached_slot_property('_cs_md5')
     def md5(self):
-        try:
-            return md5(self.fp.read())
-        finally:
-            self.reset()
+        return self._hash_md5()
 
     @property
     def b64_md5(self) -> str:
         return b64encode(self.md5.digest()).decode('ascii')
 
+    def _hash_md5(self):
+        hash = md5()
+        self.reset()
+        try:
+            for chunk in iter(lambda: self.fp.read(_CHUNK_SIZE), b''):
+                hash.update(chunk)
+            return hash
+        finally:
+            self.reset()
+
+    async def _iter_chunks(self, progress: Optional[Callable[[int], Any]] = None) -> AsyncIterator[bytes]:
+        # Each chunk is read off the event loop, and only once the previous one has been consumed
+        loop = asyncio.get_running_loop()
+        sent = 0
+        while True:
+            chunk = await loop.run_in_executor(None, self.fp.read, _CHUNK_SIZE)
+            if not chunk:
+                break
+
+            yield chunk
+            sent += len(chunk)
+            if progress is not None:
+                progress(sent)
+
+    async def _async_b64_md5(self) -> str:
+        # Hashing a large file is blocking I/O, so it is done in the default executor
+        if not hasattr(self, '_cs_md5'):
+            loop = asyncio.get_running_loop()
+            self._cs_md5 = await loop.run_in_executor(None, self._hash_md5)
+        return self.b64_md5
+
     @cached_slot_property('_cs_size')
     def size(self) -> int:
         self.fp.seek(0, os.SEEK_END)
@@ -259,8 +291,15 @@ class CloudFile(_FileBase):
         self._state = state
 
     @classmethod
-    async def from_file(cls, *, file: File, state: ConnectionState, data: CloudAttachmentPayload) -> Self:
-        await state.http.upload_to_cloud(data['upload_url'], file)
+    async def from_file(
+        cls,
+        *,
+        file: File,
+        state: ConnectionState,
+        data: CloudAttachmentPayload,
+        progress: Optional[Callable[[int], Any]] = None,
+    ) -> Self:
+        await state.http.upload_to_cloud(data['upload_url'], file, progress=progress)
         return cls(data['upload_url'], file._filename, data['upload_filename'], description=file.description, state=state)
 
     @property
@@ -25,6 +25,7 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import copy
+from bisect import bisect_left, insort
 from datetime import datetime
 from operator import attrgetter
 import unicodedata
@@ -35,6 +36,7 @@ from typing import (
     Collection,
     Coroutine,
     Dict,
+    Iterator,
     List,
     Mapping,
     NamedTuple,
@@ -44,6 +46,7 @@ from typing import (
     Optional,
     TYPE_CHECKING,
     Tuple,
+    Type,
     Union,
     overload,
 )
@@ -54,7 +57,7 @@ from .role import Role
 from .member import Member, VoiceState
 from .emoji import Emoji
 from .errors import ClientException, InvalidData
-from .permissions import PermissionOverwrite
+from .permissions import PermissionOverwrite, Permissions
 from .colour import Colour
 from .errors import ClientException
 from .channel import *
@@ -114,7 +117,6 @@ if TYPE_CHECKING:
         Thread as ThreadPayload,
     )
     from .types.voice import BaseVoiceState as VoiceStatePayload
-    from .permissions import Permissions
     from .channel import VoiceChannel, StageChannel, TextChannel, ForumChannel, CategoryChannel
     from .template import Template
     from .webhook import Webhook
@@ -134,7 +136,7 @@ if TYPE_CHECKING:
     )
     from .types.embed import EmbedType
     from .types.integration import IntegrationType
-    from .types.message import MessageSearchAuthorType, MessageSearchHasType
+    from .types.message import Message as MessagePayload, MessageSearchAuthorType, MessageSearchHasType
     from .types.snowflake import SnowflakeList
     from .types.widget import EditWidgetSettings
     from .types.audit_log import AuditLogEvent
@@ -169,6 +171,88 @@ class _GuildLimit(NamedTuple):
     filesize: int
 
 
+class _MemberNameIndex:
+    # The IDs of a guild's members by their case folded usernames, global names and nicknames.
+    # Names are sorted lazily for prefix searches, with names added since held back until then
+    __slots__ = ('_ids', '_names', '_sorted', '_pending')
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, Dict[int, None]] = {}
+        self._names: Dict[int, Tuple[str, ...]] = {}
+        self._sorted: Optional[List[str]] = None
+        self._pending: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, member: Member) -> None:
+        # Also used to reindex a member whose names may have changed
+        names = tuple({name.casefold() for name in (member.name, member.global_name, member.nick) if name})
+        previous = self._names.get(member.id)
+        if previous == names:
+            return
+
+        if previous is not None:
+            self.remove(member.id)
+
+        self._names[member.id] = names
+        for name in names:
+            try:
+                self._ids[name][member.id] = None
+            except KeyError:
+                self._ids[name] = {member.id: None}
+                if self._sorted is not None:
+                    self._pending.append(name)
+
+    def remove(self, member_id: int) -> None:
+        # Names left without members stay in the sorted list until it's rebuilt
+        for name in self._names.pop(member_id, ()):
+            ids = self._ids[name]
+            del ids[member_id]
+            if not ids:
+                del self._ids[name]
+
+    def get(self, name: str) -> List[int]:
+        try:
+            return list(self._ids[name.casefold()])
+        except KeyError:
+            return []
+
+    def startswith(self, prefix: str) -> Iterator[int]:
+        prefix = prefix.casefold()
+        names = self._sorted
+        pending = self._pending
+        if names is None or len(pending) > len(names) // 16:
+            names = self._sorted = sorted(self._ids)
+            pending.clear()
+        elif pending:
+            for name in pending:
+                insort(names, name)
+            pending.clear()
+
+        seen = set()
+        index = self._ids
+        for position in range(bisect_left(names, prefix), len(names)):
+            name = names[position]
+            if not name.startswith(prefix):
+                break
+
+            for id in index.get(name, ()):
+                if id not in seen:
+                    seen.add(id)
+                    yield id
+
+    def containing(self, query: str) -> Iterator[int]:
+        query = query.casefold()
+        seen = set()
+        for name, ids in self._ids.items():
+            if query in name:
+                for id in ids:
+                    if id not in seen:
+                        seen.add(id)
+                        yield id
+
+
 class UserGuild(Hashable):
     """Represents a partial joined guild.
 
@@ -485,6 +569,12 @@ class Guild(Hashable):
         'hub_type',
         '_joined_at',
         '_cs_joined',
+        '_permissions_cache',
+        '_permissions_snapshot',
+        '_role_order',
+        '_role_ranks',
+        '_member_names',
+        '_channel_views',
     )
 
     _PREMIUM_GUILD_LIMITS: ClassVar[Dict[Optional[int], _GuildLimit]] = {
@@ -509,19 +599,44 @@ class Guild(Hashable):
         self._member_count: Optional[int] = None
         self._presence_count: Optional[int] = None
         self._large: Optional[bool] = None
+        self._permissions_cache: Dict[
+            Tuple[int, int], Tuple[List[abc._Overwrites], Union[int, utils.SnowflakeList], int]
+        ] = {}
+        self._permissions_snapshot: Optional[Dict[int, int]] = None
+        self._role_order: Optional[List[Role]] = None
+        self._role_ranks: Dict[int, int] = {}
+        self._member_names: _MemberNameIndex = _MemberNameIndex()
+        self._channel_views: Dict[Any, List[Any]] = {}
         self._from_data(data)
 
     def _add_channel(self, channel: GuildChannel, /) -> None:
         self._channels[channel.id] = channel
+        self._invalidate_channels()
 
     def _remove_channel(self, channel: Snowflake, /) -> None:
         self._channels.pop(channel.id, None)
+        self._invalidate_channels()
+
+    def _invalidate_channels(self) -> None:
+        # Called whenever channels are added, removed or updated, which the sorted views depend on
+        self._channel_views.clear()
+
+    def _sorted_channels(self, cls: Type[GuildChannel], /) -> List[Any]:
+        # The channels of a type in UI order, kept until the channels change
+        try:
+            return self._channel_views[cls]
+        except KeyError:
+            r = [ch for ch in self._channels.values() if isinstance(ch, cls)]
+            r.sort(key=attrgetter('position', 'id'))
+            self._channel_views[cls] = r
+            return r
 
     def _voice_state_for(self, user_id: int, /) -> Optional[VoiceState]:
         return self._voice_states.get(user_id)
 
     def _add_member(self, member: Member, /) -> None:
         self._members[member.id] = member
+        self._member_names.add(member)
         if member._presence:
             self._state.store_presence(member.id, member._presence, self.id)
             member._presence = None
@@ -533,6 +648,7 @@ class Guild(Hashable):
 
     def _remove_member(self, member: Snowflake, /) -> None:
         self._members.pop(member.id, None)
+        self._member_names.remove(member.id)
         self._state.remove_presence(member.id, self.id)
 
     def _add_thread(self, thread: Thread, /) -> None:
@@ -599,16 +715,81 @@ class Guild(Hashable):
         for r in self._roles.values():
             r.position += not r.is_default()
 
+        # Every other role moved up together, so their order holds and the new role slots in
+        order = self._role_order
+        if order is not None:
+            if role.id in self._roles:
+                self._role_order = None
+            else:
+                rank = bisect_left(order, role)
+                order.insert(rank, role)
+                self._rerank_roles(rank, len(order))
+
         self._roles[role.id] = role
+        self._invalidate_permissions()
 
     def _remove_role(self, role_id: int, /) -> Role:
         role = self._roles.pop(role_id)
 
+        tied = False
         for r in self._roles.values():
+            tied = tied or r.position == role.position
             r.position -= r.position > role.position
 
+        # Roles shifting down can only change order by landing on a role that shared a position with this one
+        order = self._role_order
+        if order is not None:
+            if tied:
+                self._role_order = None
+            else:
+                rank = self._role_ranks.pop(role_id)
+                del order[rank]
+                self._rerank_roles(rank, len(order))
+
+        self._invalidate_permissions()
         return role
 
+    def _move_role(self, role: Role, /) -> None:
+        # Called after a role's position changed in place
+        order = self._role_order
+        if order is None:
+            return
+
+        rank = self._role_ranks[role.id]
+        del order[rank]
+        new_rank = bisect_left(order, role)
+        order.insert(new_rank, role)
+        self._rerank_roles(min(rank, new_rank), max(rank, new_rank) + 1)
+
+    def _rerank_roles(self, start: int, stop: int) -> None:
+        order = self._role_order
+        ranks = self._role_ranks
+        for rank in range(start, stop):
+            ranks[order[rank].id] = rank  # type: ignore # Only called when there is an order
+
+    def _role_hierarchy(self) -> Tuple[List[Role], Dict[int, int]]:
+        # The roles from lowest to highest, and the index of each role in that order by ID
+        order = self._role_order
+        if order is None:
+            order = self._role_order = sorted(self._roles.values())
+            self._role_ranks = {role.id: rank for rank, role in enumerate(order)}
+        return order, self._role_ranks
+
+    def _invalidate_permissions(self) -> None:
+        # Called whenever role permissions may have changed, which every
+        # resolved permission in the guild depends on. Entries are dropped outright
+        # rather than tagged with a generation, and the finer-grained overwrite and
+        # member role changes are caught by permissions_for's identity checks
+        self._permissions_cache.clear()
+        self._permissions_snapshot = None
+
+    def _role_permissions(self) -> Dict[int, int]:
+        # The permissions of every role by ID, kept until the roles change
+        snapshot = self._permissions_snapshot
+        if snapshot is None:
+            snapshot = self._permissions_snapshot = {role.id: role._permissions for role in self._roles.values()}
+        return snapshot
+
     @classmethod
     def _create_unavailable(cls, *, state: ConnectionState, guild_id: int) -> Guild:
         return cls(state=state, data={'id': guild_id, 'unavailable': True})  # type: ignore
@@ -636,6 +817,8 @@ class Guild(Hashable):
 
         state = self._state  # Speed up attribute access
 
+        self._invalidate_permissions()
+        self._role_order = None
         for r in guild.get('roles', []):
             role = Role(guild=self, data=r, state=state)
             self._roles[role.id] = role
@@ -757,9 +940,7 @@ class Guild(Hashable):
 
         This is sorted by the position and are in UI order from top to bottom.
         """
-        r = [ch for ch in self._channels.values() if isinstance(ch, VoiceChannel)]
-        r.sort(key=attrgetter('position', 'id'))
-        return r
+        return list(self._sorted_channels(VoiceChannel))
 
     @property
     def stage_channels(self) -> List[StageChannel]:
@@ -769,9 +950,7 @@ class Guild(Hashable):
 
         This is sorted by the position and are in UI order from top to bottom.
         """
-        r = [ch for ch in self._channels.values() if isinstance(ch, StageChannel)]
-        r.sort(key=attrgetter('position', 'id'))
-        return r
+        return list(self._sorted_channels(StageChannel))
 
     @property
     def me(self) -> Optional[Member]:
@@ -834,9 +1013,7 @@ class Guild(Hashable):
 
         This is sorted by the position and are in UI order from top to bottom.
         """
-        r = [ch for ch in self._channels.values() if isinstance(ch, TextChannel)]
-        r.sort(key=attrgetter('position', 'id'))
-        return r
+        return list(self._sorted_channels(TextChannel))
 
     @property
     def categories(self) -> List[CategoryChannel]:
@@ -844,9 +1021,7 @@ class Guild(Hashable):
 
         This is sorted by the position and are in UI order from top to bottom.
         """
-        r = [ch for ch in self._channels.values() if isinstance(ch, CategoryChannel)]
-        r.sort(key=attrgetter('position', 'id'))
-        return r
+        return list(self._sorted_channels(CategoryChannel))
 
     @property
     def forums(self) -> List[ForumChannel]:
@@ -856,9 +1031,7 @@ class Guild(Hashable):
 
         .. versionadded:: 2.0
         """
-        r = [ch for ch in self._channels.values() if isinstance(ch, ForumChannel)]
-        r.sort(key=attrgetter('position', 'id'))
-        return r
+        return list(self._sorted_channels(ForumChannel))
 
     @property
     def directory_channels(self) -> List[DirectoryChannel]:
@@ -868,9 +1041,7 @@ class Guild(Hashable):
 
         .. versionadded:: 2.1
         """
-        r = [ch for ch in self._channels.values() if isinstance(ch, DirectoryChannel)]
-        r.sort(key=attrgetter('position', 'id'))
-        return r
+        return list(self._sorted_channels(DirectoryChannel))
 
     @property
     def directories(self) -> List[DirectoryChannel]:
@@ -895,6 +1066,13 @@ class Guild(Hashable):
         List[Tuple[Optional[:class:`CategoryChannel`], List[:class:`abc.GuildChannel`]]]:
             The categories and their associated channels.
         """
+        try:
+            cached = self._channel_views['by_category']
+        except KeyError:
+            cached = self._channel_views['by_category'] = self._group_by_category()
+        return [(category, list(channels)) for category, channels in cached]
+
+    def _group_by_category(self) -> List[ByCategoryItem]:
         grouped: Dict[Optional[int], List[NonCategoryChannel]] = {}
         for channel in self._channels.values():
             if isinstance(channel, CategoryChannel):
@@ -917,6 +1095,63 @@ class Guild(Hashable):
             channels.sort(key=attrgetter('_sorting_bucket', 'position', 'id'))
         return as_list
 
+    def visible_channels_for(self, obj: Union[Member, Role], /) -> List[GuildChannel]:
+        """Returns the channels a member or role can see, i.e. has
+        :attr:`~Permissions.read_messages` in.
+
+        For members, this resolves the member's roles once for every channel
+        rather than for each, like :meth:`abc.GuildChannel.permissions_for_many`.
+
+        .. versionadded:: 2.1
+
+        Parameters
+        -----------
+        obj: Union[:class:`Member`, :class:`Role`]
+            The member or role to check.
+
+        Returns
+        --------
+        List[:class:`abc.GuildChannel`]
+            The visible channels, in the same order as :attr:`channels`.
+        """
+        channels = list(self._channels.values())
+        if isinstance(obj, Role):
+            return [channel for channel in channels if channel.permissions_for(obj).read_messages]
+
+        read = Permissions.read_messages.flag
+        everything = Permissions.all().value
+        role_permissions = self._role_permissions()
+        guild_value = role_permissions.get(self.id, 0)
+        for role_id in obj._roles:
+            guild_value |= role_permissions.get(role_id, 0)
+        if obj.id == self.owner_id or guild_value & Permissions.administrator.flag:
+            guild_value = everything
+        timed_out = obj.timed_out_until is not None and obj.is_timed_out()
+
+        ret = []
+        for channel in channels:
+            value = guild_value
+            if value != everything:
+                index = channel._overwrite_index
+                value = (value & ~index.everyone[1]) | index.everyone[0]
+                allow = deny = 0
+                for role_id in obj._roles:
+                    role_allow, role_deny = index.roles.get(role_id, (0, 0))
+                    allow |= role_allow
+                    deny |= role_deny
+                value = (value & ~deny) | allow
+
+                role_allow, role_deny = index.members.get(obj.id, (0, 0))
+                value = (value & ~role_deny) | role_allow
+                if timed_out:
+                    value &= Permissions._timeout_mask()
+
+            base = Permissions(value)
+            channel._apply_channel_permissions(base)
+            if base.value & read:
+                ret.append(channel)
+        return ret
+
     def _resolve_channel(self, id: Optional[int], /) -> Optional[Union[GuildChannel, Thread]]:
         if id is None:
             return
@@ -1149,7 +1384,7 @@ class Guild(Hashable):
         The first element of this sequence will be the lowest role in the
         hierarchy.
         """
-        return utils.SequenceProxy(self._roles.values(), sorted=True)
+        return utils.SequenceProxy(self._role_hierarchy()[0])
 
     def get_role(self, role_id: int, /) -> Optional[Role]:
         """Returns a role with the given ID.
@@ -1374,8 +1609,6 @@ class Guild(Hashable):
             then ``None`` is returned.
         """
 
-        members = self.members
-
         username, _, discriminator = name.rpartition('#')
 
         # If # isn't found then "discriminator" actually has the username
@@ -1383,12 +1616,61 @@ class Guild(Hashable):
             discriminator, username = username, discriminator
 
         if discriminator == '0' or (len(discriminator) == 4 and discriminator.isdigit()):
+            members = self._members_named(username)
             return utils.find(lambda m: m.name == username and m.discriminator == discriminator, members)
 
         def pred(m: Member) -> bool:
             return m.nick == name or m.global_name == name or m.name == name
 
-        return utils.find(pred, members)
+        return utils.find(pred, self._members_named(name))
+
+    def search_members(self, query: str, /, *, limit: Optional[int] = 100, substring: bool = True) -> List[Member]:
+        """Searches the cached members whose username, global name or nickname
+        matches the query, case insensitively.
+
+        Unlike :meth:`query_members`, this does not make any requests and
+        only returns members in the internal :attr:`members` cache.
+
+        .. versionadded:: 2.1
+
+        Parameters
+        -----------
+        query: :class:`str`
+            The string to search for.
+        limit: Optional[:class:`int`]
+            The maximum number of members to return. If ``None``, every match is returned.
+        substring: :class:`bool`
+            Whether to also return members with a name that contains the query
+            rather than starting with it. Defaults to ``True``.
+
+        Returns
+        --------
+        List[:class:`Member`]
+            The matching members. Members with a name equal to the query come first,
+            followed by those with a name starting with it, then those containing it.
+        """
+        index = self._member_names
+        searches = [index.get(query), index.startswith(query)]
+        if substring:
+            searches.append(index.containing(query))
+
+        ids: Dict[int, None] = {}
+        for search in searches:
+            for id in search:
+                if limit is not None and len(ids) >= limit:
+                    break
+                ids[id] = None
+            else:
+                continue
+            break
+
+        members = self._members
+        return [members[id] for id in ids]
+
+    def _members_named(self, name: str, /) -> List[Member]:
+        # The members with a username, global name or nickname matching the name case insensitively
+        members = self._members
+        return [members[id] for id in self._member_names.get(name)]
 
     @overload
     def _create_channel(
@@ -2850,6 +3132,66 @@ class Guild(Hashable):
             for e in data:
                 yield BanEntry(user=User(state=_state, data=e['user']), reason=e['reason'])
 
+    @overload
+    def search(
+        self,
+        content: str = ...,
+        *,
+        limit: Optional[int] = ...,
+        offset: int = ...,
+        before: SnowflakeTime = ...,
+        after: SnowflakeTime = ...,
+        include_nsfw: bool = ...,
+        channels: Collection[Snowflake] = ...,
+        authors: Collection[Snowflake] = ...,
+        author_types: Collection[MessageSearchAuthorType] = ...,
+        mentions: Collection[Snowflake] = ...,
+        mention_everyone: bool = ...,
+        pinned: bool = ...,
+        has: Collection[MessageSearchHasType] = ...,
+        embed_types: Collection[EmbedType] = ...,
+        embed_providers: Collection[str] = ...,
+        link_hostnames: Collection[str] = ...,
+        attachment_filenames: Collection[str] = ...,
+        attachment_extensions: Collection[str] = ...,
+        application_commands: Collection[Snowflake] = ...,
+        oldest_first: bool = ...,
+        most_relevant: bool = ...,
+        prefetch: int = ...,
+        raw: Literal[False] = ...,
+    ) -> AsyncIterator[Message]:
+        ...
+
+    @overload
+    def search(
+        self,
+        content: str = ...,
+        *,
+        limit: Optional[int] = ...,
+        offset: int = ...,
+        before: SnowflakeTime = ...,
+        after: SnowflakeTime = ...,
+        include_nsfw: bool = ...,
+        channels: Collection[Snowflake] = ...,
+        authors: Collection[Snowflake] = ...,
+        author_types: Collection[MessageSearchAuthorType] = ...,
+        mentions: Collection[Snowflake] = ...,
+        mention_everyone: bool = ...,
+        pinned: bool = ...,
+        has: Collection[MessageSearchHasType] = ...,
+        embed_types: Collection[EmbedType] = ...,
+        embed_providers: Collection[str] = ...,
+        link_hostnames: Collection[str] = ...,
+        attachment_filenames: Collection[str] = ...,
+        attachment_extensions: Collection[str] = ...,
+        application_commands: Collection[Snowflake] = ...,
+        oldest_first: bool = ...,
+        most_relevant: bool = ...,
+        prefetch: int = ...,
+        raw: Literal[True],
+    ) -> AsyncIterator[MessagePayload]:
+        ...
+
     def search(
         self,
         content: str = MISSING,
@@ -2874,7 +3216,9 @@ class Guild(Hashable):
         application_commands: Collection[Snowflake] = MISSING,
         oldest_first: bool = False,
         most_relevant: bool = False,
-    ) -> AsyncIterator[Message]:
+        prefetch: int = 1,
+        raw: bool = False,
+    ) -> AsyncIterator[Union[Message, MessagePayload]]:
         """Returns an :term:`asynchronous iterator` that enables searching the guild's messages.
 
         You must have :attr:`~Permissions.read_message_history` to do this.
@@ -2960,6 +3304,12 @@ class Guild(Hashable):
         most_relevant: :class:`bool`
             Whether to sort the results by relevance. Using this with ``oldest_first``
             will return the least relevant results first.
+        prefetch: :class:`int`
+            The number of pages of up to 25 results to fetch ahead of the consumer.
+            Results repeated across pages are skipped. Defaults to ``1``.
+        raw: :class:`bool`
+            Whether to yield the raw message payloads instead of :class:`Message` objects.
+            This skips model construction, which is considerably faster when only the data is needed.
 
         Raises
         ------
@@ -2970,8 +3320,8 @@ class Guild(Hashable):
 
         Yields
         -------
-        :class:`Message`
-            The message with the message data parsed.
+        Union[:class:`Message`, :class:`dict`]
+            The message with the message data parsed, or the raw message payload.
         """
         return abc._handle_message_search(
             self,
@@ -2996,6 +3346,8 @@ class Guild(Hashable):
             application_commands=application_commands,
             oldest_first=oldest_first,
             most_relevant=most_relevant,
+            prefetch=prefetch,
+            raw=raw,
         )
 
     async def prune_members(
@@ -4164,6 +4516,7 @@ class Guild(Hashable):
             roles.append(role)
             self._roles[role.id] = role
 
+        self._role_order = None
         return roles
 
     async def role_member_counts(self) -> Dict[Role, int]:
@@ -4975,6 +5328,11 @@ class Guild(Hashable):
         Request members of this guild whose username or nickname starts with the given query.
         This is a websocket operation.
 
+        When ``presences`` is ``False``, members that are already cached are found locally
+        first, see :meth:`search_members`. The gateway is then only queried when the cache
+        may be missing matches, and its answers are reused for a short while if ``cache``
+        is ``True``.
+
         .. note::
             This is preferrable to using :meth:`fetch_member` as the client uses
             it quite often, and you can also request presence.
@@ -4984,6 +5342,9 @@ class Guild(Hashable):
         .. versionchanged:: 2.0
             The function now raises a :exc:`TypeError` instead of ValueError.
 
+        .. versionchanged:: 2.1
+            Cached members are searched before querying the gateway when presences aren't requested.
+
         Parameters
         -----------
         query: Optional[:class:`str`]
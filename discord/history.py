@@ -0,0 +1,367 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import gzip
+import json
+import logging
+import os
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Iterable, List, Optional, Sequence, Union
+
+from .errors import Forbidden, NotFound
+from .object import Object
+from . import utils
+
+if TYPE_CHECKING:
+    from .abc import Messageable
+    from .http import HTTPClient
+    from .types.message import Attachment as AttachmentPayload
+
+# fmt: off
+__all__ = (
+    'HistoryCheckpoint',
+    'HistoryArchiver',
+)
+# fmt: on
+
+_log = logging.getLogger(__name__)
+
+
+class HistoryCheckpoint:
+    """Tracks the progress of :meth:`abc.Messageable.history_partitioned`
+    so that an interrupted scan can be resumed.
+
+    Pass a fresh checkpoint to start a scan; it is filled in with the partitions
+    of the scanned range and updated as messages are consumed. A message is only
+    marked as done once the iterator has advanced past it. Passing the same
+    (or a restored) checkpoint again resumes the scan where it left off.
+
+    .. container:: operations
+
+        .. describe:: bool(x)
+
+            Returns whether the checkpoint has been filled in.
+
+    .. versionadded:: 2.1
+
+    Attributes
+    -----------
+    segments: List[List[:class:`int`]]
+        The ``[cursor, end]`` pairs of each partition. The messages still to be scanned
+        in a partition are those with an ID greater than ``cursor`` and less than ``end``.
+    """
+
+    __slots__ = ('segments',)
+
+    def __init__(self, segments: Optional[Iterable[Sequence[int]]] = None) -> None:
+        self.segments: List[List[int]] = [[int(cursor), int(end)] for cursor, end in segments or ()]
+
+    def __repr__(self) -> str:
+        return f'<HistoryCheckpoint segments={len(self.segments)} done={self.done}>'
+
+    def __bool__(self) -> bool:
+        return bool(self.segments)
+
+    @property
+    def done(self) -> bool:
+        """:class:`bool`: Whether every partition has been fully scanned."""
+        return bool(self.segments) and all(cursor >= end - 1 for cursor, end in self.segments)
+
+    @classmethod
+    def _split(cls, after: int, before: int, partitions: int) -> HistoryCheckpoint:
+        # Snowflakes are timestamp-ordered, so equal ID ranges are equal time ranges
+        step = max((before - after) // partitions, 1)
+        bounds = [after + step * i for i in range(partitions) if after + step * i < before] + [before]
+        return cls((bounds[i], bounds[i + 1] + 1 if i + 2 < len(bounds) else bounds[i + 1]) for i in range(len(bounds) - 1))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a JSON-serializable representation of the checkpoint.
+
+        Returns
+        --------
+        Dict[:class:`str`, Any]
+            The checkpoint data.
+        """
+        return {'segments': [[str(cursor), str(end)] for cursor, end in self.segments]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> HistoryCheckpoint:
+        """Restores a checkpoint from :meth:`to_dict` output.
+
+        Parameters
+        -----------
+        data: Dict[:class:`str`, Any]
+            The checkpoint data.
+
+        Returns
+        --------
+        :class:`HistoryCheckpoint`
+            The restored checkpoint.
+        """
+        return cls(data.get('segments', ()))
+
+
+class HistoryArchiver:
+    """Streams the message history of channels and their threads into NDJSON files.
+
+    Each channel is written to ``<channel_id>.ndjson.gz`` (or ``<channel_id>.ndjson``
+    when not compressing) in the output directory, one raw message payload per line,
+    oldest first. Messages are written in batches, each of which is a complete gzip member,
+    and after every batch the last archived message is recorded in a checkpoint next to
+    the archive, e.g. ``<channel_id>.ndjson.gz.checkpoint.json``. Running the archiver again
+    only appends newer messages, and an interrupted run resumes from the last checkpoint
+    without duplicating or losing messages. If the archive is missing or shorter than its
+    checkpoint, it is written again from the start.
+
+    Channels are archived concurrently, sharing the client's rate limits,
+    and at most ``batch_size`` messages per channel are held in memory.
+
+    .. versionadded:: 2.1
+
+    Parameters
+    -----------
+    directory: Union[:class:`str`, :class:`os.PathLike`]
+        The directory to write the archives to. It is created if it does not exist.
+    concurrency: :class:`int`
+        The number of channels to archive at once.
+    batch_size: :class:`int`
+        The number of messages to write between checkpoints.
+    compress: :class:`bool`
+        Whether to gzip the archives.
+    threads: :class:`bool`
+        Whether to also archive the threads of the given channels. This includes cached
+        active threads and public archived threads.
+    attachments: :class:`bool`
+        Whether to download message attachments into the ``attachments`` subdirectory.
+        Attachments that were already downloaded are skipped.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, os.PathLike[str]],
+        *,
+        concurrency: int = 4,
+        batch_size: int = 1000,
+        compress: bool = True,
+        threads: bool = True,
+        attachments: bool = False,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        if batch_size < 1:
+            raise ValueError('batch_size must be at least 1')
+
+        self.directory: str = os.fspath(directory)
+        self.concurrency: int = concurrency
+        self.batch_size: int = batch_size
+        self.compress: bool = compress
+        self.threads: bool = threads
+        self.attachments: bool = attachments
+        self._downloads: asyncio.Semaphore = utils.MISSING
+
+    def __repr__(self) -> str:
+        return f'<HistoryArchiver directory={self.directory!r} concurrency={self.concurrency}>'
+
+    def archive_path(self, channel_id: int, /) -> str:
+        """Returns the path of a channel's archive.
+
+        Parameters
+        -----------
+        channel_id: :class:`int`
+            The channel ID.
+
+        Returns
+        --------
+        :class:`str`
+            The path of the archive file.
+        """
+        return os.path.join(self.directory, f'{channel_id}.ndjson{".gz" if self.compress else ""}')
+
+    def _checkpoint_path(self, channel_id: int) -> str:
+        # Named after the archive, so that compressed and plain archives don't share one
+        return f'{self.archive_path(channel_id)}.checkpoint.json'
+
+    async def archive(self, *channels: Messageable) -> Dict[int, int]:
+        r"""|coro|
+
+        Archives the given channels, and their threads if enabled.
+
+        Channels that cannot be read are skipped with a warning.
+
+        Parameters
+        -----------
+        \*channels: :class:`abc.Messageable`
+            The channels to archive.
+
+        Raises
+        -------
+        HTTPException
+            Retrieving the message history failed.
+        OSError
+            Writing the archive failed.
+
+        Returns
+        --------
+        Dict[:class:`int`, :class:`int`]
+            A mapping of channel ID to the number of messages archived by this run.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        if self.attachments:
+            os.makedirs(os.path.join(self.directory, 'attachments'), exist_ok=True)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        self._downloads = asyncio.Semaphore(self.concurrency * 2)
+        results: Dict[int, int] = {}
+
+        async def run(channel: Messageable) -> None:
+            threads = []
+            async with semaphore:
+                try:
+                    results[channel.id] = await self._archive_channel(channel)  # type: ignore # All channels have IDs
+                    if self.threads:
+                        threads = await self._fetch_threads(channel)
+                except (Forbidden, NotFound) as exc:
+                    _log.warning('Skipping channel ID %s: %s', channel.id, exc)  # type: ignore
+                    return
+
+            # Threads are queued only once the semaphore has been released
+            await asyncio.gather(*(run(thread) for thread in threads))
+
+        await asyncio.gather(*(run(channel) for channel in channels))
+        return results
+
+    async def _fetch_threads(self, channel: Messageable) -> List[Messageable]:
+        threads = {thread.id: thread for thread in getattr(channel, 'threads', ())}
+        if hasattr(channel, 'archived_threads'):
+            try:
+                async for thread in channel.archived_threads(limit=None):  # type: ignore # Checked above
+                    threads.setdefault(thread.id, thread)
+            except Forbidden:
+                _log.warning('Cannot list archived threads of channel ID %s.', channel.id)  # type: ignore
+        return list(threads.values())
+
+    async def _archive_channel(self, channel: Messageable) -> int:
+        loop = asyncio.get_running_loop()
+        channel_id: int = channel.id  # type: ignore # All channels have IDs
+        path = self.archive_path(channel_id)
+        checkpoint_path = self._checkpoint_path(channel_id)
+        checkpoint = await loop.run_in_executor(None, self._read_checkpoint, checkpoint_path, path)
+
+        after = Object(id=int(checkpoint['last_id'])) if checkpoint else None
+        total = checkpoint['count'] if checkpoint else 0
+        offset = checkpoint['offset'] if checkpoint else 0
+        fp = await loop.run_in_executor(None, self._open, path, offset)
+
+        http = channel._state.http
+        batch: List[Dict[str, Any]] = []
+        count = 0
+        try:
+            async for data in channel.history(limit=None, after=after, oldest_first=True, raw=True, prefetch=2):
+                batch.append(data)  # type: ignore
+                if len(batch) >= self.batch_size:
+                    total += await self._flush(http, fp, checkpoint_path, batch, total)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                total += await self._flush(http, fp, checkpoint_path, batch, total)
+                count += len(batch)
+        finally:
+            fp.close()
+
+        _log.debug('Archived %s new messages from channel ID %s.', count, channel_id)
+        return count
+
+    async def _flush(
+        self, http: HTTPClient, fp: BinaryIO, checkpoint_path: str, batch: List[Dict[str, Any]], total: int
+    ) -> int:
+        if self.attachments:
+            await asyncio.gather(*(self._download(http, a) for message in batch for a in message.get('attachments', ())))
+
+        lines = ''.join(utils._to_json(message) + '\n' for message in batch).encode('utf-8')
+        checkpoint = {'last_id': batch[-1]['id'], 'count': total + len(batch)}
+        await asyncio.get_running_loop().run_in_executor(None, self._write, fp, lines, checkpoint_path, checkpoint)
+        return len(batch)
+
+    def _write(self, fp: BinaryIO, lines: bytes, checkpoint_path: str, checkpoint: Dict[str, Any]) -> None:
+        # Every batch is its own gzip member, so that truncating to a checkpoint
+        # leaves a valid file; readers decompress concatenated members transparently
+        fp.write(gzip.compress(lines) if self.compress else lines)
+        fp.flush()
+        os.fsync(fp.fileno())
+
+        checkpoint['offset'] = fp.tell()
+        tmp = f'{checkpoint_path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp, checkpoint_path)
+
+    @staticmethod
+    def _read_checkpoint(path: str, archive_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'r', encoding='utf-8') as fp:
+                data = json.load(fp)
+            checkpoint = {'last_id': int(data['last_id']), 'offset': int(data['offset']), 'count': int(data['count'])}
+            # The checkpoint is only good for the archive it was written with
+            if os.path.getsize(archive_path) < checkpoint['offset']:
+                return None
+            return checkpoint
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def _open(path: str, offset: int) -> BinaryIO:
+        # Anything past the checkpoint is from an interrupted batch
+        fp = open(path, 'r+b' if os.path.exists(path) else 'wb')
+        fp.seek(offset)
+        fp.truncate()
+        return fp  # type: ignore
+
+    async def _download(self, http: HTTPClient, attachment: AttachmentPayload) -> None:
+        _, ext = os.path.splitext(attachment.get('filename', ''))
+        path = os.path.join(self.directory, 'attachments', f'{attachment["id"]}{ext}')
+        if os.path.exists(path):
+            return
+
+        loop = asyncio.get_running_loop()
+        tmp = f'{path}.tmp'
+        try:
+            async with self._downloads:
+                with open(tmp, 'wb') as fp:
+                    # Attachment URLs are signed and expire, so caching them would never hit
+                    async for chunk in http.stream_from_cdn(attachment['url'], cache=False):
+                        await loop.run_in_executor(None, fp.write, chunk)
+        except (Forbidden, NotFound) as exc:
+            _log.warning('Could not download attachment ID %s: %s', attachment['id'], exc)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp)
+            return
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp)
+            raise
+        os.replace(tmp, path)
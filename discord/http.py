@@ -25,15 +25,22 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import asyncio
+from bisect import bisect_left
+from functools import partial
 import logging
 from random import choice, choices
 import ssl
 import string
+import time
 from typing import (
     Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
     Callable,
     ClassVar,
     Coroutine,
+    Deque,
     Dict,
     Iterable,
     List,
@@ -43,7 +50,9 @@ from typing import (
     Optional,
     overload,
     Sequence,
+    Set,
     TYPE_CHECKING,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -74,6 +83,7 @@ from .utils import MISSING
 if TYPE_CHECKING:
     from typing_extensions import Self
 
+    from .asset import AssetCache
     from .channel import TextChannel, DMChannel, GroupChannel, PartialMessageable, VoiceChannel, ForumChannel
     from .threads import Thread
     from .mentions import AllowedMentions
@@ -129,6 +139,12 @@ if TYPE_CHECKING:
     MessageableChannel = Union[TextChannel, Thread, DMChannel, GroupChannel, PartialMessageable, VoiceChannel, ForumChannel]
 
 INTERNAL_API_VERSION = 9
+# Hosts the client talks to right after startup, which are worth connecting to ahead of time
+PREWARM_URLS = (
+    'https://discord.com/',
+    'https://cdn.discordapp.com/',
+    'https://discord-attachments-uploads-prd.storage.googleapis.com/',
+)
 CIPHERS = (
     'TLS_GREASE_5A',
     'TLS_AES_128_GCM_SHA256',
@@ -551,6 +567,195 @@ class Ratelimit:
                 self._wake(tokens, exception=exception)
 
 
+class GlobalRatelimit:
+    """Represents a client-side token bucket for the global rate limit.
+
+    Unlike :class:`Ratelimit`, this does not learn its limits from response headers.
+    Tokens refill continuously at ``rate`` per ``per`` seconds up to a burst of ``rate``,
+    and requests wait in FIFO order until a token is available. This keeps the client
+    under the global limit rather than reacting to a global 429 after the fact.
+    """
+
+    __slots__ = (
+        'rate',
+        'per',
+        '_tokens',
+        '_last',
+        '_loop',
+        '_lock',
+    )
+
+    def __init__(self, rate: int, per: float = 1.0) -> None:
+        if rate <= 0 or per <= 0:
+            raise ValueError('rate and per must be greater than 0')
+
+        self.rate: int = rate
+        self.per: float = per
+        self._tokens: float = float(rate)
+        self._loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        self._last: float = self._loop.time()
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    def __repr__(self) -> str:
+        return f'<GlobalRatelimit rate={self.rate} per={self.per} tokens={self.tokens:.2f}>'
+
+    def _refill(self) -> None:
+        now = self._loop.time()
+        self._tokens = min(float(self.rate), self._tokens + (now - self._last) * self.rate / self.per)
+        self._last = now
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def drain(self) -> None:
+        # Used when Discord reports a global rate limit anyway
+        self._refill()
+        self._tokens = 0.0
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) * self.per / self.rate)
+                self._refill()
+
+            self._tokens -= 1
+
+
+def _payload_size(data: Any, files: Optional[Sequence[File]]) -> int:
+    if isinstance(data, str):
+        return len(data) if data.isascii() else len(data.encode('utf-8'))
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    if files:
+        return sum(f.size - f._original_pos for f in files)
+    return 0
+
+
+class RequestRecord:
+    """Holds the telemetry collected for a single call to :meth:`HTTPClient.request`.
+
+    This is what is passed to the ``stats_hook`` of :class:`HTTPClient` once the request finishes.
+    ``latency`` is the time spent in flight across all attempts, while ``ratelimit_wait``
+    is the time spent waiting for the route's :class:`Ratelimit` before the first attempt.
+    """
+
+    __slots__ = (
+        'method',
+        'route_key',
+        'bucket',
+        'status',
+        'failed',
+        'attempts',
+        'latency',
+        'ratelimit_wait',
+        'ratelimited',
+        'sub_ratelimited',
+        'global_ratelimited',
+        'server_errors',
+        'connection_resets',
+        'captcha_retries',
+        'bytes_out',
+        'bytes_in',
+    )
+
+    def __init__(self, method: str, route_key: str) -> None:
+        self.method: str = method
+        self.route_key: str = route_key
+        self.bucket: Optional[str] = None
+        self.status: Optional[int] = None
+        self.failed: bool = False
+        self.attempts: int = 0
+        self.latency: float = 0.0
+        self.ratelimit_wait: float = 0.0
+        self.ratelimited: int = 0
+        self.sub_ratelimited: int = 0
+        self.global_ratelimited: int = 0
+        self.server_errors: int = 0
+        self.connection_resets: int = 0
+        self.captcha_retries: int = 0
+        self.bytes_out: int = 0
+        self.bytes_in: int = 0
+
+    def __repr__(self) -> str:
+        return (
+            f'<RequestRecord route_key={self.route_key!r} bucket={self.bucket!r} status={self.status} '
+            f'attempts={self.attempts} latency={self.latency:.3f}>'
+        )
+
+
+class _Histogram:
+    # Upper bounds in seconds, the last bucket catches everything above
+    BOUNDS: ClassVar[Tuple[float, ...]] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    __slots__ = ('counts', 'count', 'sum', 'max')
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(self.BOUNDS) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+        self.max: float = 0.0
+
+    def add(self, value: float) -> None:
+        self.counts[bisect_left(self.BOUNDS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        buckets = {str(bound): count for bound, count in zip(self.BOUNDS, self.counts)}
+        buckets['inf'] = self.counts[-1]
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else 0.0,
+            'max': self.max,
+            'buckets': buckets,
+        }
+
+
+class _RequestStats:
+    COUNTERS: ClassVar[Tuple[str, ...]] = (
+        'attempts',
+        'ratelimited',
+        'sub_ratelimited',
+        'global_ratelimited',
+        'server_errors',
+        'connection_resets',
+        'captcha_retries',
+        'bytes_out',
+        'bytes_in',
+    )
+
+    __slots__ = COUNTERS + ('requests', 'failed', 'latency', 'ratelimit_wait')
+
+    def __init__(self) -> None:
+        for name in self.__slots__:
+            setattr(self, name, 0)
+        self.latency: _Histogram = _Histogram()
+        self.ratelimit_wait: _Histogram = _Histogram()
+
+    def add(self, record: RequestRecord) -> None:
+        self.requests += 1
+        if record.failed:
+            self.failed += 1
+        for name in self.COUNTERS:
+            setattr(self, name, getattr(self, name) + getattr(record, name))
+        self.latency.add(record.latency)
+        self.ratelimit_wait.add(record.ratelimit_wait)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {'requests': self.requests, 'failed': self.failed}
+        for name in self.COUNTERS:
+            data[name] = getattr(self, name)
+        data['latency'] = self.latency.to_dict()
+        data['ratelimit_wait'] = self.ratelimit_wait.to_dict()
+        return data
+
+
 # For some reason, the Discord voice websocket expects this header to be
 # completely lowercase while aiohttp respects spec and does it as case-insensitive
 aiohttp.hdrs.WEBSOCKET = 'websocket'  # type: ignore
@@ -581,6 +786,13 @@ class HTTPClient:
         http_trace: Optional[aiohttp.TraceConfig] = None,
         captcha: Optional[Callable[[CaptchaRequired], Coroutine[Any, Any, str]]] = None,
         max_ratelimit_timeout: Optional[float] = None,
+        global_ratelimit: Optional[int] = 50,
+        asset_cache: Optional[AssetCache] = None,
+        stats_hook: Optional[Callable[[RequestRecord], Any]] = None,
+        properties_cache: Optional[str] = MISSING,
+        properties_cache_ttl: float = 86400.0,
+        connections_per_host: int = 0,
+        prewarm_connections: int = 1,
         locale: Callable[[], str] = lambda: 'en-US',
     ) -> None:
         self.connector: aiohttp.BaseConnector = connector or MISSING
@@ -595,6 +807,16 @@ class HTTPClient:
         # When this reaches 256 elements, it will try to evict based off of expiry
         self._buckets: Dict[str, Ratelimit] = {}
         self._global_over: asyncio.Event = MISSING
+        # Pre-emptive client-side limiter, so global 429s (and the Cloudflare bans that follow) are avoided
+        self.global_ratelimit: Optional[int] = global_ratelimit
+        self._global_bucket: Optional[GlobalRatelimit] = None
+        self.asset_cache: Optional[AssetCache] = asset_cache
+        # URL -> In-flight CDN download
+        self._cdn_requests: Dict[str, asyncio.Task[bytes]] = {}
+        # Route key -> Stats, and bucket hash -> Stats
+        self._route_stats: Dict[str, _RequestStats] = {}
+        self._bucket_stats: Dict[str, _RequestStats] = {}
+        self.stats_hook: Optional[Callable[[RequestRecord], Any]] = stats_hook
         self.token: Optional[str] = None
         self.ack_token: Optional[str] = None
         self.proxy: Optional[str] = proxy
@@ -607,6 +829,16 @@ class HTTPClient:
 
         self.super_properties: Dict[str, Any] = {}
         self.encoded_super_properties: str = MISSING
+        self._sec_ch_ua: str = MISSING
+        # Where resolved super properties are cached between runs, so startup doesn't wait on the network
+        self.properties_cache: Optional[str] = (
+            utils._default_info_cache_path() if properties_cache is MISSING else properties_cache
+        )
+        self.properties_cache_ttl: float = properties_cache_ttl
+        self._properties_refresh: Optional[asyncio.Task[None]] = None
+        self.connections_per_host: int = connections_per_host
+        self.prewarm_connections: int = prewarm_connections
+        self._prewarm_tasks: Set[asyncio.Task[None]] = set()
         self._started: bool = False
 
     def __del__(self) -> None:
@@ -627,19 +859,108 @@ class HTTPClient:
 
         self._global_over = asyncio.Event()
         self._global_over.set()
+        if self.global_ratelimit:
+            self._global_bucket = GlobalRatelimit(self.global_ratelimit)
 
         if self.connector is MISSING or self.connector.closed:
-            self.connector = aiohttp.TCPConnector(limit=0)
+            self.connector = aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=self.connections_per_host,
+                # The hosts are few and stable, so there's no need to resolve them every 10 seconds
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+            )
         self.__session = session = await _gen_session(
             aiohttp.ClientSession(
                 connector=self.connector, trace_configs=None if self.http_trace is None else [self.http_trace]
             )
         )
-        self.super_properties, self.encoded_super_properties = sp, _ = await utils._get_info(session)
-        _log.info('Found user agent %s, build number %s.', sp.get('browser_user_agent'), sp.get('client_build_number'))
+        cached = utils._read_cached_info(self.properties_cache) if self.properties_cache else None
+        if cached is None:
+            # Nothing to fall back on, so this has to wait for the real values
+            await self._refresh_super_properties(session)
+        else:
+            properties, encoded, fetched_at = cached
+            self._set_super_properties(properties, encoded)
+            _log.info(
+                'Using cached user agent %s, build number %s.',
+                properties.get('browser_user_agent'),
+                properties.get('client_build_number'),
+            )
+            if time.time() - fetched_at >= self.properties_cache_ttl:
+                self._properties_refresh = asyncio.create_task(self._refresh_super_properties(session))
+
+        if self.prewarm_connections > 0:
+            for url in PREWARM_URLS:
+                for _ in range(self.prewarm_connections):
+                    task = asyncio.create_task(self._prewarm(session, url))
+                    self._prewarm_tasks.add(task)
+                    task.add_done_callback(self._prewarm_tasks.discard)
 
         self._started = True
 
+    async def _prewarm(self, session: aiohttp.ClientSession, url: str) -> None:
+        # Pays for DNS, TCP and TLS now, leaving a keep-alive connection in the pool for the first real request
+        try:
+            async with session.head(
+                url,
+                headers={'User-Agent': self.user_agent},
+                proxy=self.proxy,
+                proxy_auth=self.proxy_auth,
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as response:
+                _log.debug('Pre-warmed a connection to %s (%s).', url, response.status)
+        except Exception as exc:
+            _log.debug('Failed to pre-warm a connection to %s: %s', url, exc)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Returns a snapshot of the connection pool's utilization.
+
+        The snapshot has the connector's ``limit`` and ``limit_per_host`` (``0`` meaning unlimited),
+        the total number of ``active`` connections, and a ``hosts`` mapping of ``host:port``
+        to its ``active`` (in use) and ``idle`` (kept alive) connection counts.
+        """
+        connector = self.connector
+        hosts: Dict[str, Dict[str, int]] = {}
+        if not connector:
+            return {'limit': 0, 'limit_per_host': 0, 'active': 0, 'hosts': hosts}
+
+        # These are aiohttp internals, so tread carefully
+        for key, conns in getattr(connector, '_conns', {}).items():
+            host = hosts.setdefault(f'{key.host}:{key.port}', {'active': 0, 'idle': 0})
+            host['idle'] += len(conns)
+        for key, acquired in getattr(connector, '_acquired_per_host', {}).items():
+            host = hosts.setdefault(f'{key.host}:{key.port}', {'active': 0, 'idle': 0})
+            host['active'] += len(acquired)
+
+        return {
+            'limit': connector.limit,
+            'limit_per_host': connector.limit_per_host,
+            'active': len(getattr(connector, '_acquired', ())),
+            'hosts': hosts,
+        }
+
+    def _set_super_properties(self, properties: Dict[str, Any], encoded: str) -> None:
+        self.super_properties = properties
+        self.encoded_super_properties = encoded
+        self._sec_ch_ua = '"Google Chrome";v="{0}", "Chromium";v="{0}", ";Not-A.Brand";v="24"'.format(
+            properties['browser_version'].split('.')[0]
+        )
+
+    async def _refresh_super_properties(self, session: aiohttp.ClientSession) -> None:
+        properties, encoded, fetched = await utils._get_info(session)
+        self._set_super_properties(properties, encoded)
+        _log.info(
+            'Found user agent %s, build number %s.',
+            properties.get('browser_user_agent'),
+            properties.get('client_build_number'),
+        )
+        # Caching the hardcoded fallbacks would pin them until the cache expires, even across restarts
+        if self.properties_cache and fetched:
+            await asyncio.get_running_loop().run_in_executor(
+                None, utils._write_cached_info, self.properties_cache, properties, encoded
+            )
+
     async def ws_connect(self, url: str, *, compress: int = 0) -> aiohttp.ClientWebSocketResponse:
         kwargs: Dict[str, Any] = {
             'proxy_auth': self.proxy_auth,
@@ -691,6 +1012,7 @@ class HTTPClient:
         *,
         files: Optional[Sequence[File]] = None,
         form: Optional[List[Dict[str, Any]]] = None,
+        retry_indexing: bool = True,
         **kwargs: Any,
     ) -> Any:
         method = route.method
@@ -719,9 +1041,7 @@ class HTTPClient:
             'Origin': 'https://discord.com',
             'Pragma': 'no-cache',
             'Referer': 'https://discord.com/channels/@me',
-            'Sec-CH-UA': '"Google Chrome";v="{0}", "Chromium";v="{0}", ";Not-A.Brand";v="24"'.format(
-                self.browser_version.split('.')[0]
-            ),
+            'Sec-CH-UA': self._sec_ch_ua,
             'Sec-CH-UA-Mobile': '?0',
             'Sec-CH-UA-Platform': '"Windows"',
             'Sec-Fetch-Dest': 'empty',
@@ -779,191 +1099,380 @@ class HTTPClient:
         response: Optional[aiohttp.ClientResponse] = None
         data: Optional[Union[Dict[str, Any], str]] = None
         failed = 0  # Number of 500'd requests
-        async with ratelimit:
-            for tries in range(5):
-                if files:
-                    for f in files:
-                        f.reset(seek=tries)
-
-                if form:
-                    # With quote_fields=True '[' and ']' in file field names are escaped, which Discord does not support
-                    form_data = aiohttp.FormData(quote_fields=False)
-                    for params in form:
-                        form_data.add_field(**params)
-                    kwargs['data'] = form_data
-
-                if failed:
-                    headers['X-Failed-Requests'] = str(failed)
-
-                try:
-                    async with self.__session.request(method, url, **kwargs) as response:
-                        _log.debug('%s %s with %s has returned %s.', method, url, kwargs.get('data'), response.status)
-                        data = await json_or_text(response)
-
-                        # Update and use rate limit information if the bucket header is present
-                        discord_hash = response.headers.get('X-Ratelimit-Bucket')
-                        # I am unsure if X-Ratelimit-Bucket is always available
-                        # However, X-Ratelimit-Remaining has been a consistent cornerstone that worked
-                        has_ratelimit_headers = 'X-Ratelimit-Remaining' in response.headers
-                        if discord_hash is not None:
-                            # If the hash Discord has provided is somehow different from our current hash something changed
-                            if bucket_hash != discord_hash:
-                                if bucket_hash is not None:
-                                    # If the previous hash was an actual Discord hash then this means the
-                                    # hash has changed sporadically.
-                                    # This can be due to two reasons
-                                    # 1. It's a sub-ratelimit which is hard to handle
-                                    # 2. The rate limit information genuinely changed
-                                    # There is no good way to discern these, Discord doesn't provide a way to do so.
-                                    # At best, there will be some form of logging to help catch it.
-                                    # Alternating sub-ratelimits means that the requests oscillate between
-                                    # different underlying rate limits -- this can lead to unexpected 429s
-                                    # It is unavoidable.
-                                    fmt = 'A route (%s) has changed hashes: %s -> %s.'
-                                    _log.debug(fmt, route_key, bucket_hash, discord_hash)
-
-                                    self._bucket_hashes[route_key] = discord_hash
-                                    recalculated_key = discord_hash + route.major_parameters
-                                    self._buckets[recalculated_key] = ratelimit
-                                    self._buckets.pop(key, None)
-                                elif route_key not in self._bucket_hashes:
-                                    fmt = '%s has found its initial rate limit bucket hash (%s).'
-                                    _log.debug(fmt, route_key, discord_hash)
-                                    self._bucket_hashes[route_key] = discord_hash
-                                    self._buckets[discord_hash + route.major_parameters] = ratelimit
-
-                        if has_ratelimit_headers:
-                            if response.status != 429:
-                                ratelimit.update(response, use_clock=self.use_clock)
-                                if ratelimit.remaining == 0:
+        record = RequestRecord(method, route_key)
+        started = time.perf_counter()
+        try:
+            async with ratelimit:
+                record.ratelimit_wait = time.perf_counter() - started
+                for tries in range(5):
+                    if files:
+                        for f in files:
+                            f.reset(seek=tries)
+
+                    if form:
+                        # With quote_fields=True '[' and ']' in file field names are escaped, which Discord does not support
+                        form_data = aiohttp.FormData(quote_fields=False)
+                        for params in form:
+                            form_data.add_field(**params)
+                        kwargs['data'] = form_data
+
+                    if failed:
+                        headers['X-Failed-Requests'] = str(failed)
+
+                    if self._global_bucket is not None:
+                        await self._global_bucket.acquire()
+
+                    record.attempts += 1
+                    record.bytes_out += _payload_size(kwargs.get('data'), files)
+                    attempt_started = time.perf_counter()
+                    try:
+                        async with self.__session.request(method, url, **kwargs) as response:
+                            _log.debug('%s %s with %s has returned %s.', method, url, kwargs.get('data'), response.status)
+                            data = await json_or_text(response)
+                            record.latency += time.perf_counter() - attempt_started
+                            record.bytes_in += response.content.total_bytes
+                            record.status = response.status
+
+                            # Update and use rate limit information if the bucket header is present
+                            discord_hash = response.headers.get('X-Ratelimit-Bucket')
+                            # I am unsure if X-Ratelimit-Bucket is always available
+                            # However, X-Ratelimit-Remaining has been a consistent cornerstone that worked
+                            has_ratelimit_headers = 'X-Ratelimit-Remaining' in response.headers
+                            if discord_hash is not None:
+                                record.bucket = discord_hash
+                                # If the hash Discord has provided is somehow different from our current hash something changed
+                                if bucket_hash != discord_hash:
+                                    if bucket_hash is not None:
+                                        # If the previous hash was an actual Discord hash then this means the
+                                        # hash has changed sporadically.
+                                        # This can be due to two reasons
+                                        # 1. It's a sub-ratelimit which is hard to handle
+                                        # 2. The rate limit information genuinely changed
+                                        # There is no good way to discern these, Discord doesn't provide a way to do so.
+                                        # At best, there will be some form of logging to help catch it.
+                                        # Alternating sub-ratelimits means that the requests oscillate between
+                                        # different underlying rate limits -- this can lead to unexpected 429s
+                                        # It is unavoidable.
+                                        fmt = 'A route (%s) has changed hashes: %s -> %s.'
+                                        _log.debug(fmt, route_key, bucket_hash, discord_hash)
+
+                                        self._bucket_hashes[route_key] = discord_hash
+                                        recalculated_key = f'{discord_hash}:{route.major_parameters}'
+                                        self._buckets[recalculated_key] = ratelimit
+                                        self._buckets.pop(key, None)
+                                    elif route_key not in self._bucket_hashes:
+                                        fmt = '%s has found its initial rate limit bucket hash (%s).'
+                                        _log.debug(fmt, route_key, discord_hash)
+                                        self._bucket_hashes[route_key] = discord_hash
+                                        self._buckets[f'{discord_hash}:{route.major_parameters}'] = ratelimit
+
+                            if has_ratelimit_headers:
+                                if response.status != 429:
+                                    ratelimit.update(response, use_clock=self.use_clock)
+                                    if ratelimit.remaining == 0:
+                                        _log.debug(
+                                            'A rate limit bucket (%s) has been exhausted. Pre-emptively rate limiting...',
+                                            discord_hash or route_key,
+                                        )
+
+                            # 202s must be retried
+                            if response.status == 202 and isinstance(data, dict) and data['code'] == 110000:
+                                # Callers that retry themselves get the payload, so the bucket isn't held while waiting
+                                if not retry_indexing:
+                                    return data
+
+                                # We update the `attempts` query parameter
+                                params = kwargs.get('params')
+                                if not params:
+                                    kwargs['params'] = {'attempts': 1}
+                                else:
+                                    params['attempts'] = (params.get('attempts') or 0) + 1
+
+                                # Sometimes retry_after is 0, but that's undesirable
+                                retry_after: float = data['retry_after'] or 5
+                                _log.debug('%s %s received a 202. Retrying in %s seconds...', method, url, retry_after)
+                                await asyncio.sleep(retry_after)
+                                continue
+
+                            # Request was successful so just return the text/json
+                            if 300 > response.status >= 200:
+                                _log.debug('%s %s has received %s.', method, url, data)
+                                return data
+
+                            # Rate limited
+                            if response.status == 429:
+                                if not response.headers.get('Via') or isinstance(data, str):
+                                    # Banned by Cloudflare more than likely.
+                                    raise HTTPException(response, data)
+
+                                record.ratelimited += 1
+                                if ratelimit.remaining > 0:
+                                    if not data.get('global', False):
+                                        record.sub_ratelimited += 1
+                                    # According to night
+                                    # https://github.com/discord/discord-api-docs/issues/2190#issuecomment-816363129
+                                    # Remaining > 0 and 429 means that a sub ratelimit was hit.
+                                    # It is unclear what should happen in these cases other than just using the retry_after
+                                    # value in the body.
                                     _log.debug(
-                                        'A rate limit bucket (%s) has been exhausted. Pre-emptively rate limiting...',
-                                        discord_hash or route_key,
+                                        '%s %s received a 429 despite having %s remaining requests. This is a sub-ratelimit.',
+                                        method,
+                                        url,
+                                        ratelimit.remaining,
+                                    )
+
+                                retry_after: float = data['retry_after']
+                                if self.max_ratelimit_timeout and retry_after > self.max_ratelimit_timeout:
+                                    _log.warning(
+                                        'We are being rate limited. %s %s responded with 429. Timeout of %.2f was too long, erroring instead.',
+                                        method,
+                                        url,
+                                        retry_after,
                                     )
+                                    raise RateLimited(retry_after)
+
+                                fmt = 'We are being rate limited. %s %s responded with 429. Retrying in %.2f seconds.'
+                                _log.warning(fmt, method, url, retry_after)
+
+                                _log.debug(
+                                    'Rate limit is being handled by bucket hash %s with %r major parameters.',
+                                    bucket_hash,
+                                    route.major_parameters,
+                                )
 
-                        # 202s must be retried
-                        if response.status == 202 and isinstance(data, dict) and data['code'] == 110000:
-                            # We update the `attempts` query parameter
-                            params = kwargs.get('params')
-                            if not params:
-                                kwargs['params'] = {'attempts': 1}
+                                # Check if it's a global rate limit
+                                is_global = data.get('global', False)
+                                if is_global:
+                                    record.global_ratelimited += 1
+                                    _log.warning('Global rate limit has been hit. Retrying in %.2f seconds.', retry_after)
+                                    self._global_over.clear()
+                                    if self._global_bucket is not None:
+                                        self._global_bucket.drain()
+
+                                await asyncio.sleep(retry_after)
+                                _log.debug('Done sleeping for the rate limit. Retrying...')
+
+                                # Release the global lock now that the rate limit passed
+                                if is_global:
+                                    self._global_over.set()
+                                    _log.debug('Global rate limit is now over.')
+
+                                continue
+
+                            # Unconditional retry
+                            if response.status in {500, 502, 504, 507, 522, 523, 524}:
+                                failed += 1
+                                record.server_errors += 1
+                                await asyncio.sleep(1 + tries * 2)
+                                continue
+
+                            # Usual error cases
+                            if response.status == 403:
+                                raise Forbidden(response, data)
+                            elif response.status == 404:
+                                raise NotFound(response, data)
+                            elif response.status >= 500:
+                                raise DiscordServerError(response, data)
                             else:
-                                params['attempts'] = (params.get('attempts') or 0) + 1
+                                if isinstance(data, dict) and 'captcha_key' in data:
+                                    raise CaptchaRequired(response, data)  # type: ignore
+                                raise HTTPException(response, data)
 
-                            # Sometimes retry_after is 0, but that's undesirable
-                            retry_after: float = data['retry_after'] or 5
-                            _log.debug('%s %s received a 202. Retrying in %s seconds...', method, url, retry_after)
-                            await asyncio.sleep(retry_after)
+                    # This is handling exceptions from the request
+                    except OSError as e:
+                        # Connection reset by peer
+                        if tries < 4 and e.errno in (54, 10054):
+                            failed += 1
+                            record.connection_resets += 1
+                            await asyncio.sleep(1 + tries * 2)
                             continue
+                        raise
 
-                        # Request was successful so just return the text/json
-                        if 300 > response.status >= 200:
-                            _log.debug('%s %s has received %s.', method, url, data)
-                            return data
+                    # Captcha handling
+                    except CaptchaRequired as e:
+                        # The way captcha handling works is completely transparent
+                        # The user is expected to provide a handler that will be called to return a solution
+                        # Then, we just insert the solution + rqtoken (if applicable) into the headers and retry the request
+                        if captcha_handler is None or tries == 4:
+                            raise
+                        else:
+                            record.captcha_retries += 1
+                            headers['X-Captcha-Key'] = await captcha_handler(e)
+                            if e.rqtoken:
+                                headers['X-Captcha-Rqtoken'] = e.rqtoken
+
+                if response is not None:
+                    # We've run out of retries, raise
+                    if response.status >= 500:
+                        raise DiscordServerError(response, data)
 
-                        # Rate limited
-                        if response.status == 429:
-                            if not response.headers.get('Via') or isinstance(data, str):
-                                # Banned by Cloudflare more than likely.
-                                raise HTTPException(response, data)
+                    raise HTTPException(response, data)
 
-                            if ratelimit.remaining > 0:
-                                # According to night
-                                # https://github.com/discord/discord-api-docs/issues/2190#issuecomment-816363129
-                                # Remaining > 0 and 429 means that a sub ratelimit was hit.
-                                # It is unclear what should happen in these cases other than just using the retry_after
-                                # value in the body.
-                                _log.debug(
-                                    '%s %s received a 429 despite having %s remaining requests. This is a sub-ratelimit.',
-                                    method,
-                                    url,
-                                    ratelimit.remaining,
-                                )
+                raise RuntimeError('Unreachable code in HTTP handling')
+        except BaseException:
+            record.failed = True
+            raise
+        finally:
+            self._record_request(record)
 
-                            retry_after: float = data['retry_after']
-                            if self.max_ratelimit_timeout and retry_after > self.max_ratelimit_timeout:
-                                _log.warning(
-                                    'We are being rate limited. %s %s responded with 429. Timeout of %.2f was too long, erroring instead.',
-                                    method,
-                                    url,
-                                    retry_after,
-                                )
-                                raise RateLimited(retry_after)
+    def _record_request(self, record: RequestRecord) -> None:
+        try:
+            stats = self._route_stats[record.route_key]
+        except KeyError:
+            stats = self._route_stats[record.route_key] = _RequestStats()
+        stats.add(record)
 
-                            fmt = 'We are being rate limited. %s %s responded with 429. Retrying in %.2f seconds.'
-                            _log.warning(fmt, method, url, retry_after)
+        if record.bucket is not None:
+            try:
+                stats = self._bucket_stats[record.bucket]
+            except KeyError:
+                stats = self._bucket_stats[record.bucket] = _RequestStats()
+            stats.add(record)
 
-                            _log.debug(
-                                'Rate limit is being handled by bucket hash %s with %r major parameters.',
-                                bucket_hash,
-                                route.major_parameters,
-                            )
+        if self.stats_hook is not None:
+            try:
+                self.stats_hook(record)
+            except Exception:
+                _log.exception('Ignoring exception in HTTP stats hook.')
 
-                            # Check if it's a global rate limit
-                            is_global = data.get('global', False)
-                            if is_global:
-                                _log.warning('Global rate limit has been hit. Retrying in %.2f seconds.', retry_after)
-                                self._global_over.clear()
+    def stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Returns a snapshot of the request telemetry collected so far.
 
-                            await asyncio.sleep(retry_after)
-                            _log.debug('Done sleeping for the rate limit. Retrying...')
+        The snapshot has a ``routes`` mapping keyed by :attr:`Route.key` and a ``buckets``
+        mapping keyed by Discord's bucket hash. Each entry has request, retry, rate limit and
+        byte counters along with ``latency`` and ``ratelimit_wait`` histograms (in seconds).
+        """
+        return {
+            'routes': {key: stats.to_dict() for key, stats in self._route_stats.items()},
+            'buckets': {key: stats.to_dict() for key, stats in self._bucket_stats.items()},
+        }
 
-                            # Release the global lock now that the rate limit passed
-                            if is_global:
-                                self._global_over.set()
-                                _log.debug('Global rate limit is now over.')
+    def clear_stats(self) -> None:
+        self._route_stats.clear()
+        self._bucket_stats.clear()
 
-                            continue
+    def _bucket_key(self, route: Route) -> str:
+        try:
+            bucket_hash = self._bucket_hashes[route.key]
+        except KeyError:
+            return f'{route.key}:{route.major_parameters}'
+        else:
+            return f'{bucket_hash}:{route.major_parameters}'
 
-                        # Unconditional retry
-                        if response.status in {500, 502, 504, 507, 522, 523, 524}:
-                            failed += 1
-                            await asyncio.sleep(1 + tries * 2)
-                            continue
+    async def fan_out(
+        self,
+        requests: Iterable[Union[Route, Tuple[Route, Callable[[], Awaitable[Any]]], Callable[[], Awaitable[Any]]]],
+        *,
+        limit: int = 10,
+        return_exceptions: bool = False,
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """Runs many requests concurrently, grouped by their rate limit bucket.
+
+        Each item is either a :class:`Route` (sent with no body), a tuple of a
+        :class:`Route` and a coroutine factory that performs the request for that route,
+        or a bare coroutine factory (which is treated as its own bucket).
+
+        Requests sharing a bucket are started in order, with as many in flight as the bucket's
+        last known limit allows; independent buckets run in parallel. At most ``limit`` requests
+        are in flight at once. Results are yielded as ``(index, result)`` tuples in completion order.
+        """
+        if limit <= 0:
+            raise ValueError('limit must be greater than 0')
+
+        groups: Dict[str, Tuple[Optional[Route], Deque[Tuple[int, Callable[[], Awaitable[Any]]]]]] = {}
+        total = 0
+        for index, item in enumerate(requests):
+            if isinstance(item, Route):
+                route, factory = item, partial(self.request, item)
+            elif isinstance(item, tuple):
+                route, factory = item
+            else:
+                route, factory = None, item
 
-                        # Usual error cases
-                        if response.status == 403:
-                            raise Forbidden(response, data)
-                        elif response.status == 404:
-                            raise NotFound(response, data)
-                        elif response.status >= 500:
-                            raise DiscordServerError(response, data)
-                        else:
-                            if isinstance(data, dict) and 'captcha_key' in data:
-                                raise CaptchaRequired(response, data)  # type: ignore
-                            raise HTTPException(response, data)
-
-                # This is handling exceptions from the request
-                except OSError as e:
-                    # Connection reset by peer
-                    if tries < 4 and e.errno in (54, 10054):
-                        failed += 1
-                        await asyncio.sleep(1 + tries * 2)
-                        continue
-                    raise
-
-                # Captcha handling
-                except CaptchaRequired as e:
-                    # The way captcha handling works is completely transparent
-                    # The user is expected to provide a handler that will be called to return a solution
-                    # Then, we just insert the solution + rqtoken (if applicable) into the headers and retry the request
-                    if captcha_handler is None or tries == 4:
-                        raise
-                    else:
-                        headers['X-Captcha-Key'] = await captcha_handler(e)
-                        if e.rqtoken:
-                            headers['X-Captcha-Rqtoken'] = e.rqtoken
+            key = self._bucket_key(route) if route is not None else f'<unbucketed {index}>'
+            try:
+                groups[key][1].append((index, factory))
+            except KeyError:
+                groups[key] = (route, deque([(index, factory)]))
+            total += 1
+
+        semaphore = asyncio.Semaphore(limit)
+        results: asyncio.Queue[Tuple[int, Any, bool]] = asyncio.Queue(maxsize=limit)
+        tasks: Set[asyncio.Task[None]] = set()
+
+        def spawn(route: Optional[Route], jobs: Deque[Tuple[int, Callable[[], Awaitable[Any]]]], workers: List[int]) -> None:
+            workers[0] += 1
+            task = asyncio.create_task(worker(route, jobs, workers))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        async def worker(
+            route: Optional[Route], jobs: Deque[Tuple[int, Callable[[], Awaitable[Any]]]], workers: List[int]
+        ) -> None:
+            try:
+                while jobs:
+                    index, factory = jobs.popleft()
+                    async with semaphore:
+                        try:
+                            result, failed = await factory(), False
+                        except Exception as exc:
+                            result, failed = exc, True
+                    await results.put((index, result, failed))
+
+                    # Widen the bucket once its real limit is known
+                    if route is not None:
+                        ratelimit = self._buckets.get(self._bucket_key(route))
+                        allowed = min(ratelimit.limit if ratelimit else 1, limit)
+                        while jobs and workers[0] < min(allowed, len(jobs) + 1):
+                            spawn(route, jobs, workers)
+            finally:
+                workers[0] -= 1
+
+        for route, jobs in groups.values():
+            spawn(route, jobs, [0])
+
+        try:
+            for _ in range(total):
+                index, result, failed = await results.get()
+                if failed and not return_exceptions:
+                    raise result
+                yield index, result
+        finally:
+            for task in list(tasks):
+                task.cancel()
+
+    async def get_from_cdn(self, url: str, *, cache: bool = False) -> bytes:
+        asset_cache = self.asset_cache if cache else None
+        if asset_cache is not None:
+            data = await asset_cache.get(url)
+            if data is not None:
+                return data
+
+        # Concurrent downloads of the same URL share a single request. It runs in
+        # its own task so that cancelling one caller doesn't cancel the others.
+        try:
+            task = self._cdn_requests[url]
+        except KeyError:
+            task = asyncio.create_task(self._share_from_cdn(url, asset_cache))
+            task.add_done_callback(lambda task: self._cdn_request_done(url, task))
+            self._cdn_requests[url] = task
 
-            if response is not None:
-                # We've run out of retries, raise
-                if response.status >= 500:
-                    raise DiscordServerError(response, data)
+        return await asyncio.shield(task)
 
-                raise HTTPException(response, data)
+    async def _share_from_cdn(self, url: str, asset_cache: Optional[AssetCache]) -> bytes:
+        data = await self._get_from_cdn(url)
+        if asset_cache is not None:
+            await asset_cache.put(url, data)
+        return data
 
-            raise RuntimeError('Unreachable code in HTTP handling')
+    def _cdn_request_done(self, url: str, task: asyncio.Task[bytes]) -> None:
+        if self._cdn_requests.get(url) is task:
+            del self._cdn_requests[url]
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
 
-    async def get_from_cdn(self, url: str) -> bytes:
+    async def _get_from_cdn(self, url: str) -> bytes:
         async with self.__session.get(url) as resp:
             if resp.status == 200:
                 return await resp.read()
@@ -976,7 +1485,42 @@ class HTTPClient:
 
         raise RuntimeError('Unreachable code in HTTP handling')
 
-    async def upload_to_cloud(self, url: str, file: Union[File, str], hash: Optional[str] = None) -> Any:
+    async def stream_from_cdn(self, url: str, *, cache: bool = False, chunk_size: int = 2**16) -> AsyncIterator[bytes]:
+        asset_cache = self.asset_cache if cache else None
+        if asset_cache is not None:
+            fp = await asset_cache.open(url)
+            if fp is not None:
+                loop = asyncio.get_running_loop()
+                with fp:
+                    while True:
+                        chunk = await loop.run_in_executor(None, fp.read, chunk_size)
+                        if not chunk:
+                            return
+                        yield chunk
+
+        async with self.__session.get(url) as resp:
+            if resp.status == 200:
+                chunks = resp.content.iter_chunked(chunk_size)
+                if asset_cache is not None:
+                    chunks = asset_cache._tee(url, chunks)
+                async for chunk in chunks:
+                    yield chunk
+                return
+            elif resp.status == 404:
+                raise NotFound(resp, 'asset not found')
+            elif resp.status == 403:
+                raise Forbidden(resp, 'cannot retrieve asset')
+            else:
+                raise HTTPException(resp, 'failed to get asset')
+
+    async def upload_to_cloud(
+        self,
+        url: str,
+        file: Union[File, str, Callable[[], AsyncIterable[bytes]]],
+        hash: Optional[str] = None,
+        *,
+        progress: Optional[Callable[[int], Any]] = None,
+    ) -> Any:
         response: Optional[aiohttp.ClientResponse] = None
         data: Optional[Union[Dict[str, Any], str]] = None
 
@@ -987,11 +1531,24 @@ class HTTPClient:
             headers['Content-MD5'] = hash
 
         for tries in range(5):
+            # File objects are streamed by aiohttp in chunks read off the event loop,
+            # and async iterables are pulled as the socket drains, so neither is buffered whole
             if isinstance(file, File):
                 file.reset(seek=tries)
+                if progress is not None:
+                    # The length is known up front, so Google still gets a plain (non-chunked) upload
+                    headers['Content-Length'] = str(file.size - file._original_pos)
+                    body = file._iter_chunks(progress)
+                else:
+                    body = file.fp
+            elif callable(file):
+                # A stream can't be rewound, so a fresh one is requested for every attempt
+                body = file()
+            else:
+                body = file
 
             try:
-                async with self.__session.put(url, data=getattr(file, 'fp', file), headers=headers) as response:
+                async with self.__session.put(url, data=body, headers=headers) as response:
                     _log.debug('PUT %s with %s has returned %s.', url, file, response.status)
                     data = await json_or_text(response)
 
@@ -1042,6 +1599,11 @@ class HTTPClient:
     # State management
 
     async def close(self) -> None:
+        if self._properties_refresh is not None:
+            self._properties_refresh.cancel()
+            self._properties_refresh = None
+        for task in list(self._prewarm_tasks):
+            task.cancel()
         if self.__session:
             await self.__session.close()
 
@@ -1225,9 +1787,8 @@ class HTTPClient:
         payload = {'version': 2, 'read_state_type': type}  # Read state protocol version 2
         return self.request(Route('DELETE', '/channels/{channel_id}/messages/ack', channel_id=channel_id), json=payload)
 
-    def delete_message(
-        self, channel_id: Snowflake, message_id: Snowflake, *, reason: Optional[str] = None
-    ) -> Response[None]:
+    @staticmethod
+    def _delete_message_route(channel_id: Snowflake, message_id: Snowflake) -> Route:
         # Special case certain sub-rate limits
         # https://github.com/discord/discord-api-docs/issues/1092
         # https://github.com/discord/discord-api-docs/issues/1295
@@ -1238,17 +1799,19 @@ class HTTPClient:
         elif difference >= datetime.timedelta(days=14):
             metadata = 'older-than-two-weeks'
 
-        return self.request(
-            Route(
-                'DELETE',
-                '/channels/{channel_id}/messages/{message_id}',
-                channel_id=channel_id,
-                message_id=message_id,
-                metadata=metadata,
-            ),
-            reason=reason,
+        return Route(
+            'DELETE',
+            '/channels/{channel_id}/messages/{message_id}',
+            channel_id=channel_id,
+            message_id=message_id,
+            metadata=metadata,
         )
 
+    def delete_message(
+        self, channel_id: Snowflake, message_id: Snowflake, *, reason: Optional[str] = None
+    ) -> Response[None]:
+        return self.request(self._delete_message_route(channel_id, message_id), reason=reason)
+
     def edit_message(
         self, channel_id: Snowflake, message_id: Snowflake, *, params: MultipartParameters
     ) -> Response[message.Message]:
@@ -1370,14 +1933,26 @@ class HTTPClient:
 
         return self.request(Route('GET', '/channels/{channel_id}/messages', channel_id=channel_id), params=params)
 
-    def search_guild(self, guild_id: Snowflake, payload: Dict[str, Any]) -> Response[message.MessageSearchResult]:
-        return self.request(Route('GET', '/guilds/{guild_id}/messages/search', guild_id=guild_id), params=payload)
+    def search_guild(
+        self, guild_id: Snowflake, payload: Dict[str, Any], *, retry_indexing: bool = True
+    ) -> Response[message.MessageSearchResult]:
+        return self.request(
+            Route('GET', '/guilds/{guild_id}/messages/search', guild_id=guild_id),
+            params=payload,
+            retry_indexing=retry_indexing,
+        )
 
-    def search_channel(self, channel_id: Snowflake, payload: Dict[str, Any]) -> Response[message.MessageSearchResult]:
-        return self.request(Route('GET', '/channels/{channel_id}/messages/search', channel_id=channel_id), params=payload)
+    def search_channel(
+        self, channel_id: Snowflake, payload: Dict[str, Any], *, retry_indexing: bool = True
+    ) -> Response[message.MessageSearchResult]:
+        return self.request(
+            Route('GET', '/channels/{channel_id}/messages/search', channel_id=channel_id),
+            params=payload,
+            retry_indexing=retry_indexing,
+        )
 
-    def search_user(self, payload: Dict[str, Any]) -> Response[message.MessageSearchResult]:
-        return self.request(Route('GET', '/users/@me/messages/search'), json=payload)
+    def search_user(self, payload: Dict[str, Any], *, retry_indexing: bool = True) -> Response[message.MessageSearchResult]:
+        return self.request(Route('GET', '/users/@me/messages/search'), json=payload, retry_indexing=retry_indexing)
 
     def publish_message(self, channel_id: Snowflake, message_id: Snowflake) -> Response[message.Message]:
         return self.request(
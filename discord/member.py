@@ -475,10 +475,8 @@ class Member(discord.abc.Messageable, discord.abc.Connectable, _UserTag):
         There is an alias for this named :attr:`color`.
         """
 
-        roles = self.roles[1:]  # Remove @everyone
-
         # Highest role with a colour is the one that's rendered
-        for role in reversed(roles):
+        for role in reversed(self._sorted_roles()):
             if role.colour.value:
                 return role.colour
         return Colour.default()
@@ -501,16 +499,15 @@ class Member(discord.abc.Messageable, discord.abc.Connectable, _UserTag):
 
         These roles are sorted by their position in the role hierarchy.
         """
-        result = []
-        g = self.guild
-        for role_id in self._roles:
-            role = g.get_role(role_id)
-            if role:
-                result.append(role)
-        result.append(g.default_role)
-        result.sort()
+        result = self._sorted_roles()
+        result.insert(0, self.guild.default_role)
         return result
 
+    def _sorted_roles(self) -> List[Role]:
+        # The member's roles from lowest to highest, without @everyone
+        order, ranks = self.guild._role_hierarchy()
+        return [order[rank] for rank in sorted([ranks[role_id] for role_id in self._roles if role_id in ranks])]
+
     @property
     def display_icon(self) -> Optional[Union[str, Asset]]:
         """Optional[Union[:class:`str`, :class:`Asset`]]: A property that returns the role icon that is rendered for
@@ -628,7 +625,9 @@ class Member(discord.abc.Messageable, discord.abc.Connectable, _UserTag):
         if len(self._roles) == 0:
             return guild.default_role
 
-        return max(guild.get_role(rid) or guild.default_role for rid in self._roles)
+        order, ranks = guild._role_hierarchy()
+        rank = max(ranks.get(role_id, -1) for role_id in self._roles)
+        return order[rank] if rank >= 0 else guild.default_role
 
     @property
     def guild_permissions(self) -> Permissions:
@@ -26,7 +26,6 @@ from __future__ import annotations
 
 import asyncio
 import datetime
-import re
 import io
 from os import PathLike
 from typing import (
@@ -94,6 +93,7 @@ if TYPE_CHECKING:
         UserWithMember as UserWithMemberPayload,
     )
     from .types.user import User as UserPayload
+    from .types.snowflake import SnowflakeList
     from .types.embed import Embed as EmbedPayload
     from .types.gateway import MessageReactionRemoveEvent, MessageUpdateEvent
     from .abc import Snowflake
@@ -584,6 +584,15 @@ def flatten_handlers(cls: Type[Message]) -> Type[Message]:
     # Store _handle_member last
     handlers.append(('member', cls._handle_member))
     cls._HANDLERS = handlers
+
+    # Handlers run on construction, after the lazily decodable attributes.
+    # Eager construction decodes mentions and components through their handlers
+    # instead, in the same order as the handlers themselves run
+    init = ('author', 'member', 'mentions', 'mention_roles', 'call', 'components')
+    cls._INIT_HANDLERS = [(key, getattr(cls, f'_handle_{key}')) for key in init]
+    cls._LAZY_INIT_HANDLERS = [(key, getattr(cls, f'_handle_{key}')) for key in ('author', 'member', 'call')]
+    handled = ('mentions', 'role_mentions', 'components')
+    cls._EAGER_DECODERS = [decode for name, decode in cls._LAZY_DECODERS.items() if name not in handled]
     cls._CACHED_SLOTS = [attr for attr in cls.__slots__ if attr.startswith('_cs_')]
     return cls
 
@@ -1529,12 +1538,14 @@ class Message(PartialMessage, Hashable):
 
     __slots__ = (
         '_edited_timestamp',
+        '_lazy_data',
         '_cs_channel_mentions',
         '_cs_raw_mentions',
         '_cs_clean_content',
         '_cs_raw_channel_mentions',
         '_cs_raw_role_mentions',
         '_cs_system_content',
+        '_cs_tokens',
         'tts',
         'content',
         'webhook_id',
@@ -1567,6 +1578,9 @@ class Message(PartialMessage, Hashable):
 
     if TYPE_CHECKING:
         _HANDLERS: ClassVar[List[Tuple[str, Callable[..., None]]]]
+        _INIT_HANDLERS: ClassVar[List[Tuple[str, Callable[..., None]]]]
+        _LAZY_INIT_HANDLERS: ClassVar[List[Tuple[str, Callable[..., None]]]]
+        _EAGER_DECODERS: ClassVar[List[Callable[[Message, MessagePayload], None]]]
         _CACHED_SLOTS: ClassVar[List[str]]
         reference: Optional[MessageReference]
         mentions: List[Union[User, Member]]
@@ -1581,16 +1595,13 @@ class Message(PartialMessage, Hashable):
         channel: MessageableChannel,
         data: MessagePayload,
         search_result: Optional[MessageSearchResultPayload] = None,
+        lazy: bool = False,
     ) -> None:
         self.channel: MessageableChannel = channel
         self.id: int = int(data['id'])
         self._state: ConnectionState = state
         self.webhook_id: Optional[int] = utils._get_as_snowflake(data, 'webhook_id')
-        self.reactions: List[Reaction] = [Reaction(message=self, data=d) for d in data.get('reactions', [])]
-        self.attachments: List[Attachment] = [Attachment(data=a, state=self._state) for a in data['attachments']]
-        self.embeds: List[Embed] = [Embed.from_dict(a) for a in data['embeds']]
         self.activity: Optional[MessageActivityPayload] = data.get('activity')
-        self._edited_timestamp: Optional[datetime.datetime] = utils.parse_time(data['edited_timestamp'])
         self.type: MessageType = try_enum(MessageType, data['type'])
         self.pinned: bool = data['pinned']
         self.flags: MessageFlags = MessageFlags._from_value(data.get('flags', 0))
@@ -1600,7 +1611,6 @@ class Message(PartialMessage, Hashable):
         self.nonce: Optional[Union[int, str]] = data.get('nonce')
         self.position: Optional[int] = data.get('position')
         self.application_id: Optional[int] = utils._get_as_snowflake(data, 'application_id')
-        self.stickers: List[StickerItem] = [StickerItem(data=d, state=state) for d in data.get('sticker_items', [])]
         self.call: Optional[CallMessage] = None
 
         try:
@@ -1616,66 +1626,51 @@ class Message(PartialMessage, Hashable):
             self.guild_id: Optional[int] = guild_id
             self.guild = state._get_guild(guild_id)
 
-        self.application: Optional[IntegrationApplication] = None
-        try:
-            application = data['application']
-        except KeyError:
-            pass
-        else:
-            self.application = IntegrationApplication(state=self._state, data=application)
+        search_payload = search_result or {}
+        self.hit: bool = data.get('hit', False)
+        self.total_results: Optional[int] = search_payload.get('total_results')
+        self.analytics_id: Optional[str] = search_payload.get('analytics_id')
+        self.doing_deep_historical_index: Optional[bool] = search_payload.get('doing_deep_historical_index')
 
-        self.interaction: Optional[Interaction] = None
-        try:
-            interaction = data['interaction']
-        except KeyError:
-            pass
+        if lazy:
+            # The rest is decoded from the payload on first access, see __getattr__
+            self._lazy_data: Optional[MessagePayload] = data
+            handlers = self._LAZY_INIT_HANDLERS
         else:
-            self.interaction = Interaction._from_message(self, **interaction)
+            self._lazy_data = None
+            for decode in self._EAGER_DECODERS:
+                try:
+                    decode(self, data)
+                except KeyError:
+                    continue
+            handlers = self._INIT_HANDLERS
 
-        try:
-            ref = data['message_reference']
-        except KeyError:
-            self.reference = None
-        else:
-            self.reference = ref = MessageReference.with_state(state, ref)
+        for key, handler in handlers:
             try:
-                resolved = data['referenced_message']
+                value = data[key]
             except KeyError:
-                pass
+                continue
             else:
-                if resolved is None:
-                    ref.resolved = DeletedReferencedMessage(ref)
-                else:
-                    # Right now the channel IDs match but maybe in the future they won't
-                    if ref.channel_id == channel.id:
-                        chan = channel
-                    elif isinstance(channel, Thread) and channel.parent_id == ref.channel_id:
-                        chan = channel
-                    else:
-                        chan, _ = state._get_guild_channel(resolved, ref.guild_id)
-
-                    # The channel will be the correct type here
-                    ref.resolved = self.__class__(channel=chan, data=resolved, state=state)  # type: ignore
-
-        self.role_subscription: Optional[RoleSubscriptionInfo] = None
+                handler(self, value)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached when a slot is unset, which in lazy mode means
+        # it hasn't been decoded from the retained payload yet
         try:
-            role_subscription = data['role_subscription_data']
+            decode = self._LAZY_DECODERS[name]
         except KeyError:
             pass
         else:
-            self.role_subscription = RoleSubscriptionInfo(role_subscription)
+            data = self._lazy_data
+            if data is not None:
+                try:
+                    decode(self, data)
+                except KeyError:
+                    pass
+                else:
+                    return object.__getattribute__(self, name)
 
-        search_payload = search_result or {}
-        self.hit: bool = data.get('hit', False)
-        self.total_results: Optional[int] = search_payload.get('total_results')
-        self.analytics_id: Optional[str] = search_payload.get('analytics_id')
-        self.doing_deep_historical_index: Optional[bool] = search_payload.get('doing_deep_historical_index')
-
-        for handler in ('author', 'member', 'mentions', 'mention_roles', 'call', 'interaction', 'components'):
-            try:
-                getattr(self, f'_handle_{handler}')(data[handler])
-            except KeyError:
-                continue
+        raise AttributeError(f'{self.__class__.__name__!r} object has no attribute {name!r}')
 
     def __repr__(self) -> str:
         name = self.__class__.__name__
@@ -1838,7 +1833,7 @@ class Message(PartialMessage, Hashable):
             else:
                 r.append(Member._try_upgrade(data=mention, guild=guild, state=state))
 
-    def _handle_mention_roles(self, role_mentions: List[int]) -> None:
+    def _handle_mention_roles(self, role_mentions: SnowflakeList) -> None:
         self.role_mentions = r = []
         if isinstance(self.guild, Guild):
             for role_id in map(int, role_mentions):
@@ -1872,6 +1867,106 @@ class Message(PartialMessage, Hashable):
     def _handle_interaction(self, data: MessageInteractionPayload):
         self.interaction = Interaction._from_message(self, **data)
 
+    def _decode_reactions(self, data: MessagePayload) -> None:
+        self.reactions = [Reaction(message=self, data=d) for d in data.get('reactions', [])]
+
+    def _decode_attachments(self, data: MessagePayload) -> None:
+        self._handle_attachments(data['attachments'])
+
+    def _decode_embeds(self, data: MessagePayload) -> None:
+        self._handle_embeds(data['embeds'])
+
+    def _decode_edited_timestamp(self, data: MessagePayload) -> None:
+        self._handle_edited_timestamp(data['edited_timestamp'])  # type: ignore # None is handled
+
+    def _decode_stickers(self, data: MessagePayload) -> None:
+        self.stickers = [StickerItem(data=d, state=self._state) for d in data.get('sticker_items', [])]
+
+    def _decode_application(self, data: MessagePayload) -> None:
+        self.application = None
+        try:
+            application = data['application']
+        except KeyError:
+            pass
+        else:
+            self._handle_application(application)
+
+    def _decode_interaction(self, data: MessagePayload) -> None:
+        self.interaction = None
+        try:
+            interaction = data['interaction']
+        except KeyError:
+            pass
+        else:
+            self._handle_interaction(interaction)
+
+    def _decode_reference(self, data: MessagePayload) -> None:
+        try:
+            ref = data['message_reference']
+        except KeyError:
+            self.reference = None
+            return
+
+        state = self._state
+        channel = self.channel
+        self.reference = ref = MessageReference.with_state(state, ref)
+        try:
+            resolved = data['referenced_message']
+        except KeyError:
+            pass
+        else:
+            if resolved is None:
+                ref.resolved = DeletedReferencedMessage(ref)
+            else:
+                # Right now the channel IDs match but maybe in the future they won't
+                if ref.channel_id == channel.id:
+                    chan = channel
+                elif isinstance(channel, Thread) and channel.parent_id == ref.channel_id:
+                    chan = channel
+                else:
+                    chan, _ = state._get_guild_channel(resolved, ref.guild_id)
+
+                # The channel will be the correct type here
+                ref.resolved = self.__class__(channel=chan, data=resolved, state=state, lazy=self._lazy_data is not None)  # type: ignore
+
+    def _decode_role_subscription(self, data: MessagePayload) -> None:
+        self.role_subscription = None
+        try:
+            role_subscription = data['role_subscription_data']
+        except KeyError:
+            pass
+        else:
+            self.role_subscription = RoleSubscriptionInfo(role_subscription)
+
+    def _decode_mentions(self, data: MessagePayload) -> None:
+        self._handle_mentions(data['mentions'])
+
+    def _decode_role_mentions(self, data: MessagePayload) -> None:
+        self._handle_mention_roles(data['mention_roles'])
+
+    def _decode_components(self, data: MessagePayload) -> None:
+        components = data.get('components')
+        if components is None:
+            # Left unset like any other missing key
+            raise KeyError('components')
+        self._handle_components(components)
+
+    # Attributes that lazy messages decode on first access, mapped to their decoder
+    _LAZY_DECODERS: ClassVar[Dict[str, Callable[[Message, MessagePayload], None]]] = {
+        'reactions': _decode_reactions,
+        'attachments': _decode_attachments,
+        'embeds': _decode_embeds,
+        '_edited_timestamp': _decode_edited_timestamp,
+        'stickers': _decode_stickers,
+        'application': _decode_application,
+        'interaction': _decode_interaction,
+        'reference': _decode_reference,
+        'role_subscription': _decode_role_subscription,
+        'mentions': _decode_mentions,
+        'role_mentions': _decode_role_mentions,
+        'components': _decode_components,
+    }
+
     def _rebind_cached_references(
         self,
         new_guild: Guild,
@@ -1888,13 +1983,35 @@ class Message(PartialMessage, Hashable):
 
         if channel.type in (ChannelType.private, ChannelType.group) and not settings.muted and not channel.notification_settings.muted:  # type: ignore
             return True
-        if state.user in self.mentions:
+        # Lazy messages are checked against their payload, so that
+        # every message doesn't need its mentions decoded
+        data = self._lazy_data
+        if data is None:
+            if state.user in self.mentions:
+                return True
+        elif any(int(m['id']) == state.self_id for m in data.get('mentions', [])):
             return True
         if self.mention_everyone and not settings.suppress_everyone:
             return True
-        if guild and guild.me and not settings.suppress_roles and guild.me.mentioned_in(self):
-            return True
-        return False
+
+        me = guild.me if guild else None
+        if me is None or settings.suppress_roles:
+            return False
+        if data is None:
+            return me.mentioned_in(self)
+        return self.mention_everyone or any(me._roles.has(int(role_id)) for role_id in data.get('mention_roles', []))
+
+    @utils.cached_slot_property('_cs_tokens')
+    def tokens(self) -> List[utils.ContentToken]:
+        """List[:class:`ContentToken`]: A property that returns every mention, custom emoji
+        and timestamp in the message content, in the order they appear.
+
+        The content is only scanned once, and the raw mention properties
+        and :attr:`clean_content` are built from these tokens.
+
+        .. versionadded:: 2.1
+        """
+        return utils.tokenize_content(self.content)
 
     @utils.cached_slot_property('_cs_raw_mentions')
     def raw_mentions(self) -> List[int]:
@@ -1904,21 +2021,21 @@ class Message(PartialMessage, Hashable):
         This allows you to receive the user IDs of mentioned users
         even in a private message context.
         """
-        return [int(x) for x in re.findall(r'<@!?([0-9]{15,20})>', self.content)]
+        return [token.id for token in self.tokens if token.type == 'user']  # type: ignore # Always set for mentions
 
     @utils.cached_slot_property('_cs_raw_channel_mentions')
     def raw_channel_mentions(self) -> List[int]:
         """List[:class:`int`]: A property that returns an array of channel IDs matched with
         the syntax of ``<#channel_id>`` in the message content.
         """
-        return [int(x) for x in re.findall(r'<#([0-9]{15,20})>', self.content)]
+        return [token.id for token in self.tokens if token.type == 'channel']  # type: ignore # Always set for mentions
 
     @utils.cached_slot_property('_cs_raw_role_mentions')
     def raw_role_mentions(self) -> List[int]:
         """List[:class:`int`]: A property that returns an array of role IDs matched with
         the syntax of ``<@&role_id>`` in the message content.
         """
-        return [int(x) for x in re.findall(r'<@&([0-9]{15,20})>', self.content)]
+        return [token.id for token in self.tokens if token.type == 'role']  # type: ignore # Always set for mentions
 
     @utils.cached_slot_property('_cs_channel_mentions')
     def channel_mentions(self) -> List[Union[GuildChannel, Thread]]:
@@ -1943,49 +2060,37 @@ class Message(PartialMessage, Hashable):
             or remove markdown then use :func:`utils.escape_markdown` or :func:`utils.remove_markdown`
             respectively, along with this function.
         """
+        content = self.content
+        tokens = [token for token in self.tokens if token.type in ('user', 'role', 'channel')]
+        if not tokens:
+            return escape_mentions(content)
 
-        if self.guild:
-
-            def resolve_member(id: int) -> str:
-                m = self.guild.get_member(id) or utils.get(self.mentions, id=id)  # type: ignore
-                return f'@{m.display_name}' if m else '@deleted-user'
-
-            def resolve_role(id: int) -> str:
-                r = self.guild.get_role(id) or utils.get(self.role_mentions, id=id)  # type: ignore
-                return f'@{r.name}' if r else '@deleted-role'
-
-            def resolve_channel(id: int) -> str:
-                c = self.guild._resolve_channel(id)  # type: ignore
-                return f'#{c.name}' if c else '#deleted-channel'
-
-        else:
-
-            def resolve_member(id: int) -> str:
-                m = utils.get(self.mentions, id=id)
-                return f'@{m.display_name}' if m else '@deleted-user'
-
-            def resolve_role(id: int) -> str:
-                return '@deleted-role'
-
-            def resolve_channel(id: int) -> str:
-                return '#deleted-channel'
-
-        transforms = {
-            '@': resolve_member,
-            '@!': resolve_member,
-            '#': resolve_channel,
-            '@&': resolve_role,
-        }
-
-        def repl(match: re.Match) -> str:
-            type = match[1]
-            id = int(match[2])
-            transformed = transforms[type](id)
-            return transformed
+        # Looked up once rather than scanned for every mention
+        guild = self.guild
+        types = {token.type for token in tokens}
+        mentions = {m.id: m for m in self.mentions} if 'user' in types else {}
+        role_mentions = {r.id: r for r in self.role_mentions} if guild and 'role' in types else {}
+
+        parts = []
+        last = 0
+        for token in tokens:
+            id = token.id
+            if token.type == 'user':
+                m = (guild and guild.get_member(id)) or mentions.get(id)  # type: ignore
+                transformed = f'@{m.display_name}' if m else '@deleted-user'
+            elif token.type == 'role':
+                r = guild and (guild.get_role(id) or role_mentions.get(id))  # type: ignore
+                transformed = f'@{r.name}' if r else '@deleted-role'
+            else:
+                c = guild and guild._resolve_channel(id)  # type: ignore
+                transformed = f'#{c.name}' if c else '#deleted-channel'
 
-        result = re.sub(r'<(@[!&]?|#)([0-9]{15,20})>', repl, self.content)
+            parts.append(content[last : token.start])
+            parts.append(transformed)
+            last = token.end
 
-        return escape_mentions(result)
+        parts.append(content[last:])
+        return escape_mentions(''.join(parts))
 
     @property
     def created_at(self) -> datetime.datetime:
@@ -273,10 +273,12 @@ class PartialEmoji(_EmojiTag, AssetMixin):
         :class:`bytes`
             The content of the asset.
         """
+        return await super().read()
+
+    def _check_readable(self) -> None:
         if self.is_unicode_emoji():
             raise ValueError('PartialEmoji is not a custom emoji')
-
-        return await super().read()
+        super()._check_readable()
 
     async def fetch_guild(self) -> Guild:
         """|coro|
@@ -23,8 +23,9 @@ DEALINGS IN THE SOFTWARE.
 """
 
 from __future__ import annotations
-from typing import TYPE_CHECKING, AsyncIterator, Union, Optional
+from typing import TYPE_CHECKING, AsyncGenerator, AsyncIterator, List, Union, Optional
 
+from . import utils
 from .user import User
 from .object import Object
 
@@ -37,6 +38,7 @@ __all__ = (
 if TYPE_CHECKING:
     from .member import Member
     from .types.message import Reaction as ReactionPayload
+    from .types.user import User as UserPayload
     from .message import Message
     from .partial_emoji import PartialEmoji
     from .emoji import Emoji
@@ -166,7 +168,7 @@ class Reaction:
         await self.message.clear_reaction(self.emoji)
 
     async def users(
-        self, *, limit: Optional[int] = None, after: Optional[Snowflake] = None
+        self, *, limit: Optional[int] = None, after: Optional[Snowflake] = None, prefetch: int = 0
     ) -> AsyncIterator[Union[Member, User]]:
         """Returns an :term:`asynchronous iterator` representing the users that have reacted to the message.
 
@@ -201,6 +203,11 @@ class Reaction:
             reacted to the message.
         after: Optional[:class:`abc.Snowflake`]
             For pagination, reactions are sorted by member.
+        prefetch: :class:`int`
+            The number of pages of up to 100 users to fetch ahead of the consumer.
+            At most 10 pages are buffered. Defaults to ``0``.
+
+            .. versionadded:: 2.1
 
         Raises
         --------
@@ -224,31 +231,39 @@ class Reaction:
         if limit is None:
             limit = self.count
 
-        while limit > 0:
-            retrieve = min(limit, 100)
+        message = self.message
+        guild = message.guild
+        state = message._state
 
-            message = self.message
-            guild = message.guild
-            state = message._state
-            after_id = after.id if after else None
+        async def _pages(limit: int, after: Optional[Snowflake]) -> AsyncGenerator[List[UserPayload], None]:
+            while limit > 0:
+                retrieve = min(limit, 100)
+                after_id = after.id if after else None
 
-            data = await state.http.get_reaction_users(message.channel.id, message.id, emoji, retrieve, after=after_id)
+                data = await state.http.get_reaction_users(message.channel.id, message.id, emoji, retrieve, after=after_id)
 
-            if data:
-                limit -= len(data)
-                after = Object(id=int(data[-1]['id']))
-            else:
-                # Terminate loop if we received no data
-                limit = 0
+                if data:
+                    limit -= len(data)
+                    after = Object(id=int(data[-1]['id']))
+                else:
+                    # Terminate loop if we received no data
+                    limit = 0
 
-            if guild is None or isinstance(guild, Object):
-                for raw_user in reversed(data):
-                    yield User(state=state, data=raw_user)
+                yield data
 
-                continue
+        pages = utils._prefetch(_pages(limit, after), prefetch)
+        try:
+            async for data in pages:
+                if guild is None or isinstance(guild, Object):
+                    for raw_user in reversed(data):
+                        yield User(state=state, data=raw_user)
 
-            for raw_user in reversed(data):
-                member_id = int(raw_user['id'])
-                member = guild.get_member(member_id)
+                    continue
+
+                for raw_user in reversed(data):
+                    member_id = int(raw_user['id'])
+                    member = guild.get_member(member_id)
 
-                yield member or User(state=state, data=raw_user)
+                    yield member or User(state=state, data=raw_user)
+        finally:
+            await pages.aclose()
@@ -46,9 +46,11 @@ from typing import (
     overload,
     Sequence,
     Set,
+    Iterator,
 )
 import weakref
 import inspect
+import zlib
 from math import ceil
 
 from discord_protos import UserSettingsType
@@ -143,6 +145,10 @@ if TYPE_CHECKING:
 MISSING = utils.MISSING
 _log = logging.getLogger(__name__)
 
+# How long answers from the gateway to member queries are reused for, and how many are kept
+_MEMBER_QUERY_TTL = 30.0
+_MAX_MEMBER_QUERIES = 1000
+
 
 class ChunkRequest:
     __slots__ = (
@@ -329,11 +335,13 @@ class MemberSidebar:
         guild = self.guild
         ret = set()
 
+        # Without our own member, fall back to what everyone can see
+        me = guild.me
+        viewer = guild.default_role if me is None else me
         channels = [
             channel
-            for channel in self.guild.channels
+            for channel in guild.visible_channels_for(viewer)
             if channel.permissions_for(guild.default_role).read_messages  # "everyone" id
-            and channel.permissions_for(guild.me).read_messages  # type: ignore
         ]
         if guild.rules_channel is not None:  # micro-optimization
             channels.insert(0, guild.rules_channel)
@@ -927,6 +935,116 @@ class FakeClientPresence(Presence):
         return getattr(self._state.current_session, 'activities', ())
 
 
+# Seeds the compressor with the keys every message payload repeats,
+# which is where most of the savings on a payload this small come from
+# fmt: off
+_MESSAGE_ZDICT = b''.join(
+    b'"%s":' % key.encode()
+    for key in (
+        'id', 'channel_id', 'guild_id', 'type', 'content', 'author', 'username', 'discriminator', 'global_name',
+        'avatar', 'avatar_decoration_data', 'public_flags', 'bot', 'member', 'roles', 'joined_at', 'nick', 'deaf',
+        'mute', 'premium_since', 'pending', 'communication_disabled_until', 'attachments', 'embeds', 'mentions',
+        'mention_roles', 'mention_everyone', 'reactions', 'emoji', 'count', 'me', 'pinned', 'tts', 'timestamp',
+        'edited_timestamp', 'flags', 'components', 'nonce', 'referenced_message', 'message_reference', 'sticker_items',
+    )
+) + b'nullfalsetrue+00:00'
+# fmt: on
+
+
+class CompactMessage:
+    __slots__ = ('id', 'channel_id', 'guild_id', 'author_id', 'flags', 'content', 'extras')
+
+    def __init__(self, message: Message, data: MessagePayload) -> None:
+        self.id: int = message.id
+        self.channel_id: int = message.channel.id
+        self.guild_id: Optional[int] = message.guild.id if message.guild is not None else None
+        self.author_id: int = message.author.id
+        self.flags: int = message.flags.value
+        self.content: str = message.content
+
+        # Everything else is only needed to rebuild the message
+        extras = {key: value for key, value in data.items() if key != 'content'}
+        compressor = zlib.compressobj(1, zdict=_MESSAGE_ZDICT)
+        self.extras: bytes = compressor.compress(utils._to_json(extras).encode('utf-8')) + compressor.flush()
+
+    def __repr__(self) -> str:
+        return f'<CompactMessage id={self.id} channel_id={self.channel_id} author_id={self.author_id}>'
+
+    def to_message(self, state: ConnectionState) -> Message:
+        decompressor = zlib.decompressobj(zdict=_MESSAGE_ZDICT)
+        data = utils._from_json(decompressor.decompress(self.extras) + decompressor.flush())
+        data['content'] = self.content
+        channel, _ = state._get_guild_channel(data, self.guild_id)
+        return Message(state=state, channel=channel, data=data, lazy=True)  # type: ignore
+
+
+class CompactMessageCache:
+    """A message cache that keeps lazily decoded messages as :class:`CompactMessage`
+    records, which are rehydrated into full messages when looked up.
+
+    A rehydrated message replaces its record, so that updates to it are kept.
+    Iterating the cache yields copies for records instead, so that a full
+    scan doesn't expand the whole cache.
+    """
+
+    __slots__ = ('state', 'maxlen', '_entries')
+
+    def __init__(self, state: ConnectionState, maxlen: int) -> None:
+        self.state: ConnectionState = state
+        self.maxlen: int = maxlen
+        self._entries: OrderedDict[int, Union[Message, CompactMessage]] = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f'<CompactMessageCache maxlen={self.maxlen} len={len(self._entries)}>'
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, message: object) -> bool:
+        return isinstance(message, Message) and message.id in self._entries
+
+    def __iter__(self) -> Iterator[Message]:
+        state = self.state
+        for entry in list(self._entries.values()):
+            yield entry.to_message(state) if isinstance(entry, CompactMessage) else entry
+
+    def __reversed__(self) -> Iterator[Message]:
+        state = self.state
+        for entry in list(reversed(self._entries.values())):
+            yield entry.to_message(state) if isinstance(entry, CompactMessage) else entry
+
+    def append(self, message: Message) -> None:
+        data = message._lazy_data
+        entries = self._entries
+        entries[message.id] = message if data is None else CompactMessage(message, data)
+        if len(entries) > self.maxlen:
+            entries.popitem(last=False)
+
+    def remove(self, message: Message) -> None:
+        try:
+            del self._entries[message.id]
+        except KeyError:
+            raise ValueError('message not in cache') from None
+
+    def get(self, message_id: Optional[int]) -> Optional[Message]:
+        entry = self._entries.get(message_id)  # type: ignore
+        if isinstance(entry, CompactMessage):
+            entry = self._entries[entry.id] = entry.to_message(self.state)
+        return entry
+
+    def live(self) -> List[Message]:
+        return [entry for entry in self._entries.values() if not isinstance(entry, CompactMessage)]
+
+    def remove_guild(self, guild_id: int) -> None:
+        entries = self._entries
+        for message_id, entry in list(entries.items()):
+            if isinstance(entry, CompactMessage):
+                if entry.guild_id == guild_id:
+                    del entries[message_id]
+            elif entry.guild is not None and entry.guild.id == guild_id:
+                del entries[message_id]
+
+
 async def logging_coroutine(coroutine: Coroutine[Any, Any, T], *, info: str) -> Optional[T]:
     try:
         await coroutine
@@ -952,6 +1070,8 @@ class ConnectionState:
         self.max_messages: Optional[int] = options.get('max_messages', 1000)
         if self.max_messages is not None and self.max_messages <= 0:
             self.max_messages = 1000
+        self.compact_message_cache: bool = options.get('compact_message_cache', False)
+        self.lazy_messages: bool = options.get('lazy_messages', False) or self.compact_message_cache
 
         self.dispatch: Callable[..., Any] = dispatch
         self.handlers: Dict[str, Callable[..., Any]] = handlers
@@ -1065,13 +1185,16 @@ class ConnectionState:
         self._private_channels_by_user: Dict[int, DMChannel] = {}
 
         self._guild_presences: Dict[int, Dict[int, Presence]] = {}
+        self._member_queries: OrderedDict[Tuple[Any, ...], Tuple[float, List[Member]]] = OrderedDict()
         self._presences: Dict[int, Presence] = {}
         self._sessions: Dict[str, Session] = {}
 
-        if self.max_messages is not None:
-            self._messages: Optional[Deque[Message]] = deque(maxlen=self.max_messages)
+        if self.max_messages is None:
+            self._messages: Optional[Union[Deque[Message], CompactMessageCache]] = None
+        elif self.compact_message_cache:
+            self._messages = CompactMessageCache(self, self.max_messages)
         else:
-            self._messages: Optional[Deque[Message]] = None
+            self._messages = deque(maxlen=self.max_messages)
 
         self.experiments: Dict[int, UserExperiment] = {}
         self.guild_experiments: Dict[int, GuildExperiment] = {}
@@ -1310,6 +1433,8 @@ class ConnectionState:
                 self._private_channels_by_user.pop(recipient.id, None)
 
     def _get_message(self, msg_id: Optional[int]) -> Optional[Message]:
+        if isinstance(self._messages, CompactMessageCache) and self._messages:
+            return self._messages.get(msg_id)
         return (
             utils.find(lambda m: m.id == msg_id, reversed(self._messages))
             if self._messages
@@ -1390,6 +1515,38 @@ class ConnectionState:
         presences: bool,
     ) -> List[Member]:
         guild_id = guild.id
+        found: List[Member] = []
+        key: Optional[Tuple[Any, ...]]
+        if presences:
+            # Presences are only sent by the gateway, so these queries always go through to it
+            key = None
+        elif user_ids:
+            # Only the members that aren't cached need to be requested
+            members = guild._members
+            found = [members[id] for id in user_ids if id in members]  # type: ignore # IDs are passed here
+            user_ids = [id for id in user_ids if id not in members]  # type: ignore
+            if not user_ids:
+                return found
+            key = (guild_id, tuple(user_ids))
+        else:
+            # The cache is complete, or already holds as many as the gateway would send back
+            found = guild.search_members(query or '', limit=limit, substring=False)
+            if len(found) >= limit or guild.chunked:
+                return found
+            key = (guild_id, (query or '').casefold(), limit)
+
+        now = self.loop.time()
+        queries = self._member_queries
+        if key is not None:
+            try:
+                expires, members = queries[key]
+            except KeyError:
+                pass
+            else:
+                if expires > now:
+                    return found + members if user_ids else members
+                del queries[key]
+
         request = ChunkRequest(guild.id, self.loop, self._get_guild, cache=cache)
         self._chunk_requests[request.nonce] = request
 
@@ -1397,11 +1554,19 @@ class ConnectionState:
             await self.chunker(
                 [guild_id], query=query, limit=limit, presences=presences, user_ids=user_ids, nonce=request.nonce
             )
-            return await asyncio.wait_for(request.wait(), timeout=30.0)
+            members = await asyncio.wait_for(request.wait(), timeout=30.0)
         except asyncio.TimeoutError:
             _log.warning('Timed out waiting for chunks with query %r and limit %d for guild ID %d.', query, limit, guild_id)
             raise
 
+        # Misses are remembered too, so repeated lookups of someone who isn't there don't hit the gateway.
+        # Uncached results aren't, as their members would otherwise outlive the request
+        if key is not None and cache:
+            if len(queries) >= _MAX_MEMBER_QUERIES:
+                queries.popitem(last=False)
+            queries[key] = (now + _MEMBER_QUERY_TTL, members)
+        return found + members if user_ids else members
+
     async def search_recent_members(
         self,
         guild: Guild,
@@ -1666,7 +1831,7 @@ class ConnectionState:
         channel, _ = self._get_guild_channel(data)
 
         # channel will be the correct type here
-        message = Message(channel=channel, data=data, state=self)  # type: ignore
+        message = Message(channel=channel, data=data, state=self, lazy=self.lazy_messages)  # type: ignore
         self.dispatch('message', message)
         if self._messages is not None:
             self._messages.append(message)
@@ -1698,7 +1863,9 @@ class ConnectionState:
 
     def parse_message_delete_bulk(self, data: gw.MessageDeleteBulkEvent) -> None:
         raw = RawBulkMessageDeleteEvent(data)
-        if self._messages:
+        if isinstance(self._messages, CompactMessageCache):
+            found_messages = [message for message in map(self._messages.get, raw.message_ids) if message is not None]
+        elif self._messages:
             found_messages = [message for message in self._messages if message.id in raw.message_ids]
         else:
             found_messages = []
@@ -1871,6 +2038,7 @@ class ConnectionState:
                 self.dispatch('presence_update', old_member, member)
 
         if user_update:
+            self._reindex_member_names(user_id)
             self.dispatch('user_update', user_update[0], user_update[1])
 
     def parse_presence_update(self, data: gw.PresenceUpdateEvent) -> None:
@@ -1887,6 +2055,14 @@ class ConnectionState:
         self.http.ack_token = None
         if self.user:
             self.user._full_update(data)
+            self._reindex_member_names(self.user.id)
+
+    def _reindex_member_names(self, user_id: int) -> None:
+        # A user's names are shared by their members in every guild
+        for guild in self._guilds.values():
+            member = guild._members.get(user_id)
+            if member is not None:
+                guild._member_names.add(member)
 
     def parse_user_note_update(self, data: gw.UserNoteUpdateEvent) -> None:
         # The gateway does not provide note objects on READY with our default capabilities
@@ -2156,6 +2332,7 @@ class ConnectionState:
             if channel is not None:
                 old_channel = copy.copy(channel)
                 channel._update(guild, data)  # type: ignore # the data payload varies based on the channel type
+                guild._invalidate_channels()
                 self.dispatch('guild_channel_update', old_channel, channel)
             else:
                 _log.debug('CHANNEL_UPDATE referencing an unknown channel ID: %s. Discarding.', channel_id)
@@ -2355,7 +2532,7 @@ class ConnectionState:
             channel, _ = self._get_guild_channel(message)
 
             # channel will be the correct type here
-            message = Message(channel=channel, data=message, state=self)  # type: ignore
+            message = Message(channel=channel, data=message, state=self, lazy=self.lazy_messages)  # type: ignore
             if self._messages is not None:
                 self._messages.append(message)
 
@@ -2507,7 +2684,10 @@ class ConnectionState:
             # Force an update on the inner user if necessary
             user_update = member._user._update_self(user)
             if user_update:
+                self._reindex_member_names(user_id)
                 self.dispatch('user_update', user_update[0], user_update[1])
+            else:
+                guild._member_names.add(member)
 
     def parse_guild_member_update(self, data: gw.GuildMemberUpdateEvent) -> None:
         guild = self._get_guild(int(data['guild_id']))
@@ -3011,10 +3191,10 @@ class ConnectionState:
             return
 
         # Cleanup the message cache
-        if self._messages is not None:
-            self._messages: Optional[Deque[Message]] = deque(
-                (msg for msg in self._messages if msg.guild != guild), maxlen=self.max_messages
-            )
+        if isinstance(self._messages, CompactMessageCache):
+            self._messages.remove_guild(guild.id)
+        elif self._messages is not None:
+            self._messages = deque((msg for msg in self._messages if msg.guild != guild), maxlen=self.max_messages)
 
         self._remove_guild(guild)
         self.dispatch('guild_remove', guild)
@@ -3087,6 +3267,9 @@ class ConnectionState:
             if role is not None:
                 old_role = copy.copy(role)
                 role._update(role_data)
+                guild._invalidate_permissions()
+                if role.position != old_role.position:
+                    guild._move_role(role)
                 self.dispatch('guild_role_update', old_role, role)
         else:
             _log.debug('GUILD_ROLE_UPDATE referencing an unknown guild ID: %s. Discarding.', data['guild_id'])
@@ -3524,11 +3707,13 @@ class ConnectionState:
         data: MessagePayload,
         search_result: Optional[MessageSearchResultPayload] = None,
     ) -> Message:
-        return Message(state=self, channel=channel, data=data, search_result=search_result)
+        return Message(state=self, channel=channel, data=data, search_result=search_result, lazy=self.lazy_messages)
 
     def _update_message_references(self) -> None:
         # self._messages won't be None when this is called
-        for msg in self._messages:  # type: ignore
+        # Compact records resolve their guild and channel when rehydrated
+        messages = self._messages.live() if isinstance(self._messages, CompactMessageCache) else self._messages
+        for msg in messages:  # type: ignore
             if not msg.guild:
                 continue
 
@@ -159,9 +159,12 @@ class _StickerTag(Hashable, AssetMixin):
         :class:`bytes`
             The content of the asset.
         """
+        return await super().read()
+
+    def _check_readable(self) -> None:
         if self.format is StickerFormatType.lottie:
             raise TypeError('Cannot read stickers of format "lottie"')
-        return await super().read()
+        super()._check_readable()
 
 
 class StickerItem(_StickerTag):
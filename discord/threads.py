@@ -24,7 +24,7 @@ DEALINGS IN THE SOFTWARE.
 
 from __future__ import annotations
 
-from typing import Callable, Dict, Iterable, List, Literal, Optional, Sequence, Union, TYPE_CHECKING
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Sequence, Union, TYPE_CHECKING
 import asyncio
 import array
 import copy
@@ -570,6 +570,8 @@ class Thread(Messageable, Hashable):
         around: Optional[SnowflakeTime] = None,
         oldest_first: Optional[bool] = None,
         reason: Optional[str] = None,
+        return_messages: bool = True,
+        progress: Optional[Callable[[Message], Any]] = None,
     ) -> List[Message]:
         """|coro|
 
@@ -609,6 +611,15 @@ class Thread(Messageable, Hashable):
             Same as ``oldest_first`` in :meth:`history`.
         reason: Optional[:class:`str`]
             The reason for purging the messages. Shows up on the audit log.
+        return_messages: :class:`bool`
+            Whether to collect and return the deleted messages. Disable this for large
+            purges to avoid holding every message in memory.
+
+            .. versionadded:: 2.1
+        progress: Optional[Callable[[:class:`Message`], Any]]
+            A function called with each message once it has been deleted.
+
+            .. versionadded:: 2.1
 
         Raises
         -------
@@ -620,7 +631,7 @@ class Thread(Messageable, Hashable):
         Returns
         --------
         List[:class:`.Message`]
-            The list of messages that were deleted.
+            The list of messages that were deleted. Empty if ``return_messages`` is ``False``.
         """
         return await _purge_helper(
             self,
@@ -631,6 +642,8 @@ class Thread(Messageable, Hashable):
             around=around,
             oldest_first=oldest_first,
             reason=reason,
+            return_messages=return_messages,
+            progress=progress,
         )
 
     async def edit(
@@ -27,6 +27,7 @@ import array
 import asyncio
 from typing import (
     Any,
+    AsyncGenerator,
     AsyncIterable,
     AsyncIterator,
     Awaitable,
@@ -57,7 +58,7 @@ from typing import (
 import collections
 import unicodedata
 from base64 import b64encode, b64decode
-from bisect import bisect_left
+from bisect import bisect_left, bisect_right
 import datetime
 import functools
 from inspect import isawaitable as _isawaitable, signature as _signature
@@ -71,6 +72,7 @@ import re
 import string
 import sys
 from threading import Timer
+import time
 import types
 import warnings
 
@@ -97,6 +99,7 @@ __all__ = (
     'remove_markdown',
     'escape_markdown',
     'escape_mentions',
+    'tokenize_content',
     'maybe_coroutine',
     'as_chunks',
     'format_dt',
@@ -1029,7 +1032,71 @@ _URL_REGEX = r'(?P<url><[^: >]+:\/[^ >]+>|(?:https?|steam):\/\/[^\s<]+[^<.,:;\"\
 _MARKDOWN_STOCK_REGEX = fr'(?P<markdown>[_\\~|\*`#-]|{_MARKDOWN_ESCAPE_COMMON})'
 
 
-def remove_markdown(text: str, *, ignore_links: bool = True) -> str:
+_CONTENT_TOKEN_REGEX = re.compile(
+    r'<(?P<mention>@[!&]?|#)(?P<id>[0-9]{15,20})>'
+    r'|<(?P<animated>a?):(?P<name>[A-Za-z0-9_]{2,32}):(?P<emoji_id>[0-9]{15,20})>'
+    r'|<t:(?P<timestamp>-?[0-9]{1,17})(?::(?P<style>[tTdDfFR]))?>'
+    r'|@(?P<everyone>everyone|here)'
+)
+
+_MENTION_TOKEN_TYPES: Dict[str, Literal['user', 'role', 'channel']] = {
+    '@': 'user',
+    '@!': 'user',
+    '@&': 'role',
+    '#': 'channel',
+}
+
+
+class ContentToken(NamedTuple):
+    type: Literal['user', 'role', 'channel', 'emoji', 'timestamp', 'everyone', 'here']
+    start: int
+    end: int
+    id: Optional[int] = None
+    name: Optional[str] = None
+    animated: bool = False
+
+
+def tokenize_content(text: str) -> List[ContentToken]:
+    """A helper function that extracts every mention, custom emoji and
+    timestamp in the text in a single pass.
+
+    :attr:`Message.tokens` caches this for a message's content.
+
+    .. versionadded:: 2.1
+
+    Parameters
+    -----------
+    text: :class:`str`
+        The text to tokenize.
+
+    Returns
+    --------
+    List[:class:`.ContentToken`]
+        The tokens, in the order they appear in the text.
+    """
+    tokens = []
+    for match in _CONTENT_TOKEN_REGEX.finditer(text):
+        start, end = match.span()
+        mention, id, name, everyone, timestamp = match.group('mention', 'id', 'name', 'everyone', 'timestamp')
+        if mention is not None:
+            token = ContentToken(_MENTION_TOKEN_TYPES[mention], start, end, int(id))
+        elif name is not None:
+            token = ContentToken('emoji', start, end, int(match['emoji_id']), name, bool(match['animated']))
+        elif timestamp is not None:
+            token = ContentToken('timestamp', start, end, int(timestamp), match['style'])
+        else:
+            token = ContentToken(everyone, start, end)  # type: ignore # Always 'everyone' or 'here'
+        tokens.append(token)
+    return tokens
+
+
+def _in_tokens(tokens: Sequence[ContentToken], starts: Sequence[int], index: int) -> bool:
+    # The tokens are ordered and never overlap, so only the closest one can contain the index
+    position = bisect_right(starts, index) - 1
+    return position >= 0 and index < tokens[position].end
+
+
+def remove_markdown(text: str, *, ignore_links: bool = True, tokens: Optional[Sequence[ContentToken]] = None) -> str:
     """A helper function that removes markdown characters.
 
     .. versionadded:: 1.7
@@ -1046,6 +1113,12 @@ def remove_markdown(text: str, *, ignore_links: bool = True) -> str:
         Whether to leave links alone when removing markdown. For example,
         if a URL in the text contains characters such as ``_`` then it will
         be left alone. Defaults to ``True``.
+    tokens: Optional[Sequence[:class:`.ContentToken`]]
+        The tokens of the text, as returned by :func:`tokenize_content`. If given,
+        mentions, custom emojis and timestamps are left alone, so that e.g. an emoji
+        named ``:big_smile:`` keeps its underscore.
+
+        .. versionadded:: 2.1
 
     Returns
     --------
@@ -1053,9 +1126,19 @@ def remove_markdown(text: str, *, ignore_links: bool = True) -> str:
         The text with the markdown special characters removed.
     """
 
-    def replacement(match):
-        groupdict = match.groupdict()
-        return groupdict.get('url', '')
+    if tokens:
+        starts = [token.start for token in tokens]
+
+        def replacement(match):
+            if _in_tokens(tokens, starts, match.start()):
+                return match[0]
+            return match.groupdict().get('url', '')
+
+    else:
+
+        def replacement(match):
+            groupdict = match.groupdict()
+            return groupdict.get('url', '')
 
     regex = _MARKDOWN_STOCK_REGEX
     if ignore_links:
@@ -1106,7 +1189,7 @@ def escape_markdown(text: str, *, as_needed: bool = False, ignore_links: bool =
         return _MARKDOWN_ESCAPE_REGEX.sub(r'\\\1', text)
 
 
-def escape_mentions(text: str) -> str:
+def escape_mentions(text: str, *, tokens: Optional[Sequence[ContentToken]] = None) -> str:
     """A helper function that escapes everyone, here, role, and user mentions.
 
     .. note::
@@ -1123,13 +1206,32 @@ def escape_mentions(text: str) -> str:
     -----------
     text: :class:`str`
         The text to escape mentions from.
+    tokens: Optional[Sequence[:class:`.ContentToken`]]
+        The tokens of the text, as returned by :func:`tokenize_content`. If given, the
+        mentions among them are escaped without searching the text again. Note that
+        this does not escape user IDs prefixed with ``@`` outside of a mention.
+
+        .. versionadded:: 2.1
 
     Returns
     --------
     :class:`str`
         The text with the mentions removed.
     """
-    return re.sub(r'@(everyone|here|[!&]?[0-9]{17,20})', '@\u200b\\1', text)
+    if tokens is None:
+        return re.sub(r'@(everyone|here|[!&]?[0-9]{17,20})', '@\u200b\\1', text)
+
+    parts = []
+    last = 0
+    for token in tokens:
+        if token.type in ('user', 'role', 'everyone', 'here'):
+            # Mentions are either <@...> or @everyone/@here, so the @ is right after the start
+            at = text.index('@', token.start) + 1
+            parts.append(text[last:at])
+            parts.append('\u200b')
+            last = at
+    parts.append(text[last:])
+    return ''.join(parts)
 
 
 def _chunk(iterator: Iterable[T], max_size: int) -> Iterator[List[T]]:
@@ -1160,6 +1262,48 @@ async def _achunk(iterator: AsyncIterable[T], max_size: int) -> AsyncIterator[Li
         yield ret
 
 
+# Every paginated endpoint returns at most 100 items a page,
+# so this bounds a prefetching iterator to ~1000 buffered payloads
+_MAX_PREFETCH_PAGES = 10
+
+
+async def _prefetch(pages: AsyncGenerator[T, None], prefetch: int) -> AsyncGenerator[T, None]:
+    # Drives a page iterator from a background task, keeping up to `prefetch` pages
+    # buffered ahead of the consumer so network round trips overlap with processing.
+    # Callers must aclose() this to stop the background task early.
+    prefetch = min(prefetch, _MAX_PREFETCH_PAGES)
+    if prefetch <= 0:
+        async for page in pages:
+            yield page
+        return
+
+    queue: asyncio.Queue[Tuple[bool, Any]] = asyncio.Queue(maxsize=prefetch)
+
+    async def producer() -> None:
+        try:
+            async for page in pages:
+                await queue.put((True, page))
+        except Exception as exc:
+            await queue.put((False, exc))
+        else:
+            await queue.put((False, None))
+        finally:
+            await pages.aclose()
+
+    task = asyncio.create_task(producer())
+    try:
+        while True:
+            ok, item = await queue.get()
+            if ok:
+                yield item
+            elif item is None:
+                return
+            else:
+                raise item
+    finally:
+        task.cancel()
+
+
 @overload
 def as_chunks(iterator: AsyncIterable[T], max_size: int) -> AsyncIterator[List[T]]:
     ...
@@ -1452,7 +1596,8 @@ _CLIENT_ASSET_REGEX = re.compile(r'assets/([a-z0-9.]+)\.js')
 _BUILD_NUMBER_REGEX = re.compile(r'build_number:"(\d+)"')
 
 
-async def _get_info(session: ClientSession) -> Tuple[Dict[str, Any], str]:
+async def _get_info(session: ClientSession) -> Tuple[Dict[str, Any], str, bool]:
+    # Also returns whether the real values were retrieved, rather than the hardcoded fallbacks
     # try:
     #     async with session.post('https://cordapi.dolfi.es/api/v2/properties/web', timeout=5) as resp:
     #         json = await resp.json()
@@ -1471,7 +1616,15 @@ async def _get_info(session: ClientSession) -> Tuple[Dict[str, Any], str]:
     except Exception:
         _log.critical('Could not retrieve browser version. Falling back to hardcoded value...')
         bv = FALLBACK_BROWSER_VERSION
+        fetched = False
+    else:
+        fetched = True
 
+    properties, encoded = _build_info(bv, bn)
+    return properties, encoded, fetched
+
+
+def _build_info(bv: str, bn: int) -> Tuple[Dict[str, Any], str]:
     properties = {
         'os': 'Windows',
         'browser': 'Chrome',
@@ -1489,7 +1642,46 @@ async def _get_info(session: ClientSession) -> Tuple[Dict[str, Any], str]:
         'client_event_source': None,
         'design_id': 0,
     }
-    return properties, b64encode(_to_json(properties).encode()).decode('utf-8')
+    return properties, _encode_info(properties)
+
+
+def _encode_info(properties: Dict[str, Any]) -> str:
+    return b64encode(_to_json(properties).encode()).decode('utf-8')
+
+
+def _default_info_cache_path() -> str:
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'discord.py-self', 'properties.json')
+
+
+def _read_cached_info(path: str) -> Optional[Tuple[Dict[str, Any], str, float]]:
+    """Reads cached super properties, returning them with their encoded form and when they were fetched."""
+    try:
+        with open(path, 'r', encoding='utf-8') as fp:
+            data = json.load(fp)
+        properties = data['properties']
+        # The HTTP client reads these directly, so a cache missing them is as good as no cache
+        if not isinstance(properties.get('browser_version'), str) or 'browser_user_agent' not in properties:
+            return None
+        return properties, data.get('encoded') or _encode_info(properties), float(data['fetched_at'])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _write_cached_info(path: str, properties: Dict[str, Any], encoded: str) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fp:
+            json.dump({'properties': properties, 'encoded': encoded, 'fetched_at': time.time()}, fp)
+        os.replace(tmp, path)
+    except OSError as exc:
+        _log.warning('Could not cache client properties to %s: %s', path, exc)
 
 
 async def _get_build_number(session: ClientSession) -> int:
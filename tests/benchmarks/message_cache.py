@@ -0,0 +1,86 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2021-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+Measures the memory a full message cache takes with whole messages against
+``compact_message_cache=True``, and the cost of looking messages up in each.
+
+Usage: python tests/benchmarks/message_cache.py [--messages N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import discord  # noqa: E402
+
+from message_parsing import _payload  # noqa: E402
+
+
+def bench(count: int, **options: bool) -> None:
+    client = discord.Client(max_messages=count, **options)
+    state = client._connection
+    state.dispatch = lambda *args: None
+    payloads = [_payload(id) for id in range(1000, 1000 + count)]
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for data in payloads:
+        state.parse_message_create(data)  # type: ignore
+    elapsed = time.perf_counter() - start
+    del payloads
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Look up the oldest messages, as edits and reactions to them would
+    start = time.perf_counter()
+    for id in range(1000, 1000 + min(count, 1000)):
+        state._get_message(id)
+    lookup = time.perf_counter() - start
+
+    name = 'compact' if options else 'messages'
+    print(
+        f'{name:<9} {count:>7} msgs  {size / 2**20:>8.1f} MiB  {size / count:>6.0f} B/msg  '
+        f'create {elapsed:>6.3f}s  1000 lookups {lookup * 1000:>7.1f}ms'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=50_000)
+    args = parser.parse_args()
+
+    bench(args.messages)
+    bench(args.messages, compact_message_cache=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2021-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+Compares fetching message history as parsed Message objects against the raw
+
+Measures MESSAGE_CREATE throughput through the gateway parser, comparing eagerly
+built messages against ``lazy_messages=True``. The listener only reads the content,
+author and channel, like most ``on_message`` handlers do; ``--touch`` also reads
+every lazily decoded attribute, showing the cost when nothing can be skipped.
+
+Usage: python tests/benchmarks/message_create.py [--messages N] [--touch]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import discord  # noqa: E402
+
+from message_parsing import _payload  # noqa: E402
+
+
+def _listener(touch: bool):
+    def on_message(message: discord.Message) -> None:
+        message.content, message.author, message.channel
+        if touch:
+            for attr in discord.Message._LAZY_DECODERS:
+                getattr(message, attr)
+
+    return on_message
+
+
+def bench(count: int, *, lazy: bool, touch: bool) -> float:
+    client = discord.Client(lazy_messages=lazy)
+    state = client._connection
+    listener = _listener(touch)
+    state.dispatch = lambda event, *args: listener(*args) if event == 'message' else None
+    payloads: List[Dict[str, Any]] = [_payload(id) for id in range(1000, 1000 + count)]
+
+    start = time.perf_counter()
+    for data in payloads:
+        state.parse_message_create(data)  # type: ignore
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=50_000)
+    parser.add_argument('--touch', action='store_true', help='access every lazily decoded attribute')
+    args = parser.parse_args()
+
+    baseline = bench(args.messages, lazy=False, touch=args.touch)
+    for name, elapsed in (('eager', baseline), ('lazy', bench(args.messages, lazy=True, touch=args.touch))):
+        rate = args.messages / elapsed
+        print(f'{name:<8} {args.messages:>7} msgs  {elapsed:>7.3f}s  {rate:>10.0f} msg/s  {baseline / elapsed:>6.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2021-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+Compares fetching message history as parsed Message objects against the raw
+payload path (``raw=True``), both in isolation and end to end against the local
+fake server.
+
+Usage: python tests/benchmarks/message_parsing.py [--messages N] [--latency S]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import discord  # noqa: E402
+from discord.http import Route  # noqa: E402
+
+from fake_discord import FakeDiscord  # noqa: E402
+
+CHANNEL_ID = 5
+
+
+def _user(id: int) -> Dict[str, Any]:
+    return {'id': str(id), 'username': f'user{id}', 'discriminator': '0', 'global_name': None, 'avatar': None}
+
+
+def _payload(id: int) -> Dict[str, Any]:
+    # A moderately busy message, with the parts parsing has to resolve
+    return {
+        'id': str(id),
+        'channel_id': str(CHANNEL_ID),
+        'type': 0,
+        'content': f'hello <@{id % 7 + 1}> and <@{id % 5 + 1}>, see https://example.com/{id}',
+        'author': _user(id % 11 + 1),
+        'attachments': [],
+        'embeds': [{'type': 'link', 'url': f'https://example.com/{id}', 'title': 'Example', 'description': 'An example'}],
+        'mentions': [_user(id % 7 + 1), _user(id % 5 + 1)],
+        'mention_roles': [],
+        'reactions': [{'emoji': {'id': None, 'name': '\N{THUMBS UP SIGN}'}, 'count': 3, 'me': False}],
+        'pinned': False,
+        'mention_everyone': False,
+        'tts': False,
+        'timestamp': '2024-01-01T00:00:00+00:00',
+        'edited_timestamp': None,
+        'flags': 0,
+        'components': [],
+    }
+
+
+def _report(name: str, count: int, elapsed: float, baseline: float) -> None:
+    print(f'{name:<24} {count:>7} msgs  {elapsed:>7.3f}s  {count / elapsed:>10.0f} msg/s  {baseline / elapsed:>6.2f}x')
+
+
+def bench_parse(count: int) -> None:
+    state = discord.Client()._connection
+    channel = discord.PartialMessageable(state=state, id=CHANNEL_ID)
+    payloads: List[Dict[str, Any]] = [_payload(id) for id in range(1000, 1000 + count)]
+
+    start = time.perf_counter()
+    for data in payloads:
+        state.create_message(channel=channel, data=data)  # type: ignore
+    parsed = time.perf_counter() - start
+
+    # This is the per-message cost the raw path skips entirely
+    print(f'{"parse: Message":<24} {count:>7} msgs  {parsed:>7.3f}s  {parsed / count * 1e6:>8.1f} us/msg')
+
+
+async def bench_history(count: int, latency: float) -> None:
+    async with FakeDiscord(latency=latency, global_limit=10_000) as server:
+        Route.BASE = server.base
+        server.seed(CHANNEL_ID, range(1000, 1000 + count))
+        server.buckets['messages.read'].limit = 10_000
+        client = discord.Client()
+        client.http = client._connection.http = await server.client(global_ratelimit=None)
+        channel = discord.PartialMessageable(state=client._connection, id=CHANNEL_ID)
+        try:
+            start = time.perf_counter()
+            async for _ in channel.history(limit=None):
+                pass
+            parsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            async for _ in channel.history(limit=None, raw=True):
+                pass
+            raw = time.perf_counter() - start
+        finally:
+            await client.http.close()
+
+    _report('history: Message', count, parsed, parsed)
+    _report('history: raw', count, raw, parsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=20_000)
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated server latency in seconds')
+    args = parser.parse_args()
+
+    bench_parse(args.messages)
+    asyncio.run(bench_history(args.messages, args.latency))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2021-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+Compares auditing a channel's permissions member by member with
+:meth:`~discord.abc.GuildChannel.permissions_for` against resolving them all
+at once with :meth:`~discord.abc.GuildChannel.permissions_for_many`.
+
+Usage: python tests/benchmarks/permissions.py [--members N] [--roles N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import discord  # noqa: E402
+from discord.guild import Guild  # noqa: E402
+
+
+def _guild(members: int, roles: int) -> Guild:
+    rng = random.Random(0)
+    bits = [1 << bit for bit in range(47) if bit != 3]
+    role_data = [{'id': '100', 'name': '@everyone', 'permissions': str(1 << 10 | 1 << 11), 'position': 0}]
+    for id in range(200, 200 + roles):
+        role_data.append(
+            {'id': str(id), 'name': f'role{id}', 'permissions': str(sum(rng.sample(bits, 4))), 'position': id - 199}
+        )
+
+    overwrites = [
+        {'id': str(id), 'type': 0, 'allow': str(sum(rng.sample(bits, 3))), 'deny': str(sum(rng.sample(bits, 3)))}
+        for id in [100] + rng.sample(range(200, 200 + roles), min(roles, 10))
+    ]
+    channel = {'id': '300', 'type': 0, 'name': 'general', 'position': 0, 'permission_overwrites': overwrites}
+    member_data = []
+    for id in range(1000, 1000 + members):
+        user = {'id': str(id), 'username': f'user{id}', 'discriminator': '0', 'global_name': None, 'avatar': None}
+        member_roles = [str(role) for role in rng.sample(range(200, 200 + roles), rng.randint(0, 3))]
+        member_data.append({'user': user, 'roles': member_roles, 'joined_at': None, 'deaf': False, 'mute': False})
+
+    data = {'id': '100', 'name': 'guild', 'owner_id': '1', 'roles': role_data, 'channels': [channel], 'members': member_data}
+    state = discord.Client()._connection
+    guild = Guild(data=data, state=state)  # type: ignore
+    state._add_guild(guild)
+    return guild
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--members', type=int, default=100_000)
+    parser.add_argument('--roles', type=int, default=50)
+    args = parser.parse_args()
+
+    guild = _guild(args.members, args.roles)
+    channel = guild.channels[0]
+    members = list(guild.members)
+
+    start = time.perf_counter()
+    expected = [channel.permissions_for(member) for member in members]
+    looped = time.perf_counter() - start
+
+    # The first call also fills the per guild caches, so time a second one too
+    timings = []
+    for _ in range(2):
+        start = time.perf_counter()
+        result = channel.permissions_for_many(members)
+        timings.append(time.perf_counter() - start)
+    assert result == expected
+
+    print(f'{len(members)} members, {args.roles} roles (numpy: {discord.abc.HAS_NUMPY})')
+    print(f'permissions_for loop   {looped * 1000:>8.1f}ms')
+    print(f'permissions_for_many   {timings[0] * 1000:>8.1f}ms (warm {timings[1] * 1000:.1f}ms)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2021-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+Measures the REST throughput HTTPClient achieves against the local fake server,
+compared to the theoretical maximum the emulated buckets allow.
+
+Usage: python tests/benchmarks/rest_throughput.py [--requests N] [--channels N] [--latency S]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from fake_discord import Bucket, FakeDiscord  # noqa: E402
+
+WORKLOADS = {
+    'send': ('POST', '/channels/{channel_id}/messages', 'messages.write'),
+    'edit': ('PATCH', '/channels/{channel_id}/messages/{message_id}', 'messages.write'),
+    'delete': ('DELETE', '/channels/{channel_id}/messages/{message_id}', 'messages.delete'),
+}
+
+
+async def run(name: str, *, requests: int, channels: int, latency: float, limit: int, reset_after: float) -> None:
+    method, path, bucket = WORKLOADS[name]
+    buckets = {bucket: Bucket('b' * 32, limit=limit, reset_after=reset_after)}
+    routes = {f'{method} {path}': bucket}
+    async with FakeDiscord(buckets=buckets, routes=routes, latency=latency, global_limit=10_000) as server:
+        http = await server.client(global_ratelimit=None)
+        try:
+            routes_ = [
+                server.route(method, path, channel_id=index % channels + 1, message_id=index) for index in range(requests)
+            ]
+            start = time.perf_counter()
+            await asyncio.gather(*(http.request(route, json={'content': 'benchmark'}) for route in routes_))
+            elapsed = time.perf_counter() - start
+        finally:
+            await http.close()
+
+    # Every channel has its own window; the first window's requests are free, after that it's limit per reset_after
+    per_channel = requests / channels
+    windows = max(per_channel / limit - 1, 0)
+    theoretical = windows * reset_after
+    achieved = requests / elapsed
+    ideal = requests / theoretical if theoretical else float('inf')
+    print(
+        f'{name:<8} {requests:>6} reqs  {elapsed:>7.2f}s  {achieved:>8.1f} req/s  '
+        f'(theoretical {ideal:>8.1f} req/s, {achieved / ideal:>6.1%})  429s: {server.count(status=429)}'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--channels', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.01, help='simulated server latency in seconds')
+    parser.add_argument('--limit', type=int, default=5, help='requests per bucket window')
+    parser.add_argument('--reset-after', type=float, default=0.25, help='bucket window length in seconds')
+    parser.add_argument('workloads', nargs='*', help=f'any of {", ".join(WORKLOADS)} (defaults to all)')
+    args = parser.parse_args()
+    unknown = set(args.workloads) - set(WORKLOADS)
+    if unknown:
+        parser.error(f'unknown workloads: {", ".join(sorted(unknown))}')
+
+    for name in args.workloads or WORKLOADS:
+        asyncio.run(
+            run(
+                name,
+                requests=args.requests,
+                channels=args.channels,
+                latency=args.latency,
+                limit=args.limit,
+                reset_after=args.reset_after,
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,365 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2021-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+A local stand-in for the Discord REST API, used to exercise the rate limit handling
+in :class:`discord.http.HTTPClient` without talking to Discord.
+
+It serves a handful of common routes, emulates per-bucket X-RateLimit-* headers
+(with buckets shared across routes and keyed by major parameters), a global limit,
+and lets tests inject 429s, 5xxs, 202s and latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+from aiohttp import web
+
+from discord.http import HTTPClient, Route
+
+
+@dataclass
+class Bucket:
+    """A rate limit bucket shared by one or more routes."""
+
+    hash: str
+    limit: int = 5
+    reset_after: float = 1.0
+
+
+@dataclass
+class Fault:
+    """A response to return instead of the real one."""
+
+    status: int
+    retry_after: float = 0.0
+    is_global: bool = False
+    sub_ratelimit: bool = False
+
+
+@dataclass
+class _Window:
+    remaining: int
+    resets_at: float
+
+
+@dataclass
+class RequestLog:
+    method: str
+    route: str
+    path: str
+    status: int
+    at: float
+    query: Dict[str, str] = field(default_factory=dict)
+
+
+# Route key -> Default bucket name
+DEFAULT_ROUTES: Dict[str, str] = {
+    'GET /users/@me': 'users',
+    'GET /channels/{channel_id}': 'channels',
+    'GET /channels/{channel_id}/messages': 'messages.read',
+    # Registered before the message route so it isn't swallowed by it
+    'GET /channels/{channel_id}/messages/search': 'search',
+    'GET /guilds/{guild_id}/messages/search': 'search',
+    'GET /channels/{channel_id}/messages/{message_id}': 'messages.read',
+    'POST /channels/{channel_id}/messages': 'messages.write',
+    'PATCH /channels/{channel_id}/messages/{message_id}': 'messages.write',
+    'DELETE /channels/{channel_id}/messages/{message_id}': 'messages.delete',
+}
+
+MAJOR_PARAMETERS = ('channel_id', 'guild_id', 'webhook_id', 'webhook_token')
+
+
+class FakeDiscord:
+    """An aiohttp server emulating Discord's REST rate limits.
+
+    Usage: ::
+
+        async with FakeDiscord() as server:
+            http = await server.client()
+            await http.request(Route('GET', '/users/@me'))
+    """
+
+    def __init__(
+        self,
+        *,
+        buckets: Optional[Dict[str, Bucket]] = None,
+        routes: Optional[Dict[str, str]] = None,
+        global_limit: int = 50,
+        latency: float = 0.0,
+    ) -> None:
+        self.buckets: Dict[str, Bucket] = buckets or {
+            name: Bucket(hash=f'{index:032x}') for index, name in enumerate(sorted(set(DEFAULT_ROUTES.values())), 1)
+        }
+        self.routes: Dict[str, str] = dict(routes or DEFAULT_ROUTES)
+        self.global_limit: int = global_limit
+        self.latency: float = latency
+        self.log: List[RequestLog] = []
+        # Route key -> Faults to return, in order
+        self._faults: Dict[str, Deque[Fault]] = {}
+        # (Bucket hash, major parameters) -> Current window
+        self._windows: Dict[Tuple[str, str], _Window] = {}
+        self._global: Deque[float] = deque()
+        self._ids = itertools.count(1_000_000_000_000_000_000)
+        # Channel ID -> Seeded message IDs, sorted ascending
+        self._history: Dict[str, List[int]] = {}
+        self._runner: Optional[web.AppRunner] = None
+        self.base: str = ''
+
+    # Setup
+
+    async def start(self) -> None:
+        app = web.Application()
+        for key in self.routes:
+            method, path = key.split(' ', 1)
+            app.router.add_route(method, '/api/v9' + path, self._handle(key))
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # type: ignore
+        self.base = f'http://127.0.0.1:{port}/api/v9'
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def __aenter__(self) -> FakeDiscord:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    async def client(self, **kwargs: Any) -> HTTPClient:
+        """Returns an :class:`HTTPClient` pointed at this server.
+
+        The client skips the usual startup, which would fetch build info from the network.
+        """
+        http = HTTPClient(**kwargs)
+        http._global_over = asyncio.Event()
+        http._global_over.set()
+        if http.global_ratelimit:
+            from discord.http import GlobalRatelimit
+
+            http._global_bucket = GlobalRatelimit(http.global_ratelimit)
+        http._HTTPClient__session = session = aiohttp.ClientSession()  # type: ignore # Name mangled
+        http.connector = session.connector  # type: ignore
+        http._set_super_properties({'browser_version': '120.0.0.0', 'browser_user_agent': 'FakeDiscord'}, 'e30=')
+        http._started = True
+        http.token = 'fake'
+        return http
+
+    def route(self, method: str, path: str, **parameters: Any) -> Route:
+        """Creates a :class:`Route` that points at this server."""
+        route = Route(method, path, **parameters)
+        route.url = route.url.replace(Route.BASE, self.base, 1)
+        return route
+
+    # Test controls
+
+    def inject(self, route_key: str, *faults: Fault) -> None:
+        """Queues faults to be returned by the next requests to a route."""
+        self._faults.setdefault(route_key, deque()).extend(faults)
+
+    def rebucket(self, name: str, hash: str) -> None:
+        """Changes the hash Discord reports for a bucket, as happens when limits change."""
+        self.buckets[name].hash = hash
+
+    def seed(self, channel_id: int, message_ids: Iterable[int]) -> None:
+        """Gives a channel a fixed message history, which is paginated like Discord's."""
+        self._history[str(channel_id)] = sorted(message_ids)
+
+    def count(self, *, status: Optional[int] = None, route: Optional[str] = None) -> int:
+        return sum(
+            1 for entry in self.log if (status is None or entry.status == status) and (route is None or entry.route == route)
+        )
+
+    # Handling
+
+    def _handle(self, route_key: str):
+        async def handler(request: web.Request) -> web.StreamResponse:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            response = self._respond(route_key, request)
+            self.log.append(
+                RequestLog(request.method, route_key, request.path, response.status, time.monotonic(), dict(request.query))
+            )
+            return response
+
+        return handler
+
+    def _json(self, data: Any, *, status: int = 200, headers: Optional[Dict[str, str]] = None) -> web.Response:
+        headers = dict(headers or {})
+        # The library only decodes JSON when the content type is exactly this
+        headers['Content-Type'] = 'application/json'
+        headers['Via'] = '1.1 google'
+        return web.Response(body=json.dumps(data).encode(), status=status, headers=headers)
+
+    def _respond(self, route_key: str, request: web.Request) -> web.Response:
+        now = time.monotonic()
+        bucket = self.buckets[self.routes[route_key]]
+        major = '+'.join(request.match_info[p] for p in MAJOR_PARAMETERS if p in request.match_info)
+
+        # Global limit, a sliding one second window
+        while self._global and now - self._global[0] >= 1.0:
+            self._global.popleft()
+        if len(self._global) >= self.global_limit:
+            retry_after = 1.0 - (now - self._global[0])
+            return self._json(
+                {'message': 'You are being rate limited.', 'retry_after': retry_after, 'global': True},
+                status=429,
+                headers={'X-RateLimit-Global': 'true', 'X-RateLimit-Scope': 'global'},
+            )
+        self._global.append(now)
+
+        window = self._windows.get((bucket.hash, major))
+        if window is None or now >= window.resets_at:
+            window = self._windows[(bucket.hash, major)] = _Window(bucket.limit, now + bucket.reset_after)
+
+        headers = {
+            'X-RateLimit-Bucket': bucket.hash,
+            'X-RateLimit-Limit': str(bucket.limit),
+            'X-RateLimit-Reset': f'{time.time() + (window.resets_at - now):.3f}',
+        }
+
+        faults = self._faults.get(route_key)
+        if faults:
+            fault = faults.popleft()
+            return self._fault(fault, window, headers, now)
+
+        if window.remaining <= 0:
+            retry_after = window.resets_at - now
+            headers['X-RateLimit-Remaining'] = '0'
+            headers['X-RateLimit-Reset-After'] = f'{retry_after:.3f}'
+            headers['X-RateLimit-Scope'] = 'user'
+            return self._json(
+                {'message': 'You are being rate limited.', 'retry_after': retry_after, 'global': False},
+                status=429,
+                headers=headers,
+            )
+
+        window.remaining -= 1
+        headers['X-RateLimit-Remaining'] = str(window.remaining)
+        headers['X-RateLimit-Reset-After'] = f'{window.resets_at - now:.3f}'
+        payload = self._payload(route_key, request)
+        if payload is None:
+            return web.Response(status=204, headers=headers)
+        return self._json(payload, headers=headers)
+
+    def _fault(self, fault: Fault, window: _Window, headers: Dict[str, str], now: float) -> web.Response:
+        if fault.status == 429:
+            if fault.is_global:
+                return self._json(
+                    {'message': 'You are being rate limited.', 'retry_after': fault.retry_after, 'global': True},
+                    status=429,
+                    headers={'X-RateLimit-Global': 'true', 'X-RateLimit-Scope': 'global'},
+                )
+
+            # A sub-ratelimit is a 429 while the bucket still claims to have requests left
+            headers['X-RateLimit-Remaining'] = str(window.remaining if fault.sub_ratelimit else 0)
+            headers['X-RateLimit-Reset-After'] = f'{window.resets_at - now:.3f}'
+            return self._json(
+                {'message': 'You are being rate limited.', 'retry_after': fault.retry_after, 'global': False},
+                status=429,
+                headers=headers,
+            )
+
+        if fault.status == 202:
+            return self._json(
+                {'message': 'Index not yet available. Try again later', 'code': 110000, 'retry_after': fault.retry_after},
+                status=202,
+            )
+
+        return self._json({'message': 'Server error', 'code': 0}, status=fault.status)
+
+    def _payload(self, route_key: str, request: web.Request) -> Any:
+        channel_id = request.match_info.get('channel_id', '1')
+        if route_key == 'GET /users/@me':
+            return {'id': '1', 'username': 'fake', 'discriminator': '0', 'global_name': None, 'avatar': None}
+        if route_key == 'GET /channels/{channel_id}':
+            return {'id': channel_id, 'type': 0, 'name': 'fake', 'guild_id': '1', 'position': 0}
+        if route_key == 'GET /channels/{channel_id}/messages':
+            limit = int(request.query.get('limit', 50))
+            if channel_id in self._history:
+                return [
+                    self._message(channel_id, str(id)) for id in self._page(self._history[channel_id], request.query, limit)
+                ]
+            return [self._message(channel_id, str(next(self._ids))) for _ in range(limit)]
+        if route_key.endswith('/messages/search'):
+            return self._search(request.match_info.get('channel_id') or request.query.get('channel_id', ''), request.query)
+        if route_key == 'DELETE /channels/{channel_id}/messages/{message_id}':
+            return None
+        message_id = request.match_info.get('message_id') or str(next(self._ids))
+        return self._message(channel_id, message_id)
+
+    def _search(self, channel_id: str, query: Any) -> Dict[str, Any]:
+        # Seeded messages all match, newest first unless asked otherwise
+        history = self._history.get(channel_id, [])
+        if query.get('sort_order') != 'asc':
+            history = history[::-1]
+        offset = int(query.get('offset', 0))
+        page = history[offset : offset + int(query.get('limit', 25))]
+        return {
+            'total_results': len(history),
+            'messages': [[dict(self._message(channel_id, str(id)), hit=True)] for id in page],
+            'analytics_id': 'fake',
+            'doing_deep_historical_index': False,
+        }
+
+    def _page(self, history: List[int], query: Any, limit: int) -> List[int]:
+        # Discord returns the page nearest to the cursor, newest first
+        if 'after' in query:
+            start = bisect_right(history, int(query['after']))
+            return history[start : start + limit][::-1]
+        end = bisect_left(history, int(query['before'])) if 'before' in query else len(history)
+        return history[max(end - limit, 0) : end][::-1]
+
+    def _message(self, channel_id: str, message_id: str) -> Dict[str, Any]:
+        return {
+            'id': message_id,
+            'channel_id': channel_id,
+            'type': 0,
+            'content': 'fake',
+            'author': {'id': '1', 'username': 'fake', 'discriminator': '0', 'global_name': None, 'avatar': None},
+            'attachments': [],
+            'embeds': [],
+            'mentions': [],
+            'mention_roles': [],
+            'pinned': False,
+            'mention_everyone': False,
+            'tts': False,
+            'timestamp': '2024-01-01T00:00:00+00:00',
+            'edited_timestamp': None,
+            'flags': 0,
+            'components': [],
+        }
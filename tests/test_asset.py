@@ -0,0 +1,112 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2021-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import types
+
+import pytest
+
+from discord import Asset, AssetCache
+
+
+async def _aiter(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_asset_cache_roundtrip(tmp_path):
+    cache = AssetCache(tmp_path)
+    url = 'https://cdn.discordapp.com/avatars/1/abc.png?size=1024'
+
+    assert await cache.get(url) is None
+    await cache.put(url, b'image')
+
+    assert url in cache
+    assert await cache.get(url) == b'image'
+    assert cache.size == 5
+
+    # Entries survive a restart
+    assert await AssetCache(tmp_path).get(url) == b'image'
+
+
+@pytest.mark.asyncio
+async def test_asset_cache_evicts_least_recently_used(tmp_path):
+    cache = AssetCache(tmp_path, max_size=10)
+    await cache.put('a', b'aaaa')
+    await cache.put('b', b'bbbb')
+    await cache.get('a')
+    await cache.put('c', b'cccc')
+
+    assert 'a' in cache and 'c' in cache
+    assert 'b' not in cache
+    assert cache.size == 8
+
+    # Too big to ever fit
+    await cache.put('d', b'd' * 11)
+    assert 'd' not in cache
+
+
+@pytest.mark.asyncio
+async def test_asset_cache_tee(tmp_path):
+    cache = AssetCache(tmp_path)
+
+    chunks = [chunk async for chunk in cache._tee('a', _aiter([b'ab', b'cd']))]
+    assert chunks == [b'ab', b'cd']
+    assert await cache.get('a') == b'abcd'
+
+    # An abandoned stream leaves nothing behind
+    stream = cache._tee('b', _aiter([b'ab', b'cd']))
+    await stream.__anext__()
+    await stream.aclose()
+    assert 'b' not in cache
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+@pytest.mark.asyncio
+async def test_asset_save_replaces_atomically(tmp_path):
+    path = tmp_path / 'avatar.png'
+    path.write_bytes(b'old')
+
+    def stream(chunks, fail=False):
+        async def stream_from_cdn(url, *, cache=False):
+            for chunk in chunks:
+                yield chunk
+            if fail:
+                raise OSError('connection reset')
+
+        return types.SimpleNamespace(http=types.SimpleNamespace(stream_from_cdn=stream_from_cdn))
+
+    asset = Asset(stream([b'new', b'data'], fail=True), url='https://cdn.example/avatar.png', key='avatar')  # type: ignore
+    with pytest.raises(OSError):
+        await asset.save(str(path))
+    # The existing file is untouched, and nothing is left behind
+    assert path.read_bytes() == b'old'
+    assert list(tmp_path.iterdir()) == [path]
+
+    asset = Asset(stream([b'new', b'data']), url='https://cdn.example/avatar.png', key='avatar')  # type: ignore
+    assert await asset.save(path) == 7
+    assert path.read_bytes() == b'newdata'
+    assert list(tmp_path.iterdir()) == [path]
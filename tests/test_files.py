@@ -24,8 +24,12 @@ DEALINGS IN THE SOFTWARE.
 
 from __future__ import annotations
 
+import base64
+import hashlib
 from io import BytesIO
 
+import pytest
+
 import discord
 
 
@@ -127,3 +131,35 @@ def test_file_not_spoiler_with_overriding_name_double_spoiler():
     f.filename = 'SPOILER_SPOILER_.gitignore'
     assert f.filename == 'SPOILER_.gitignore'
     assert f.spoiler == True
+
+
+def test_file_md5_is_chunked_and_rewinds():
+    data = b'discord' * 100_000
+    buffer = BytesIO(b'skip' + data)
+    buffer.seek(4)
+    f = discord.File(buffer)
+
+    assert f.md5.digest() == hashlib.md5(data).digest()
+    assert buffer.tell() == 4
+
+
+@pytest.mark.asyncio
+async def test_file_async_md5():
+    data = b'discord' * 100_000
+    f = discord.File(BytesIO(data))
+
+    assert await f._async_b64_md5() == base64.b64encode(hashlib.md5(data).digest()).decode('ascii')
+    assert f.fp.tell() == 0
+
+
+@pytest.mark.asyncio
+async def test_file_iter_chunks_reports_progress():
+    data = b'discord' * 20_000
+    f = discord.File(BytesIO(data))
+    progress = []
+
+    chunks = [chunk async for chunk in f._iter_chunks(progress.append)]
+
+    assert b''.join(chunks) == data
+    assert progress[-1] == len(data)
+    assert progress == sorted(progress)
@@ -0,0 +1,223 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2021-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import types
+
+import pytest
+
+import discord
+from discord.ext import commands
+from discord.guild import Guild
+
+
+def _user(id):
+    return {'id': str(id), 'username': f'user{id}', 'discriminator': '0', 'global_name': None, 'avatar': None}
+
+
+def _member(id, roles):
+    return {'user': _user(id), 'roles': [str(r) for r in roles], 'joined_at': None, 'deaf': False, 'mute': False}
+
+
+def _role(id, position, colour=0):
+    return {'id': str(id), 'name': f'role{id}', 'permissions': '0', 'position': position, 'color': colour}
+
+
+def _guild(**fields):
+    state = discord.Client()._connection
+    data = {'id': '100', 'name': 'guild', 'owner_id': '1', 'roles': [_role(100, 0)], 'channels': [], 'members': []}
+    data.update(fields)
+    guild = Guild(data=data, state=state)  # type: ignore
+    state._add_guild(guild)
+    return guild
+
+
+def test_role_hierarchy_maintained():
+    rng = random.Random(7)
+    roles = [_role(100, 0)] + [_role(id, rng.randint(1, 5), colour=id % 3) for id in range(200, 220)]
+    members = [_member(id, rng.sample(range(200, 220), 4)) for id in range(1000, 1010)]
+    guild = _guild(roles=roles, members=members)
+    state = guild._state
+
+    def check():
+        expected = sorted(guild._roles.values())
+        assert list(guild.roles) == expected
+        assert guild._role_ranks == {role.id: rank for rank, role in enumerate(expected)}
+        for member in guild.members:
+            member_roles = sorted([guild.default_role] + [guild.get_role(id) for id in member._roles if guild.get_role(id)])
+            assert member.roles == member_roles
+            assert member.top_role == member_roles[-1]
+            coloured = [role.colour for role in member_roles[1:] if role.colour.value]
+            assert member.colour == (coloured[-1] if coloured else discord.Colour.default())
+
+    check()
+    next_id = 300
+    for _ in range(60):
+        action = rng.choice(('create', 'update', 'delete'))
+        ids = [role.id for role in guild._roles.values() if not role.is_default()]
+        if action == 'create' or not ids:
+            state.parse_guild_role_create({'guild_id': '100', 'role': _role(next_id, rng.randint(1, 8))})  # type: ignore
+            next_id += 1
+        elif action == 'update':
+            role = _role(rng.choice(ids), rng.randint(1, 8))
+            state.parse_guild_role_update({'guild_id': '100', 'role': role})  # type: ignore
+        else:
+            state.parse_guild_role_delete({'guild_id': '100', 'role_id': str(rng.choice(ids))})  # type: ignore
+        check()
+
+
+def test_member_name_index():
+    members = [_member(1000, []), dict(_member(1001, []), nick='Nick'), _member(1002, [])]
+    members[2]['user']['global_name'] = 'Global'
+    guild = _guild(members=members)
+    state = guild._state
+
+    assert guild.get_member_named('user1000') == guild.get_member(1000)
+    assert guild.get_member_named('Nick') == guild.get_member(1001)
+    assert guild.get_member_named('Global') == guild.get_member(1002)
+    assert guild.get_member_named('user1002#0') == guild.get_member(1002)
+    # Names are indexed case insensitively but still matched exactly
+    assert guild._members_named('NICK') == [guild.get_member(1001)]
+    assert guild.get_member_named('NICK') is None
+
+    # Nickname and username changes are reindexed
+    data = dict(_member(1001, []), guild_id='100', nick='Renamed')
+    data['user']['username'] = 'newname'
+    state.parse_guild_member_update(data)  # type: ignore
+    assert guild.get_member_named('Nick') is None
+    assert guild.get_member_named('user1001') is None
+    assert guild.get_member_named('Renamed') == guild.get_member(1001)
+    assert guild.get_member_named('newname') == guild.get_member(1001)
+
+    assert sorted(guild._member_names.startswith('USER')) == [1000, 1002]
+    guild._remove_member(guild.get_member(1000))  # type: ignore
+    guild._add_member(discord.Member(data=_member(1003, []), guild=guild, state=state))  # type: ignore
+    assert sorted(guild._member_names.startswith('user')) == [1002, 1003]
+    assert guild.get_member_named('user1000') is None
+    assert len(guild._member_names) == 3
+
+
+def test_search_members_ranked():
+    members = [_member(id, []) for id in range(1000, 1005)]
+    members[0]['user']['username'] = 'alexander'
+    members[1]['user']['username'] = 'alex'
+    members[2]['user']['username'] = 'xalex'
+    members[3]['nick'] = 'ALEXis'
+    guild = _guild(members=members)
+
+    assert [m.id for m in guild.search_members('Alex')] == [1001, 1000, 1003, 1002]
+    assert [m.id for m in guild.search_members('alex', substring=False)] == [1001, 1000, 1003]
+    assert [m.id for m in guild.search_members('alex', limit=2)] == [1001, 1000]
+
+
+@pytest.mark.asyncio
+async def test_query_members_local_first(monkeypatch):
+    guild = _guild(members=[_member(1000, []), _member(1001, [])], member_count=3)
+    state = guild._state
+    requests = []
+
+    async def chunker(guild_ids, *, query=None, limit=0, presences=False, user_ids=None, nonce=None):
+        requests.append((query, user_ids))
+        # The gateway answers with no members once the request is waited on
+        asyncio.get_running_loop().call_later(0.01, state._chunk_requests.pop(nonce).done)
+
+    monkeypatch.setattr(state, 'chunker', chunker)
+    monkeypatch.setattr(state, 'loop', asyncio.get_running_loop())
+
+    # Cached members are answered without the gateway
+    assert [m.id for m in await guild.query_members(user_ids=[1000, 1001], presences=False)] == [1000, 1001]
+    assert [m.id for m in await guild.query_members('user100', limit=2, presences=False)] == [1000, 1001]
+    assert requests == []
+
+    # Otherwise only what's missing is requested, and the answer is reused for a while
+    assert [m.id for m in await guild.query_members(user_ids=[1000, 1002], presences=False)] == [1000]
+    assert [m.id for m in await guild.query_members(user_ids=[1000, 1002], presences=False)] == [1000]
+    assert await guild.query_members('user', limit=5, presences=False) == []
+    assert await guild.query_members('USER', limit=5, presences=False) == []
+    assert requests == [(None, [1002]), ('user', None)]
+
+    # Presences only come from the gateway, and uncached answers aren't reused
+    requests.clear()
+    assert await guild.query_members(user_ids=[1000], presences=True) == []
+    assert await guild.query_members('other', limit=5, presences=False, cache=False) == []
+    assert await guild.query_members('other', limit=5, presences=False, cache=False) == []
+    assert requests == [(None, [1000]), ('other', None), ('other', None)]
+
+
+@pytest.mark.asyncio
+async def test_member_converter_uses_cache(monkeypatch):
+    guild = _guild(members=[_member(1000, []), _member(1001, [])], member_count=3)
+    state = guild._state
+    bot = types.SimpleNamespace(ws=types.SimpleNamespace(is_ratelimited=lambda: False))
+    requests = []
+
+    async def chunker(guild_ids, *, query=None, limit=0, presences=False, user_ids=None, nonce=None):
+        requests.append((query, user_ids))
+        asyncio.get_running_loop().call_later(0.01, state._chunk_requests.pop(nonce).done)
+
+    monkeypatch.setattr(state, 'chunker', chunker)
+    monkeypatch.setattr(state, 'loop', asyncio.get_running_loop())
+
+    # Presences aren't needed to convert, so cached members are found without the gateway
+    converter = commands.MemberConverter()
+    assert await converter.query_member_by_id(bot, guild, 1000) == guild.get_member(1000)
+    assert requests == []
+
+    # And the gateway's answers are reused
+    assert await converter.query_member_by_id(bot, guild, 1002) is None
+    assert await converter.query_member_by_id(bot, guild, 1002) is None
+    assert await converter.query_member_named(guild, 'missing') is None
+    assert await converter.query_member_named(guild, 'missing') is None
+    assert requests == [(None, [1002]), ('missing', None)]
+
+
+def _channel(id, type, position, parent_id=None):
+    return {'id': str(id), 'type': type, 'name': f'channel{id}', 'position': position, 'parent_id': parent_id}
+
+
+def test_channel_views_cached():
+    channels = [_channel(300, 4, 1), _channel(301, 4, 0), _channel(310, 0, 1, '300'), _channel(311, 0, 0, '300')]
+    guild = _guild(channels=channels)
+    state = guild._state
+
+    assert [c.id for c in guild.text_channels] == [311, 310]
+    assert [(c.id, [ch.id for ch in chs]) for c, chs in guild.by_category()] == [(301, []), (300, [311, 310])]
+    # Callers get their own lists, while the views themselves are kept
+    guild.text_channels.clear()
+    guild.by_category()[1][1].clear()
+    assert [c.id for c in guild.text_channels] == [311, 310]
+    assert guild._sorted_channels(discord.TextChannel) is guild._sorted_channels(discord.TextChannel)
+
+    state.parse_channel_update(dict(_channel(310, 0, 0, '301'), guild_id='100'))  # type: ignore
+    assert [(c.id, [ch.id for ch in chs]) for c, chs in guild.by_category()] == [(301, [310]), (300, [311])]
+    assert [c.id for c in guild.text_channels] == [310, 311]
+
+    state.parse_channel_create(dict(_channel(312, 0, 2, '300'), guild_id='100'))  # type: ignore
+    assert [c.id for c in guild.text_channels] == [310, 311, 312]
+    state.parse_channel_delete(dict(_channel(311, 0, 0, '300'), guild_id='100'))  # type: ignore
+    assert [c.id for c in guild.text_channels] == [310, 312]
+    assert [c.id for c in guild.categories] == [301, 300]
@@ -0,0 +1,268 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2021-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import random
+
+import discord
+import pytest
+import pytest_asyncio
+from discord.http import Route
+
+from fake_discord import FakeDiscord, Fault
+
+CHANNEL_ID = 5
+MESSAGE_IDS = sorted(random.Random(0).sample(range(1000, 10000), 950))
+
+
+@pytest_asyncio.fixture
+async def server(monkeypatch):
+    async with FakeDiscord(global_limit=10_000) as server:
+        monkeypatch.setattr(Route, 'BASE', server.base)
+        server.seed(CHANNEL_ID, MESSAGE_IDS)
+        server.buckets['messages.read'].limit = server.buckets['search'].limit = 50
+        yield server
+
+
+@pytest_asyncio.fixture
+async def channel(server):
+    client = discord.Client()
+    client.http = client._connection.http = await server.client(global_ratelimit=None)
+    try:
+        yield discord.PartialMessageable(state=client._connection, id=CHANNEL_ID)
+    finally:
+        await client.http.close()
+
+
+def _bounds():
+    return {'after': discord.Object(id=999), 'before': discord.Object(id=10000)}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('prefetch', [0, 2])
+async def test_history_prefetch(channel, prefetch):
+    ids = [message.id async for message in channel.history(limit=None, prefetch=prefetch)]
+    assert ids == MESSAGE_IDS[::-1]
+
+    ids = [message.id async for message in channel.history(limit=250, after=discord.Object(id=2000), prefetch=prefetch)]
+    assert ids == [id for id in MESSAGE_IDS if id > 2000][:250]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('partitions', [1, 3, 8])
+async def test_history_partitioned_ordered(channel, partitions):
+    checkpoint = discord.HistoryCheckpoint()
+    ids = [m.id async for m in channel.history_partitioned(partitions=partitions, checkpoint=checkpoint, **_bounds())]
+
+    assert ids == MESSAGE_IDS
+    assert len(checkpoint.segments) == partitions
+    assert checkpoint.done
+
+
+@pytest.mark.asyncio
+async def test_history_partitioned_unordered(channel):
+    ids = [m.id async for m in channel.history_partitioned(partitions=4, ordered=False, **_bounds())]
+    assert sorted(ids) == MESSAGE_IDS
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('ordered', [True, False])
+async def test_history_partitioned_resume(channel, ordered):
+    checkpoint = discord.HistoryCheckpoint()
+    seen = []
+    async for message in channel.history_partitioned(partitions=4, ordered=ordered, checkpoint=checkpoint, **_bounds()):
+        seen.append(message.id)
+        if len(seen) == 300:
+            break
+
+    assert not checkpoint.done
+    restored = discord.HistoryCheckpoint.from_dict(checkpoint.to_dict())
+    # The message being processed when the scan stopped is yielded again
+    async for message in channel.history_partitioned(checkpoint=restored):
+        seen.append(message.id)
+
+    assert restored.done
+    assert len(seen) == len(MESSAGE_IDS) + 1
+    assert set(seen) == set(MESSAGE_IDS)
+
+
+def test_history_checkpoint_split():
+    checkpoint = discord.HistoryCheckpoint._split(0, 10, 3)
+    covered = [id for cursor, end in checkpoint.segments for id in range(cursor + 1, end)]
+    assert covered == list(range(1, 10))
+    assert not checkpoint.done
+    assert discord.HistoryCheckpoint._split(5, 6, 4).done
+
+
+@pytest.mark.asyncio
+async def test_history_raw(channel):
+    payloads = [m async for m in channel.history(limit=150, raw=True)]
+    assert all(isinstance(m, dict) for m in payloads)
+    assert [int(m['id']) for m in payloads] == MESSAGE_IDS[::-1][:150]
+
+    payloads = [m async for m in channel.history_partitioned(partitions=3, raw=True, **_bounds())]
+    assert [int(m['id']) for m in payloads] == MESSAGE_IDS
+
+
+def _read_archive(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as fp:
+        return [int(json.loads(line)['id']) for line in fp]
+
+
+@pytest.mark.asyncio
+async def test_archiver(server, channel, tmp_path):
+    other = discord.PartialMessageable(state=channel._state, id=6)
+    server.seed(6, range(20000, 20010))
+    archiver = discord.HistoryArchiver(tmp_path, batch_size=300)
+
+    assert await archiver.archive(channel, other) == {CHANNEL_ID: len(MESSAGE_IDS), 6: 10}
+    assert _read_archive(archiver.archive_path(CHANNEL_ID)) == MESSAGE_IDS
+    assert _read_archive(archiver.archive_path(6)) == list(range(20000, 20010))
+
+    # A batch written after the last checkpoint by an interrupted run is discarded
+    with open(archiver.archive_path(CHANNEL_ID), 'ab') as fp:
+        fp.write(gzip.compress(b'{"id":"1"}\n'))
+
+    server.seed(CHANNEL_ID, MESSAGE_IDS + [10001, 10002])
+    assert await archiver.archive(channel) == {CHANNEL_ID: 2}
+    assert _read_archive(archiver.archive_path(CHANNEL_ID)) == MESSAGE_IDS + [10001, 10002]
+
+    with open(archiver._checkpoint_path(CHANNEL_ID)) as fp:
+        checkpoint = json.load(fp)
+    assert checkpoint['last_id'] == '10002'
+    assert checkpoint['count'] == len(MESSAGE_IDS) + 2
+
+    # A missing archive isn't resumed from its checkpoint, and neither is the other format's
+    (tmp_path / f'{CHANNEL_ID}.ndjson.gz').unlink()
+    assert await archiver.archive(channel) == {CHANNEL_ID: len(MESSAGE_IDS) + 2}
+    assert _read_archive(archiver.archive_path(CHANNEL_ID)) == MESSAGE_IDS + [10001, 10002]
+
+    plain = discord.HistoryArchiver(tmp_path, batch_size=300, compress=False, threads=False)
+    assert await plain.archive(channel) == {CHANNEL_ID: len(MESSAGE_IDS) + 2}
+    with open(plain.archive_path(CHANNEL_ID), encoding='utf-8') as fp:
+        assert [int(json.loads(line)['id']) for line in fp] == MESSAGE_IDS + [10001, 10002]
+
+
+@pytest.mark.asyncio
+async def test_purge_pipeline(server, channel):
+    server.buckets['messages.delete'].limit = 500
+    server.latency = 0.01
+    deleted = []
+
+    messages = await discord.abc._purge_helper(
+        channel, limit=200, check=lambda m: m.id % 2 == 0, progress=lambda m: deleted.append(m.id)
+    )
+
+    expected = [id for id in MESSAGE_IDS[::-1][:200] if id % 2 == 0]
+    assert [m.id for m in messages] == expected
+    assert sorted(deleted) == sorted(expected)
+    paths = [entry.path for entry in server.log if entry.method == 'DELETE']
+    assert sorted(int(path.rsplit('/', 1)[1]) for path in paths) == sorted(expected)
+
+    # Once the bucket's limit is known, deletes run concurrently
+    times = [entry.at for entry in server.log if entry.method == 'DELETE']
+    assert times[-1] - times[0] < len(times) * server.latency / 2
+
+
+@pytest.mark.asyncio
+async def test_purge_without_messages(server, channel):
+    server.buckets['messages.delete'].limit = 500
+    deleted = []
+
+    assert await discord.abc._purge_helper(channel, limit=150, return_messages=False, progress=deleted.append) == []
+    assert len(deleted) == 150
+
+
+@pytest.mark.asyncio
+async def test_purge_stops_on_error(server, channel):
+    server.inject('DELETE /channels/{channel_id}/messages/{message_id}', Fault(403))
+
+    with pytest.raises(discord.Forbidden):
+        await discord.abc._purge_helper(channel, limit=500)
+    assert server.count(route='DELETE /channels/{channel_id}/messages/{message_id}') < 10
+
+
+@pytest_asyncio.fixture
+async def guild_channel(server, channel):
+    # Guild channels search through the guild endpoint
+    yield discord.PartialMessageable(state=channel._state, id=CHANNEL_ID, guild_id=1)
+
+
+@pytest.mark.asyncio
+async def test_search_pages(guild_channel):
+    ids = [m.id async for m in guild_channel.search(limit=60)]
+    assert ids == MESSAGE_IDS[::-1][:60]
+
+    payloads = [m async for m in guild_channel.search(limit=30, oldest_first=True, prefetch=3, raw=True)]
+    assert [int(m['id']) for m in payloads] == MESSAGE_IDS[:30]
+
+
+@pytest.mark.asyncio
+async def test_search_deduplicates(server, guild_channel):
+    ids = []
+    async for message in guild_channel.search(limit=50, prefetch=0):
+        ids.append(message.id)
+        if len(ids) == 25:
+            # A new message is indexed, shifting the next page by one
+            server.seed(CHANNEL_ID, MESSAGE_IDS + [10001])
+
+    assert len(ids) == len(set(ids)) == 49
+    assert ids == MESSAGE_IDS[::-1][:49]
+
+
+@pytest.mark.asyncio
+async def test_search_index_wait_releases_bucket(server, guild_channel):
+    route = 'GET /guilds/{guild_id}/messages/search'
+    server.inject(route, Fault(202, retry_after=0.3))
+    loop = asyncio.get_running_loop()
+
+    async def search():
+        start = loop.time()
+        ids = [m.id async for m in guild_channel.search(limit=5)]
+        return ids, loop.time() - start
+
+    first = asyncio.create_task(search())
+    await asyncio.sleep(0.05)
+    ids, elapsed = await search()
+    assert ids == MESSAGE_IDS[::-1][:5]
+    assert elapsed < 0.2
+
+    ids, elapsed = await first
+    assert ids == MESSAGE_IDS[::-1][:5]
+    assert elapsed >= 0.3
+    assert [entry.query.get('attempts') for entry in server.log if entry.route == route] == [None, None, '1']
+
+
+@pytest.mark.asyncio
+async def test_search_resets_index_attempts(server, guild_channel):
+    route = 'GET /guilds/{guild_id}/messages/search'
+    server.inject(route, Fault(202, retry_after=0.01))
+
+    ids = [m.id async for m in guild_channel.search(limit=30)]
+    assert ids == MESSAGE_IDS[::-1][:30]
+    assert [entry.query.get('attempts') for entry in server.log if entry.route == route] == [None, '1', None]
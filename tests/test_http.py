@@ -0,0 +1,235 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2021-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from discord import utils
+from discord.http import GlobalRatelimit, HTTPClient, RequestRecord, Route
+
+from fake_discord import FakeDiscord
+
+
+def _job(value, delay=0.0, *, active=None):
+    async def run():
+        if active is not None:
+            active.append(value)
+        await asyncio.sleep(delay)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    return run
+
+
+@pytest.mark.asyncio
+async def test_fan_out_yields_every_result():
+    http = HTTPClient()
+    requests = [_job(i, delay=(5 - i) / 100) for i in range(5)]
+
+    results = [item async for item in http.fan_out(requests, limit=5)]
+
+    assert sorted(results) == [(i, i) for i in range(5)]
+    # Independent jobs run concurrently, so the shortest finishes first
+    assert results[0] == (4, 4)
+
+
+@pytest.mark.asyncio
+async def test_fan_out_serializes_unknown_buckets():
+    http = HTTPClient()
+    route = Route('GET', '/channels/{channel_id}/messages', channel_id=1)
+    started = []
+    requests = [(route, _job(i, delay=0.01, active=started)) for i in range(3)]
+
+    results = [item async for item in http.fan_out(requests, limit=10)]
+
+    # Without a known bucket limit, requests in a bucket are started in order one at a time
+    assert started == [0, 1, 2]
+    assert [index for index, _ in results] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_fan_out_exceptions():
+    http = HTTPClient()
+    requests = [_job(1), _job(ValueError('boom'), delay=0.01)]
+
+    results = [item async for item in http.fan_out(requests, return_exceptions=True)]
+    assert isinstance(dict(results)[1], ValueError)
+
+    with pytest.raises(ValueError):
+        async for _ in http.fan_out(requests):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_global_ratelimit_bursts_then_throttles():
+    bucket = GlobalRatelimit(5, per=0.1)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    for _ in range(5):
+        await bucket.acquire()
+    assert loop.time() - start < 0.02
+
+    # The burst is spent, so the next tokens come at the refill rate
+    for _ in range(5):
+        await bucket.acquire()
+    assert loop.time() - start >= 0.08
+
+
+@pytest.mark.asyncio
+async def test_global_ratelimit_drain():
+    bucket = GlobalRatelimit(10)
+    bucket.drain()
+    assert bucket.tokens < 1
+
+    with pytest.raises(ValueError):
+        GlobalRatelimit(0)
+
+
+def test_request_stats_snapshot():
+    http = HTTPClient()
+    hooked = []
+    http.stats_hook = hooked.append
+
+    record = RequestRecord('GET', 'GET /channels/{channel_id}')
+    record.bucket = 'abcd'
+    record.attempts = 2
+    record.latency = 0.3
+    record.ratelimited = record.sub_ratelimited = 1
+    http._record_request(record)
+    http._record_request(RequestRecord('GET', 'GET /channels/{channel_id}'))
+
+    stats = http.stats()
+    route = stats['routes']['GET /channels/{channel_id}']
+    assert route['requests'] == 2
+    assert route['attempts'] == 2
+    assert route['sub_ratelimited'] == 1
+    assert route['latency']['count'] == 2
+    assert route['latency']['buckets']['0.5'] == 1
+    assert stats['buckets']['abcd']['requests'] == 1
+    assert hooked[0] is record
+
+    http.clear_stats()
+    assert http.stats() == {'routes': {}, 'buckets': {}}
+
+
+@pytest.mark.asyncio
+async def test_startup_uses_cached_properties(tmp_path):
+    path = str(tmp_path / 'properties.json')
+    properties, encoded = utils._build_info('120.0.0.0', 12345)
+    utils._write_cached_info(path, properties, encoded)
+
+    http = HTTPClient(properties_cache=path, prewarm_connections=0)
+    try:
+        await http.startup()
+        assert http.super_properties == properties
+        assert http.encoded_super_properties == encoded
+        assert http.browser_version == '120.0.0.0'
+        # Fresh, so nothing is refreshed in the background
+        assert http._properties_refresh is None
+    finally:
+        await http.close()
+
+    http = HTTPClient(properties_cache=path, properties_cache_ttl=0, prewarm_connections=0)
+    try:
+        await http.startup()
+        assert http.super_properties == properties
+        assert http._properties_refresh is not None
+    finally:
+        await http.close()
+
+
+def test_cached_properties_roundtrip(tmp_path):
+    path = str(tmp_path / 'nested' / 'properties.json')
+    assert utils._read_cached_info(path) is None
+
+    properties, encoded = utils._build_info('120.0.0.0', 12345)
+    utils._write_cached_info(path, properties, encoded)
+    cached = utils._read_cached_info(path)
+    assert cached is not None
+    assert cached[:2] == (properties, encoded)
+
+    (tmp_path / 'nested' / 'properties.json').write_text('not json')
+    assert utils._read_cached_info(path) is None
+
+    # Properties the client relies on must be there too
+    del properties['browser_version']
+    utils._write_cached_info(path, properties, encoded)
+    assert utils._read_cached_info(path) is None
+
+
+@pytest.mark.asyncio
+async def test_fallback_properties_not_cached(tmp_path, monkeypatch):
+    path = str(tmp_path / 'properties.json')
+
+    async def fail(session):
+        raise RuntimeError('network down')
+
+    monkeypatch.setattr(utils, '_get_browser_version', fail)
+    http = HTTPClient(properties_cache=path)
+    await http._refresh_super_properties(None)  # type: ignore # The session isn't used
+    assert http.browser_version == utils.FALLBACK_BROWSER_VERSION
+    assert utils._read_cached_info(path) is None
+
+
+@pytest.mark.asyncio
+async def test_pool_stats():
+    async with FakeDiscord() as server:
+        http = await server.client()
+        try:
+            await http.request(server.route('GET', '/users/@me'))
+            stats = http.pool_stats()
+        finally:
+            await http.close()
+
+    host = stats['hosts'][server.base.split('/')[2]]
+    assert host == {'active': 0, 'idle': 1}
+    assert stats['active'] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_from_cdn_survives_cancelled_caller():
+    http = HTTPClient()
+    calls = []
+
+    async def fetch(url):
+        calls.append(url)
+        await asyncio.sleep(0.05)
+        return b'data'
+
+    http._get_from_cdn = fetch
+    first = asyncio.create_task(http.get_from_cdn('https://cdn.example/a.png'))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(http.get_from_cdn('https://cdn.example/a.png'))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    assert await second == b'data'
+    assert first.cancelled()
+    assert calls == ['https://cdn.example/a.png']
+    assert not http._cdn_requests
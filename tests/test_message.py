@@ -0,0 +1,159 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2021-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+import discord
+
+
+def _user(id):
+    return {'id': str(id), 'username': f'user{id}', 'discriminator': '0', 'global_name': None, 'avatar': None}
+
+
+def _payload(id, **fields):
+    data = {
+        'id': str(id),
+        'channel_id': '5',
+        'type': 0,
+        'content': 'hello <@2>',
+        'author': _user(1),
+        'attachments': [],
+        'embeds': [{'type': 'rich', 'title': 'Example'}],
+        'mentions': [_user(2)],
+        'mention_roles': [],
+        'reactions': [{'emoji': {'id': None, 'name': '\N{THUMBS UP SIGN}'}, 'count': 3, 'me': False}],
+        'pinned': False,
+        'mention_everyone': False,
+        'tts': False,
+        'timestamp': '2024-01-01T00:00:00+00:00',
+        'edited_timestamp': '2024-01-02T00:00:00+00:00',
+        'flags': 0,
+    }
+    data.update(fields)
+    return data
+
+
+@pytest.fixture
+def state():
+    return discord.Client(lazy_messages=True)._connection
+
+
+def _message(state, data, *, lazy=True):
+    channel = discord.PartialMessageable(state=state, id=5)
+    return discord.Message(state=state, channel=channel, data=data, lazy=lazy)
+
+
+def test_lazy_message_matches_eager(state):
+    data = _payload(10, message_reference={'message_id': '9', 'channel_id': '5'}, referenced_message=_payload(9))
+    eager = _message(state, data, lazy=False)
+    lazy = _message(state, data)
+
+    # Nothing is decoded until it is accessed
+    assert lazy._lazy_data is data
+    assert lazy.content == eager.content
+    assert lazy.author == eager.author
+
+    assert lazy.edited_at == eager.edited_at == datetime.datetime(2024, 1, 2, tzinfo=datetime.timezone.utc)
+    assert [e.title for e in lazy.embeds] == ['Example']
+    assert [(str(r.emoji), r.count) for r in lazy.reactions] == [('\N{THUMBS UP SIGN}', 3)]
+    assert lazy.mentions == eager.mentions
+    assert lazy.role_mentions == lazy.attachments == lazy.stickers == []
+    assert lazy.application is lazy.interaction is lazy.role_subscription is None
+    assert lazy.reference is not None and lazy.reference.resolved.id == 9
+
+    # A missing key behaves as it does eagerly
+    with pytest.raises(AttributeError):
+        eager.components
+    with pytest.raises(AttributeError):
+        lazy.components
+
+
+def test_lazy_message_update(state):
+    message = _message(state, _payload(10))
+    message._update({'content': 'edited', 'embeds': [], 'edited_timestamp': None})  # type: ignore
+
+    assert message.content == 'edited'
+    assert message.embeds == []
+    assert message.edited_at is None
+    # Attributes left out of the update still come from the original payload
+    assert len(message.reactions) == 1
+
+    message._add_reaction({'emoji': {'id': None, 'name': 'x'}, 'me': False}, 'x', 1)
+    assert len(message.reactions) == 2
+
+
+def test_lazy_message_self_mentioned(state):
+    state.user = discord.ClientUser(state=state, data=_user(2))  # type: ignore
+    assert _message(state, _payload(10))._is_self_mentioned()
+    assert not _message(state, _payload(11, mentions=[]))._is_self_mentioned()
+
+
+def test_compact_message_cache():
+    state = discord.Client(compact_message_cache=True, max_messages=3)._connection
+    state.dispatch = lambda *args: None
+    for id in range(10, 15):
+        state.parse_message_create(_payload(id, guild_id='1'))  # type: ignore
+
+    # The oldest messages are evicted, as with a deque
+    assert [m.id for m in state._messages] == [12, 13, 14]
+    assert state._get_message(11) is None
+
+    message = state._get_message(13)
+    assert message is not None
+    assert message.content == 'hello <@2>'
+    assert [e.title for e in message.embeds] == ['Example']
+    assert message.channel.guild_id == 1  # type: ignore
+
+    # Looked up messages are kept whole, so updates stick
+    state.parse_message_update({'id': '13', 'channel_id': '5', 'content': 'edited'})  # type: ignore
+    assert state._get_message(13) is message
+    assert message.content == 'edited'
+
+    state.parse_message_delete_bulk({'ids': ['12', '13'], 'channel_id': '5'})  # type: ignore
+    assert [m.id for m in state._messages] == [14]
+
+
+def test_clean_content(state):
+    content = (
+        'hi <@80088516616269824>, <@!80088516616269825> in <#80088516616269826> @everyone <:big_smile:80088516616269827>'
+    )
+    message = _message(state, _payload(10, content=content, mentions=[_user(80088516616269824)]))
+
+    assert message.raw_mentions == [80088516616269824, 80088516616269825]
+    assert message.raw_channel_mentions == [80088516616269826]
+    assert message.raw_role_mentions == []
+    assert message.clean_content == (
+        'hi @user80088516616269824, @deleted-user in #deleted-channel @\u200beveryone <:big_smile:80088516616269827>'
+    )
+
+    # Tokens are cached until the message is updated
+    assert message.tokens is message.tokens
+    message._update({'content': 'bye <@&80088516616269828>'})  # type: ignore
+    assert message.raw_role_mentions == [80088516616269828]
+    assert message.clean_content == 'bye @deleted-role'
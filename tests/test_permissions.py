@@ -0,0 +1,223 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2021-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+import discord
+from discord.guild import Guild
+
+SEND = discord.Permissions(send_messages=True).value
+READ = discord.Permissions(read_messages=True).value
+MANAGE = discord.Permissions(manage_messages=True).value
+
+
+def _user(id):
+    return {'id': str(id), 'username': f'user{id}', 'discriminator': '0', 'global_name': None, 'avatar': None}
+
+
+def _member(id, roles, **fields):
+    data = {'user': _user(id), 'roles': [str(r) for r in roles], 'joined_at': None, 'deaf': False, 'mute': False}
+    data.update(fields)
+    return data
+
+
+def _channel(id, overwrites):
+    return {'id': str(id), 'type': 0, 'name': f'channel{id}', 'position': 0, 'permission_overwrites': overwrites}
+
+
+@pytest.fixture
+def guild():
+    state = discord.Client()._connection
+    data = {
+        'id': '100',
+        'name': 'guild',
+        'owner_id': '1',
+        'roles': [
+            {'id': '100', 'name': '@everyone', 'permissions': str(READ | SEND), 'position': 0},
+            {'id': '200', 'name': 'mod', 'permissions': str(MANAGE), 'position': 1},
+        ],
+        'channels': [
+            _channel(
+                300,
+                [
+                    {'id': '100', 'type': 0, 'allow': '0', 'deny': str(SEND)},
+                    {'id': '200', 'type': 0, 'allow': str(SEND), 'deny': '0'},
+                ],
+            )
+        ],
+        'members': [_member(2, [200]), _member(3, [])],
+    }
+    guild = Guild(data=data, state=state)
+    state._add_guild(guild)
+    return guild
+
+
+def test_permissions_cached(guild):
+    channel = guild.get_channel(300)
+    mod, member = guild.get_member(2), guild.get_member(3)
+
+    assert channel.permissions_for(mod).send_messages
+    assert not channel.permissions_for(member).send_messages
+    assert len(guild._permissions_cache) == 2
+
+    # Callers get their own copy to modify
+    channel.permissions_for(mod).send_messages = False
+    assert channel.permissions_for(mod).send_messages
+
+
+def test_permissions_invalidated(guild):
+    state = guild._state
+    channel = guild.get_channel(300)
+    mod, member = guild.get_member(2), guild.get_member(3)
+    assert not channel.permissions_for(mod).ban_members
+
+    # Role permissions changing invalidates every member's permissions
+    role = {'id': '200', 'name': 'mod', 'permissions': str(MANAGE | discord.Permissions(ban_members=True).value)}
+    state.parse_guild_role_update({'guild_id': '100', 'role': role})  # type: ignore
+    assert not guild._permissions_cache
+    assert channel.permissions_for(mod).ban_members
+
+    # So does the member's roles or the channel's overwrites changing
+    member._update(_member(3, [200]))  # type: ignore
+    assert channel.permissions_for(member).send_messages
+
+    data = _channel(300, [{'id': '3', 'type': 1, 'allow': '0', 'deny': str(SEND)}])
+    state.parse_channel_update(dict(data, guild_id='100'))  # type: ignore
+    assert not channel.permissions_for(member).send_messages
+    assert channel.permissions_for(mod).send_messages
+
+
+def test_permissions_timeout(guild):
+    channel = guild.get_channel(300)
+    member = guild.get_member(2)
+    assert channel.permissions_for(member).send_messages
+
+    member.timed_out_until = discord.utils.utcnow() + datetime.timedelta(minutes=5)
+    assert not channel.permissions_for(member).send_messages
+
+    member.timed_out_until = None
+    assert channel.permissions_for(member).send_messages
+
+
+def test_overwrites_indexed(guild):
+    state = guild._state
+    channel = guild.get_channel(300)
+    mod, member = guild.get_member(2), guild.get_member(3)
+    assert channel.overwrites_for(guild.get_role(200)).send_messages
+    assert channel.overwrites_for(discord.Object(id=100)).send_messages is False
+    assert channel.overwrites_for(member).is_empty()
+
+    # An update that leaves the overwrites alone keeps them, along with the permissions cached for them
+    overwrites, index = channel._overwrites, channel._overwrite_index
+    data = dict(_channel(300, [o._asdict() for o in reversed(overwrites)]), guild_id='100', name='renamed')
+    state.parse_channel_update(data)  # type: ignore
+    assert channel.name == 'renamed'
+    assert channel._overwrites is overwrites
+    assert channel._overwrite_index is index
+
+    # Otherwise only the changed entries are replaced
+    data['permission_overwrites'] = [
+        {'id': '100', 'type': 0, 'allow': '0', 'deny': str(SEND)},
+        {'id': '3', 'type': 1, 'allow': str(SEND), 'deny': '0'},
+    ]
+    state.parse_channel_update(data)  # type: ignore
+    assert channel._overwrites[0] is overwrites[0]
+    assert channel._overwrite_index.roles == {}
+    assert channel._overwrite_index.members == {3: (SEND, 0)}
+    assert index.roles == {200: (SEND, 0)}
+    assert not channel.permissions_for(mod).send_messages
+    assert channel.permissions_for(member).send_messages
+    assert channel.overwrites_for(member).send_messages
+
+
+def _random_guild(rng, *, members=300, roles=12):
+    state = discord.Client()._connection
+    bits = [1 << bit for bit in range(47) if bit != 3]  # No administrator, so overwrites matter
+    role_data = [{'id': '100', 'name': '@everyone', 'permissions': str(READ | SEND), 'position': 0}]
+    for id in range(200, 200 + roles):
+        value = sum(rng.sample(bits, 4))
+        if id == 200:
+            value |= discord.Permissions(administrator=True).value
+        role_data.append({'id': str(id), 'name': f'role{id}', 'permissions': str(value), 'position': id - 199})
+
+    def overwrites(ids, type):
+        return [
+            {'id': str(id), 'type': type, 'allow': str(sum(rng.sample(bits, 3))), 'deny': str(sum(rng.sample(bits, 3)))}
+            for id in ids
+        ]
+
+    channels = []
+    for id, type in ((300, 0), (301, 2), (302, 4), (303, 15)):
+        data = _channel(id, overwrites([100], 0) + overwrites(rng.sample(range(201, 200 + roles), 4), 0))
+        data.update(type=type, bitrate=64000, user_limit=0)
+        data['permission_overwrites'] += overwrites(rng.sample(range(1000, 1000 + members), 20), 1)
+        channels.append(data)
+
+    member_data = [_member(id, rng.sample(range(200, 200 + roles), rng.randint(0, 3))) for id in range(1000, 1000 + members)]
+    data = {
+        'id': '100',
+        'name': 'guild',
+        'owner_id': '1000',
+        'roles': role_data,
+        'channels': channels,
+        'members': member_data,
+    }
+    guild = Guild(data=data, state=state)
+    state._add_guild(guild)
+
+    timed_out = guild.get_member(1001)
+    timed_out.timed_out_until = discord.utils.utcnow() + datetime.timedelta(minutes=5)
+    return guild
+
+
+@pytest.mark.parametrize('numpy', [False, True])
+def test_bulk_permissions_match(monkeypatch, numpy):
+    if numpy:
+        pytest.importorskip('numpy')
+        monkeypatch.setattr(discord.abc, '_BULK_NUMPY_THRESHOLD', 1)
+    else:
+        monkeypatch.setattr(discord.abc, 'HAS_NUMPY', False)
+
+    import random
+
+    guild = _random_guild(random.Random(4))
+    members = list(guild.members)
+    for channel in guild.channels:
+        expected = [channel.permissions_for(member) for member in members]
+        assert channel.permissions_for_many(members) == expected
+
+        visible = [m for m, p in zip(members, expected) if p.read_messages and not p.send_messages]
+        assert channel.members_with(read_messages=True, send_messages=False) == visible
+
+    for member in members[:50]:
+        expected = [channel for channel in guild.channels if channel.permissions_for(member).read_messages]
+        assert guild.visible_channels_for(member) == expected
+
+    with pytest.raises(TypeError):
+        guild.channels[0].members_with(not_a_permission=True)
@@ -0,0 +1,147 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2021-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+
+from fake_discord import Bucket, FakeDiscord, Fault
+
+SEND = 'POST /channels/{channel_id}/messages'
+
+
+@pytest_asyncio.fixture
+async def server():
+    async with FakeDiscord() as server:
+        yield server
+
+
+async def _client(server, **kwargs):
+    kwargs.setdefault('global_ratelimit', None)
+    return await server.client(**kwargs)
+
+
+def _send(server, channel_id=1):
+    return server.route('POST', '/channels/{channel_id}/messages', channel_id=channel_id)
+
+
+@pytest.mark.asyncio
+async def test_bucket_is_respected_without_429s():
+    async with FakeDiscord(buckets={'messages.write': Bucket('aaaa', limit=3, reset_after=0.2)}) as server:
+        server.routes = {SEND: 'messages.write'}
+        http = await _client(server)
+        try:
+            start = time.monotonic()
+            await asyncio.gather(*(http.request(_send(server), json={'content': 'hi'}) for _ in range(7)))
+            elapsed = time.monotonic() - start
+        finally:
+            await http.close()
+
+    assert server.count(status=200) == 7
+    assert server.count(status=429) == 0
+    # Seven requests at three per window need three windows
+    assert elapsed >= 0.4
+
+
+@pytest.mark.asyncio
+async def test_major_parameters_get_their_own_buckets():
+    async with FakeDiscord(buckets={'messages.write': Bucket('aaaa', limit=1, reset_after=0.3)}) as server:
+        server.routes = {SEND: 'messages.write'}
+        http = await _client(server)
+        try:
+            start = time.monotonic()
+            # Each channel has its own window, so these run side by side rather than one window after another
+            await asyncio.gather(*(http.request(_send(server, channel_id)) for channel_id in range(1, 4)))
+            elapsed = time.monotonic() - start
+        finally:
+            await http.close()
+
+    assert server.count(status=429) == 0
+    assert elapsed < 0.6
+
+
+@pytest.mark.asyncio
+async def test_bucket_hash_migration(server):
+    http = await _client(server)
+    try:
+        await http.request(_send(server))
+        assert http._bucket_hashes['POST /channels/{channel_id}/messages'] == server.buckets['messages.write'].hash
+
+        server.rebucket('messages.write', 'ffff')
+        await http.request(_send(server))
+        assert http._bucket_hashes['POST /channels/{channel_id}/messages'] == 'ffff'
+    finally:
+        await http.close()
+
+
+@pytest.mark.asyncio
+async def test_sub_ratelimit_and_global_429s_are_retried(server):
+    http = await _client(server)
+    try:
+        # The bucket has to be known for a 429 to be recognised as a sub-ratelimit
+        await http.request(_send(server))
+        server.inject(SEND, Fault(429, retry_after=0.05, sub_ratelimit=True), Fault(429, retry_after=0.05, is_global=True))
+        await http.request(_send(server))
+    finally:
+        await http.close()
+
+    assert server.count(route=SEND, status=429) == 2
+    assert server.count(route=SEND, status=200) == 2
+
+    stats = http.stats()['routes'][SEND]
+    assert stats['ratelimited'] == 2
+    assert stats['sub_ratelimited'] == 1
+    assert stats['global_ratelimited'] == 1
+    assert stats['attempts'] == 4
+
+
+@pytest.mark.asyncio
+async def test_server_errors_are_retried(server):
+    server.inject(SEND, Fault(502))
+    http = await _client(server)
+    try:
+        await http.request(_send(server))
+    finally:
+        await http.close()
+
+    assert [entry.status for entry in server.log] == [502, 200]
+    assert http.stats()['routes'][SEND]['server_errors'] == 1
+
+
+@pytest.mark.asyncio
+async def test_202_retries_with_attempts(server):
+    search = 'GET /channels/{channel_id}/messages/search'
+    server.inject(search, Fault(202, retry_after=0.01))
+    http = await _client(server)
+    try:
+        await http.request(server.route('GET', '/channels/{channel_id}/messages/search', channel_id=1))
+    finally:
+        await http.close()
+
+    assert [entry.status for entry in server.log] == [202, 200]
+    assert server.log[1].query == {'attempts': '1'}
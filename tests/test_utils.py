@@ -6,6 +6,7 @@ Tests for discord.utils
 
 """
 
+import asyncio
 import datetime
 import random
 import collections
@@ -171,6 +172,29 @@ def test_escape_mentions(mention):
     assert mention not in utils.escape_mentions(mention)
     assert mention not in utils.escape_mentions(f"one {mention} two")
 
+    text = f"one {mention} two"
+    assert utils.escape_mentions(text, tokens=utils.tokenize_content(text)) == utils.escape_mentions(text)
+
+
+def test_tokenize_content():
+    text = '<@80088516616269824> <#381978264698224660> <a:big_smile:381978264698224661> <t:1700000000:R> @here'
+    tokens = utils.tokenize_content(text)
+
+    assert [(t.type, t.id, t.name) for t in tokens] == [
+        ('user', 80088516616269824, None),
+        ('channel', 381978264698224660, None),
+        ('emoji', 381978264698224661, 'big_smile'),
+        ('timestamp', 1700000000, 'R'),
+        ('here', None, None),
+    ]
+    assert tokens[2].animated
+    assert all(text[t.start : t.end].startswith(('<', '@')) for t in tokens)
+
+    # Markdown inside tokens is kept
+    assert utils.remove_markdown('**hi** <:big_smile:381978264698224661>') == 'hi <:bigsmile:381978264698224661>'
+    text = '**hi** <:big_smile:381978264698224661>'
+    assert utils.remove_markdown(text, tokens=utils.tokenize_content(text)) == 'hi <:big_smile:381978264698224661>'
+
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
@@ -187,6 +211,48 @@ async def test_as_chunks(source, chunk_size, chunked):
     assert [x async for x in utils.as_chunks(async_iterate(source), chunk_size)] == chunked
 
 
+async def _slow_pages(fetched, count=5, *, fail_at=None):
+    for i in range(count):
+        await asyncio.sleep(0.01)
+        if i == fail_at:
+            raise ValueError(i)
+        fetched.append(i)
+        yield [i]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('prefetch', [0, 1, 3, 100])
+async def test_prefetch_pages(prefetch):
+    fetched = []
+    assert [page async for page in utils._prefetch(_slow_pages(fetched), prefetch)] == [[i] for i in range(5)]
+    assert fetched == list(range(5))
+
+
+@pytest.mark.asyncio
+async def test_prefetch_reads_ahead():
+    fetched = []
+    pages = utils._prefetch(_slow_pages(fetched), 2)
+    assert await pages.__anext__() == [0]
+
+    # While the consumer is idle, the buffer fills up (plus one page waiting to be queued)
+    await asyncio.sleep(0.1)
+    assert fetched == [0, 1, 2, 3]
+
+    await pages.aclose()
+    await asyncio.sleep(0.05)
+    assert fetched == [0, 1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_propagates_errors():
+    fetched = []
+    received = []
+    with pytest.raises(ValueError):
+        async for page in utils._prefetch(_slow_pages(fetched, fail_at=2), 3):
+            received.append(page)
+    assert received == [[0], [1]]
+
+
 @pytest.mark.parametrize(
     ('annotation', 'resolved'),
     [